@@ -1,7 +1,9 @@
 # Importar do módulo compartilhado:
 import os
 import sys
+import json
 import uuid
+import asyncio
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 
 # Certifica-se de que a raiz do projeto esteja em PYTHONPATH:
@@ -11,7 +13,10 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from common.config import get_openai_api_key
-from agent.core import PokemonAgent
+from agent.core import PokemonAgent, ToolMemo
+from agent.history import ConversationHistory
+from agent.scheduler import TurnScheduler
+from agent.tools import close_async_client
 from common.logger import get_logger, configure_logging, set_correlation_id
 
 from common.telemetry import configure_telemetry
@@ -50,6 +55,19 @@ except Exception as e:
     logger.critical(f"Failed to initialize the agent: {e}")
     agent = None
 
+# Limites de conexões, fila por conexão e turnos simultâneos:
+scheduler = TurnScheduler()
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    await close_async_client()
+
+async def send_event(websocket: WebSocket, event: dict) -> None:
+    """
+    Envia um evento do agente como um quadro JSON de texto.
+    """
+    await websocket.send_text(json.dumps(event, ensure_ascii=False))
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -58,28 +76,45 @@ async def websocket_endpoint(websocket: WebSocket):
     ws_correlation_id = str(uuid.uuid4())
     set_correlation_id(ws_correlation_id)
     
-    history = []
+    # Histórico limitado (janela + resumo); a memória por conexão não cresce com a sessão:
+    history = ConversationHistory()
+    # Memória de resultados de ferramentas desta conversa:
+    tool_memo = ToolMemo()
     logger.info(f"New WebSocket connection accepted. Correlation ID: {ws_correlation_id}")
     
     if agent is None:
-        await websocket.send_text("Erro: Agente não inicializado corretamente no servidor.")
+        await send_event(websocket, {"type": "error", "message": "Erro: Agente não inicializado corretamente no servidor."})
         await websocket.close()
         return
 
+    if not scheduler.open_session():
+        logger.warning("Conexão recusada: limite de sessões atingido.")
+        await send_event(websocket, {"type": "busy", "reason": "too_many_connections"})
+        # 1013: "Try Again Later"
+        await websocket.close(code=1013)
+        return
+
+    # Quadros "busy" (leitor) e eventos do turno (consumidor) não podem se intercalar no socket:
+    send_lock = asyncio.Lock()
+
+    async def send(event: dict) -> None:
+        async with send_lock:
+            await send_event(websocket, event)
+
+    async def handle_turn(user_input: str) -> None:
+        # Repassar os eventos do agente à medida que chegam (tokens, ferramentas, fim):
+        response = None
+        async for event in agent.stream_message(user_input, history.as_messages(), tool_memo):
+            await send(event)
+            if event["type"] == "done":
+                response = event["content"]
+
+        # Atualizar histórico (apenas turnos concluídos):
+        if response is not None:
+            history.add_turn(user_input, response)
+
     try:
-        while True:
-            user_input = await websocket.receive_text()
-            
-            # Processar mensagem com o agente:
-            response = agent.process_message(user_input, history)
-            
-            # Enviar resposta:
-            await websocket.send_text(response)
-            
-            # Atualizar histórico:
-            history.append({"role": "user", "content": user_input})
-            history.append({"role": "assistant", "content": response})
-            
+        await scheduler.serve(websocket.receive_text, send, handle_turn)
     except WebSocketDisconnect:
         logger.info("Client disconnected")
     except Exception as e:
@@ -88,3 +123,5 @@ async def websocket_endpoint(websocket: WebSocket):
             await websocket.close()
         except:
             pass
+    finally:
+        scheduler.close_session()
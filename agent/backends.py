@@ -0,0 +1,253 @@
+# Importar do módulo compartilhado:
+import os
+import sys
+import json
+import difflib
+import hashlib
+import argparse
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agent.tools import HttpBackend, ToolBackend, _request
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+AGENT_SNAPSHOT_PATH = os.getenv("AGENT_SNAPSHOT_PATH", os.path.join("data", "snapshot", "pokedex.json"))
+SNAPSHOT_PAGE_SIZE = 500
+
+STAT_NAMES = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+
+def _not_found(suggestions: Optional[List[str]] = None) -> Dict[str, Any]:
+    # Mesmo formato do erro 404 tratado em _safe_request:
+    error: Dict[str, Any] = {"error": "Recurso não encontrado."}
+    if suggestions:
+        error["sugestoes"] = suggestions
+    return error
+
+class ServiceBackend(ToolBackend):
+    """
+    Chama PokemonService e os demais serviços da API no mesmo processo, sem HTTP.
+    Requer o pacote api (SQLAlchemy, Redis) e acesso ao banco; para implantações conjuntas.
+    """
+
+    name = "service"
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None, redis_client: Any = None):
+        from api.database import SessionLocal, redis_client as default_redis
+        from api.repositories.pokemon import PokemonRepository
+        from api.services.indexes import UnknownPokemonError
+        from api.services.matchup import MatchupService
+        from api.services.pokemon import PokemonService
+        from api.services.search import SearchService
+        from api.services.similarity import SimilarityService
+
+        self.session_factory = session_factory or SessionLocal
+        self.redis = redis_client if redis_client is not None else default_redis
+        self._repository_cls = PokemonRepository
+        self._unknown_error = UnknownPokemonError
+        self._pokemon_service = PokemonService
+        self._matchup_service = MatchupService
+        self._search_service = SearchService
+        self._similarity_service = SimilarityService
+
+    @contextmanager
+    def _repository(self) -> Iterator[Any]:
+        db = self.session_factory()
+        try:
+            yield self._repository_cls(db)
+        finally:
+            db.close()
+
+    def get_pokemon(self, nome_ou_id: str) -> Any:
+        with self._repository() as repository:
+            result = self._pokemon_service(repository, self.redis).get_pokemon_details(nome_ou_id)
+            if result is not None:
+                return result.model_dump()
+            if nome_ou_id.strip().isascii() and nome_ou_id.strip().isdigit():
+                return _not_found()
+            return _not_found(self._search_service(repository).did_you_mean(nome_ou_id))
+
+    def list_by_type(self, tipo: Optional[str]) -> Any:
+        with self._repository() as repository:
+            return self._pokemon_service(repository, self.redis).list_pokemons(tipo)
+
+    def ranking(self, stat: str, limit: int) -> Any:
+        if stat not in STAT_NAMES:
+            return {"error": "Erro da API: 422"}
+        with self._repository() as repository:
+            return [r.model_dump() for r in self._pokemon_service(repository, self.redis).get_ranking(stat, limit)]
+
+    def evaluate_teams(self, team_a: List[str], team_b: List[str]) -> Any:
+        with self._repository() as repository:
+            try:
+                return self._matchup_service(repository).evaluate_teams(team_a, team_b).model_dump()
+            except self._unknown_error:
+                return _not_found()
+
+    def similar(self, nome: str, k: int) -> Any:
+        with self._repository() as repository:
+            try:
+                return [r.model_dump() for r in self._similarity_service(repository).find_similar(nome, k)]
+            except self._unknown_error:
+                return _not_found()
+
+    def evolutions(self, nome: str) -> Any:
+        with self._repository() as repository:
+            try:
+                result = self._pokemon_service(repository, self.redis).get_evolution_chain(nome)
+            except self._unknown_error:
+                return _not_found(self._search_service(repository).did_you_mean(nome))
+            return result.model_dump() if result is not None else _not_found()
+
+    def dataset_version(self) -> Optional[str]:
+        with self._repository() as repository:
+            return self._pokemon_service(repository, self.redis).get_dataset_version().version
+
+class SnapshotBackend(ToolBackend):
+    """
+    Responde a partir de um snapshot local (JSON) com os detalhes de todos os Pokémons.
+    Consultas diretas, listas por tipo e rankings são resolvidas em memória. Confrontos e
+    similaridade usam os motores da API quando o pacote api está disponível; caso contrário,
+    são delegados ao backend de fallback (HTTP), assim como as cadeias de evolução.
+    """
+
+    name = "snapshot"
+
+    def __init__(self, snapshot: Dict[str, Any], fallback: Optional[ToolBackend] = None):
+        self.version: Optional[str] = snapshot.get("version")
+        self.pokemons: List[Dict[str, Any]] = sorted(snapshot.get("pokemons", []), key=lambda p: p["id"])
+        self.fallback = fallback or HttpBackend()
+        self._by_name = {p["name"].lower(): p for p in self.pokemons}
+        self._by_id = {p["id"]: p for p in self.pokemons}
+        self._engines: Dict[str, Any] = {}
+
+    @classmethod
+    def from_file(cls, path: str = AGENT_SNAPSHOT_PATH, fallback: Optional[ToolBackend] = None) -> "SnapshotBackend":
+        with open(path, "r", encoding="utf-8") as f:
+            backend = cls(json.load(f), fallback)
+        logger.info(f"Snapshot carregado: {len(backend.pokemons)} Pokémons (versão {backend.version}) de {path}")
+        return backend
+
+    def get_pokemon(self, nome_ou_id: str) -> Any:
+        key = nome_ou_id.strip().lower()
+        result = self._by_id.get(int(key)) if key.isascii() and key.isdigit() else self._by_name.get(key)
+        if result is not None:
+            return result
+        if key.isascii() and key.isdigit():
+            return _not_found()
+        return _not_found(difflib.get_close_matches(key, list(self._by_name), n=3))
+
+    def list_by_type(self, tipo: Optional[str]) -> Any:
+        key = (tipo or "").lower()
+        return [p["name"] for p in self.pokemons if not key or key in p["types"]]
+
+    def ranking(self, stat: str, limit: int) -> Any:
+        if stat not in STAT_NAMES:
+            return {"error": "Erro da API: 422"}
+        ordered = sorted(self.pokemons, key=lambda p: (-p["stats"][stat], p["id"]))[:limit]
+        return [{"rank": i + 1, "name": p["name"], "value": p["stats"][stat]} for i, p in enumerate(ordered)]
+
+    def evaluate_teams(self, team_a: List[str], team_b: List[str]) -> Any:
+        engine = self._engine("matchup")
+        if engine is None:
+            return self.fallback.evaluate_teams(team_a, team_b)
+        from api.services.matchup import MatchupService
+        try:
+            return MatchupService(None, engine).evaluate_teams(team_a, team_b).model_dump()
+        except LookupError:
+            return _not_found()
+
+    def similar(self, nome: str, k: int) -> Any:
+        index = self._engine("similarity")
+        if index is None:
+            return self.fallback.similar(nome, k)
+        import numpy as np
+        try:
+            row = index.position(nome)
+        except LookupError:
+            return _not_found()
+        neighbors, values = index.top_k(np.array([row]), k)
+        return [
+            {"rank": i + 1, "name": index.names[n], "score": round(float(v), 4)}
+            for i, (n, v) in enumerate(zip(neighbors[0], values[0]))
+        ]
+
+    def evolutions(self, nome: str) -> Any:
+        # O snapshot tem só os detalhes dos Pokémons; cadeias de evolução vêm do fallback.
+        return self.fallback.evolutions(nome)
+
+    def dataset_version(self) -> Optional[str]:
+        return self.version
+
+    async def call_async(self, operation: str, *args: Any) -> Any:
+        # Consultas em memória são instantâneas; apenas o fallback HTTP precisa do caminho assíncrono.
+        if operation == "evolutions":
+            return await self.fallback.call_async(operation, *args)
+        if operation in ("evaluate_teams", "similar") and self._engine(
+            "matchup" if operation == "evaluate_teams" else "similarity"
+        ) is None:
+            return await self.fallback.call_async(operation, *args)
+        return self.call(operation, *args)
+
+    def _engine(self, kind: str) -> Any:
+        if kind not in self._engines:
+            try:
+                if kind == "matchup":
+                    from api.services.matchup import MatchupEngine
+                    self._engines[kind] = MatchupEngine([p["name"] for p in self.pokemons], [p["types"] for p in self.pokemons])
+                else:
+                    import numpy as np
+                    from api.services.similarity import SimilarityIndex
+                    stats = np.array([[p["stats"][s] for s in STAT_NAMES] for p in self.pokemons], dtype=np.float32)
+                    self._engines[kind] = SimilarityIndex([p["name"] for p in self.pokemons], stats)
+            except ImportError:
+                logger.info(f"Pacote api indisponível; '{kind}' será consultado via HTTP.")
+                self._engines[kind] = None
+        return self._engines[kind]
+
+# --- Geração do snapshot ---
+def build_snapshot(fetch: Callable[..., Any] = _request, page_size: int = SNAPSHOT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Baixa todos os Pokémons da API em páginas de IDs e monta o snapshot.
+
+    Os IDs têm lacunas (as formas da PokeAPI começam em 10001), então as páginas vão até o max_id
+    informado pela API, atravessando as vazias; sem max_id (API antiga), para na primeira página vazia.
+    """
+    dataset = fetch("GET", "/v1/dataset/version")
+    if isinstance(dataset, dict) and "error" in dataset:
+        raise RuntimeError(f"Falha ao gerar snapshot: {dataset['error']}")
+    max_id = dataset.get("max_id")
+
+    pokemons: List[Dict[str, Any]] = []
+    start = 1
+    while max_id is None or start <= max_id:
+        page = fetch("GET", "/v1/pokemons/range", params={"start": start, "end": start + page_size - 1})
+        if isinstance(page, dict) and "error" in page:
+            raise RuntimeError(f"Falha ao gerar snapshot: {page['error']}")
+        if not page and max_id is None:
+            break
+        pokemons.extend(page)
+        start += page_size
+
+    version = dataset.get("version")
+    if not version:
+        version = hashlib.sha1(json.dumps(pokemons, sort_keys=True).encode()).hexdigest()[:12]
+    return {"version": version, "pokemons": pokemons}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gera o snapshot local usado por AGENT_TOOL_BACKEND=snapshot")
+    parser.add_argument("--output", default=AGENT_SNAPSHOT_PATH, help="Caminho do arquivo JSON")
+    args = parser.parse_args(argv)
+
+    snapshot = build_snapshot()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    # Troca atômica: leitores nunca veem um arquivo pela metade.
+    os.replace(tmp_path, args.output)
+    print(f"Snapshot com {len(snapshot['pokemons'])} Pokémons (versão {snapshot['version']}) salvo em {args.output}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,102 +1,875 @@
 # Importar do módulo compartilhado:
 import os
 import json
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from openai import OpenAI
+import time
+import contextvars
+import concurrent.futures
+import re
+import unicodedata
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator, Tuple
+import numpy as np
+from openai import OpenAI, AsyncOpenAI
+from opentelemetry import metrics
 
-from agent.tools import tools_schema, available_functions
+from agent.tools import tools_schema, available_functions, available_async_functions, obter_versao_dados_async
 from common.config import get_openai_api_key
 from agent.prompts import SYSTEM_PROMPT
+from agent.llm import AGENT_LLM_BACKEND, create_llm_clients
+from agent.history import TOOL_OUTPUT_MAX_CHARS, estimate_messages_tokens, fit_to_budget, trim_text
 from common.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Limites de execução das ferramentas em um mesmo turno:
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", 30))
+TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", 4))
+# Orçamento de chamadas ao LLM por turno; a última é sempre sem ferramentas (resposta final):
+AGENT_MAX_STEPS = max(1, int(os.getenv("AGENT_MAX_STEPS", 5)))
+TOOL_MEMO_SIZE = int(os.getenv("TOOL_MEMO_SIZE", 128))
+
+# Cache de respostas (TTL 0 desativa); a busca semântica por embeddings é opcional:
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 3600))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+RESPONSE_CACHE_SEMANTIC = os.getenv("RESPONSE_CACHE_SEMANTIC", "false").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", 0.95))
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+# Intervalo entre verificações da versão dos dados na API:
+DATASET_VERSION_CHECK_SECONDS = float(os.getenv("DATASET_VERSION_CHECK_SECONDS", 60))
+
+# Roteador determinístico: perguntas simples vão direto à ferramenta, sem chamar o LLM:
+AGENT_ROUTER_ENABLED = os.getenv("AGENT_ROUTER_ENABLED", "true").lower() in ("1", "true", "yes")
+AGENT_ROUTER_INDEX = os.getenv("AGENT_ROUTER_INDEX", os.path.join("data", "raw", "pokemon_data.json"))
+ROUTER_DEFAULT_TOP = 5
+ROUTER_MAX_TOP = 50
+
+# Métricas do agente:
+meter = metrics.get_meter(__name__)
+histogram_ttft = meter.create_histogram(
+    "pokemon.agent.time_to_first_token", unit="ms", description="Time until the first streamed token of a turn"
+)
+histogram_steps = meter.create_histogram("pokemon.agent.steps", description="LLM calls per agent turn")
+histogram_tokens = meter.create_histogram("pokemon.agent.tokens", description="Tokens used per agent turn")
+counter_memo_hits = meter.create_counter("pokemon.agent.tool_memo.hits", description="Tool calls answered from the session memo")
+histogram_prompt_tokens = meter.create_histogram(
+    "pokemon.agent.prompt_tokens", description="Estimated prompt tokens (system prompt + history + input) per turn"
+)
+counter_response_cache = meter.create_counter("pokemon.agent.response_cache", description="Response cache lookups by result")
+counter_router = meter.create_counter("pokemon.agent.router", description="Intent router decisions by result (hit, miss, fallback)")
+histogram_turn_duration = meter.create_histogram(
+    "pokemon.agent.turn_duration", unit="ms", description="Wall time of an agent turn by path (router, cache, llm)"
+)
+
+def _is_error_result(content: str) -> bool:
+    try:
+        payload = json.loads(content)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(payload, dict) and "error" in payload
+
+class ToolMemo:
+    """
+    Memória de resultados de ferramentas de uma conversa.
+    Chamadas idênticas (mesma ferramenta e mesmos argumentos) são respondidas sem nova consulta.
+    Resultados com erro não são memorizados.
+    """
+
+    def __init__(self, maxsize: int = TOOL_MEMO_SIZE):
+        self.maxsize = maxsize
+        self._results: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def key(tool_call: Any) -> str:
+        try:
+            arguments = json.dumps(json.loads(tool_call.function.arguments or "{}"), sort_keys=True)
+        except (TypeError, ValueError):
+            arguments = tool_call.function.arguments
+        return f"{tool_call.function.name}:{arguments}"
+
+    def get(self, key: str) -> Optional[str]:
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        return None
+
+    def put(self, key: str, content: str) -> None:
+        if _is_error_result(content):
+            return
+        self._results[key] = content
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+class ResponseCache:
+    """
+    Cache de respostas do agente para perguntas repetidas.
+
+    - Exato: chave é a pergunta normalizada (minúsculas, sem acentos, pontuação ou espaços extras).
+    - Semântico (opcional): vetores unitários de embeddings em uma matriz local; a pergunta
+      mais próxima é aceita se a similaridade de cosseno atingir o limiar.
+    - Entradas expiram pelo TTL e todas são descartadas quando a versão dos dados muda.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = RESPONSE_CACHE_TTL,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        similarity_threshold: float = RESPONSE_CACHE_SIMILARITY
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self.dataset_version: Optional[str] = None
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[str] = []
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        text = unicodedata.normalize("NFKD", question.lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+    def get(self, key: str, vector: Optional[np.ndarray] = None) -> Optional[str]:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is None and vector is not None:
+            key = self._nearest(vector)
+            entry = self._entries.get(key) if key else None
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, answer: str, vector: Optional[np.ndarray] = None) -> None:
+        self._entries[key] = (answer, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        if vector is not None:
+            self._vectors[key] = vector
+            self._matrix = None
+        while len(self._entries) > self.maxsize:
+            self._evict(next(iter(self._entries)))
+
+    def sync_version(self, version: Optional[str]) -> None:
+        """
+        Registra a versão atual dos dados; se ela mudou, todas as respostas são descartadas.
+        """
+        if not version or version == self.dataset_version:
+            return
+        if self.dataset_version is not None:
+            logger.info(f"Versão dos dados mudou ({self.dataset_version} -> {version}); limpando cache de respostas.")
+            self.clear()
+        self.dataset_version = version
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._vectors.clear()
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._vectors.pop(key, None) is not None:
+            self._matrix = None
+
+    def _nearest(self, vector: np.ndarray) -> Optional[str]:
+        if not self._vectors:
+            return None
+        if self._matrix is None:
+            # Reconstruída apenas após inserções/remoções; consultas são um único produto matriz-vetor:
+            self._matrix_keys = list(self._vectors)
+            self._matrix = np.stack([self._vectors[k] for k in self._matrix_keys])
+        scores = self._matrix @ vector
+        best = int(scores.argmax())
+        return self._matrix_keys[best] if scores[best] >= self.similarity_threshold else None
+
+class TurnUsage:
+    """
+    Acumula passos e tokens consumidos em um turno.
+    """
+
+    def __init__(self):
+        self.steps = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def add(self, usage: Any) -> None:
+        for field in ("prompt_tokens", "completion_tokens"):
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                setattr(self, field, getattr(self, field) + value)
+
+    def record(self) -> None:
+        histogram_steps.record(self.steps)
+        histogram_tokens.record(self.prompt_tokens, {"kind": "prompt"})
+        histogram_tokens.record(self.completion_tokens, {"kind": "completion"})
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"steps": self.steps, "prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens}
+
+POKEMON_TYPES = (
+    "normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground",
+    "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy",
+)
+# Nomes em português (já normalizados: minúsculas e sem acentos):
+TYPE_ALIASES = {
+    "fogo": "fire", "agua": "water", "planta": "grass", "grama": "grass", "eletrico": "electric",
+    "gelo": "ice", "lutador": "fighting", "luta": "fighting", "veneno": "poison", "venenoso": "poison",
+    "terra": "ground", "voador": "flying", "psiquico": "psychic", "inseto": "bug", "pedra": "rock",
+    "rocha": "rock", "fantasma": "ghost", "dragao": "dragon", "sombrio": "dark", "noturno": "dark",
+    "aco": "steel", "metal": "steel", "fada": "fairy",
+}
+STAT_ALIASES = {
+    "hp": "hp", "vida": "hp", "ps": "hp",
+    "ataque": "attack", "attack": "attack", "atk": "attack",
+    "defesa": "defense", "defense": "defense", "def": "defense",
+    "ataque especial": "special_attack", "special attack": "special_attack", "special_attack": "special_attack", "sp atk": "special_attack",
+    "defesa especial": "special_defense", "special defense": "special_defense", "special_defense": "special_defense", "sp def": "special_defense",
+    "velocidade": "speed", "speed": "speed", "rapidos": "speed", "velozes": "speed",
+}
+# (artigo, nome) de cada stat nas respostas prontas:
+STAT_LABELS = {
+    "hp": ("O", "HP"), "attack": ("O", "ataque"), "defense": ("A", "defesa"),
+    "special_attack": ("O", "ataque especial"), "special_defense": ("A", "defesa especial"), "speed": ("A", "velocidade"),
+}
+RANK_WORDS = frozenset({"top", "ranking", "rank", "maiores", "melhores", "mais"})
+EVOLUTION_WORDS = frozenset({"evolucao", "evolucoes", "evolui", "evoluem", "evoluir", "evolucionaria", "cadeia"})
+# Palavras que não mudam a intenção; qualquer outra palavra desconhecida manda a pergunta ao LLM:
+FILLER_WORDS = frozenset({
+    "o", "a", "os", "as", "um", "uma", "de", "do", "da", "dos", "das", "no", "na", "em", "com", "por", "e",
+    "qual", "quais", "quem", "sao", "me", "mostre", "mostra", "mostrar", "liste", "lista", "listar",
+    "fale", "sobre", "diga", "busque", "buscar", "procure", "ver", "quero", "favor", "info", "informacoes",
+    "dados", "detalhes", "stats", "status", "atributos", "estatisticas", "pokemon", "pokemons", "tipo",
+    "tipos", "todos", "pokedex",
+})
+ENTITY_MAX_WORDS = 3
+
+class Route:
+    """
+    Decisão do roteador: a ferramenta e os argumentos que respondem à pergunta.
+    """
+
+    def __init__(self, intent: str, tool: str, arguments: Dict[str, Any]):
+        self.intent = intent
+        self.tool = tool
+        self.arguments = arguments
+
+    def tool_call(self) -> SimpleNamespace:
+        # Mesmo formato das chamadas vindas do LLM (compatível com ToolMemo e _run_tool):
+        return SimpleNamespace(
+            id=f"route_{self.intent}",
+            function=SimpleNamespace(name=self.tool, arguments=json.dumps(self.arguments, ensure_ascii=False)),
+        )
+
+class IntentRouter:
+    """
+    Roteador de intenções por regras, sem LLM.
+
+    A pergunta normalizada é dividida em entidades conhecidas (Pokémons do índice local, tipos,
+    stats e números) e palavras de ligação. Só há rota quando todas as palavras são reconhecidas e
+    as entidades apontam para uma única ferramenta; qualquer dúvida fica com o LLM.
+    """
+
+    def __init__(self, pokemon_names: Optional[List[str]] = None):
+        self._entities: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+        for alias, stat in STAT_ALIASES.items():
+            self._entities[tuple(alias.split())] = ("stat", stat)
+        for name in POKEMON_TYPES:
+            self._entities[(name,)] = ("type", name)
+        for alias, name in TYPE_ALIASES.items():
+            self._entities[(alias,)] = ("type", name)
+        for name in pokemon_names or []:
+            self._entities[tuple(ResponseCache.normalize(name).split())] = ("pokemon", name.lower())
+
+    @classmethod
+    def from_file(cls, path: str = AGENT_ROUTER_INDEX) -> "IntentRouter":
+        """
+        Lê os nomes de um JSON local: lista de objetos com 'name' ou um snapshot {"pokemons": [...]}.
+        Sem o arquivo, o roteador ainda atende rankings e listas por tipo.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Índice do roteador indisponível ({path}): {e}")
+            return cls()
+        items = data.get("pokemons", []) if isinstance(data, dict) else data
+        return cls([item["name"] for item in items if isinstance(item, dict) and item.get("name")])
+
+    def route(self, text: str) -> Optional[Route]:
+        found: Dict[str, List[str]] = {"pokemon": [], "type": [], "stat": [], "number": []}
+        ranked = evolution = False
+        for kind, value in self._scan(text):
+            if kind != "word":
+                found[kind].append(value)
+            elif value in RANK_WORDS:
+                ranked = True
+            elif value in EVOLUTION_WORDS:
+                evolution = True
+            elif value not in FILLER_WORDS:
+                return None
+
+        pokemons, types, stats, numbers = found["pokemon"], found["type"], found["stat"], found["number"]
+        if len(numbers) > 1 or len(set(pokemons)) > 1 or len(set(types)) > 1 or len(set(stats)) > 1:
+            return None
+
+        if evolution:
+            if pokemons and not types and not stats and not numbers and not ranked:
+                return Route("evolution", "buscar_evolucoes", {"nome": pokemons[0]})
+            return None
+        if pokemons and not types and not numbers and not ranked:
+            if stats:
+                return Route("pokemon_stat", "buscar_pokemon", {"nome_ou_id": pokemons[0], "campos": [stats[0]]})
+            return Route("pokemon", "buscar_pokemon", {"nome_ou_id": pokemons[0]})
+        if types and not pokemons and not stats and not ranked:
+            arguments: Dict[str, Any] = {"tipo": types[0]}
+            if numbers:
+                arguments["limite"] = min(int(numbers[0]), ROUTER_MAX_TOP)
+            return Route("type_list", "listar_por_tipo", arguments)
+        if stats and ranked and not pokemons and not types:
+            n = int(numbers[0]) if numbers else ROUTER_DEFAULT_TOP
+            return Route("ranking", "top_n_por_stat", {"stat": stats[0], "n": max(1, min(n, ROUTER_MAX_TOP))})
+        return None
+
+    def mentions(self, text: str) -> List[str]:
+        """
+        Pokémons do índice citados na pergunta, na ordem em que aparecem (sem repetição).
+        """
+        names = [value for kind, value in self._scan(text) if kind == "pokemon"]
+        return list(dict.fromkeys(names))
+
+    def _scan(self, text: str) -> Iterator[Tuple[str, str]]:
+        # Gera (tipo, valor): entidades conhecidas, números ou ("word", palavra) para o resto.
+        words = ResponseCache.normalize(text).split()
+        i = 0
+        while i < len(words):
+            # Entidades de várias palavras (ex.: "ataque especial", "mr mime") têm prioridade:
+            for size in range(min(ENTITY_MAX_WORDS, len(words) - i), 0, -1):
+                entity = self._entities.get(tuple(words[i:i + size]))
+                if entity is not None:
+                    yield entity
+                    i += size
+                    break
+            else:
+                yield ("number" if words[i].isdigit() else "word", words[i])
+                i += 1
+
+    @staticmethod
+    def render(route: Route, content: str) -> Optional[str]:
+        """
+        Monta a resposta a partir do resultado da ferramenta; None (erro ou formato inesperado) devolve a pergunta ao LLM.
+        """
+        try:
+            payload = json.loads(content)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(payload, dict) or "error" in payload:
+            return None
+
+        try:
+            if route.intent == "pokemon_stat":
+                stat = route.arguments["campos"][0]
+                article, label = STAT_LABELS[stat]
+                return f"{article} {label} de **{payload['name'].capitalize()}** é {payload[stat]}."
+
+            if route.intent == "pokemon":
+                lines = [f"**{payload['name'].capitalize()}** (#{payload['id']}) — tipos: {', '.join(payload['types'])}."]
+                lines.append(f"- Altura: {payload['height'] / 10:g} m | Peso: {payload['weight'] / 10:g} kg")
+                lines.append("- " + " | ".join(f"{STAT_LABELS[s][1].capitalize()}: {payload[s]}" for s in STAT_LABELS if s in payload))
+                return "\n".join(lines)
+
+            if route.intent == "type_list":
+                tipo = route.arguments["tipo"]
+                if not payload["total"]:
+                    return f"Nenhum Pokémon do tipo {tipo} encontrado."
+                names = ", ".join(name.capitalize() for name in payload["pokemons"])
+                answer = f"Há {payload['total']} Pokémons do tipo {tipo}: {names}."
+                if payload.get("omitidos"):
+                    answer += f" (mais {payload['omitidos']} não listados)"
+                return answer
+
+            if route.intent == "ranking":
+                label = STAT_LABELS[payload["stat"]][1]
+                lines = [f"Top {len(payload['ranking'])} em {label}:"]
+                lines += [f"{i}. {name.capitalize()} — {value}" for i, (name, value) in enumerate(payload["ranking"], start=1)]
+                return "\n".join(lines)
+
+            if route.intent == "evolution":
+                name = payload["pokemon"].capitalize()
+                if not payload["evolucoes"]:
+                    return f"**{name}** não evolui."
+                lines = [f"Cadeia de evolução de **{name}**:"]
+                for de, para, como in payload["evolucoes"]:
+                    lines.append(f"- {de.capitalize()} → {para.capitalize()}" + (f" ({como})" if como else ""))
+                return "\n".join(lines)
+        except (KeyError, TypeError, ValueError):
+            return None
+        return None
+
 class PokemonAgent:
     def __init__(self, model: str = "gpt-5.2"):
         self.api_key = get_openai_api_key()
         if not self.api_key:
             logger.warning("OPENAI_API_KEY Not found during agent initialization. Using mock key for testing.")
-        
-        self.client = OpenAI(api_key=self.api_key)
+
+        if AGENT_LLM_BACKEND in ("stub", "replay"):
+            # Benchmarks offline: sem rede e sem chave de API.
+            self.client, self.async_client = create_llm_clients(AGENT_LLM_BACKEND)
+        else:
+            self.client = OpenAI(api_key=self.api_key)
+            # Cliente assíncrono para o caminho não bloqueante (WebSocket):
+            self.async_client = AsyncOpenAI(api_key=self.api_key)
+            self.client, self.async_client = create_llm_clients(AGENT_LLM_BACKEND, self.client, self.async_client)
         self.model = os.getenv("DEFAULT_MODEL", model)
         self.system_prompt = SYSTEM_PROMPT
+        # Executor limitado para ferramentas síncronas disparadas no mesmo turno:
+        self._tool_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=TOOL_MAX_CONCURRENCY, thread_name_prefix="agent-tool"
+        )
+        # Cache de respostas compartilhado pelas conversas deste processo:
+        self.response_cache = ResponseCache() if RESPONSE_CACHE_TTL > 0 else None
+        self._version_checked_at = float("-inf")
+        # Atalho determinístico para perguntas simples (desativado com AGENT_ROUTER_ENABLED=false):
+        self.router = IntentRouter.from_file() if AGENT_ROUTER_ENABLED else None
+
+    def _build_messages(self, user_input: str, history: Optional[List[Dict[str, str]]]) -> List[Dict[str, Any]]:
+        # O histórico enviado respeita o orçamento de tokens, qualquer que seja o tamanho guardado pelo chamador:
+        messages = [{"role": "system", "content": self.system_prompt}] + fit_to_budget(history or [])
+        messages.append({"role": "user", "content": user_input})
+        histogram_prompt_tokens.record(estimate_messages_tokens(messages))
+        return messages
 
-    def process_message(self, user_input: str, history: Optional[List[Dict[str, str]]] = None) -> str:
+    def process_message(
+        self,
+        user_input: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        tool_memo: Optional[ToolMemo] = None
+    ) -> str:
         """
         Processa uma mensagem do usuário e retorna a resposta do assistente.
-        Lida com chamadas de ferramentas automaticamente.
+        Lida com chamadas de ferramentas automaticamente, em até AGENT_MAX_STEPS chamadas ao LLM,
+        permitindo consultas encadeadas (ex.: buscar um Pokémon e depois os do seu tipo).
+        Perguntas simples reconhecidas pelo roteador são respondidas sem o LLM.
         """
-        if history is None:
-            history = []
+        memo = tool_memo if tool_memo is not None else ToolMemo()
+        start = time.perf_counter()
+
+        route = self._route(user_input)
+        if route is not None:
+            tool_call = route.tool_call()
+            key = ToolMemo.key(tool_call)
+            content = memo.get(key)
+            if content is None:
+                content = self._run_tool(tool_call)
+                memo.put(key, content)
+            answer = self._render_route(route, content)
+            if answer is not None:
+                histogram_turn_duration.record((time.perf_counter() - start) * 1000, {"path": "router"})
+                return answer
+
+        messages = self._build_messages(user_input, history)
+        usage = TurnUsage()
 
-        messages = [{"role": "system", "content": self.system_prompt}] + history
-        messages.append({"role": "user", "content": user_input})
-        
         logger.debug(f"Input processing: {user_input}")
 
         try:
-            # Primeira chamada para o LLM:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=tools_schema,
-                tool_choice="auto", 
-            )
-            
-            response_message = response.choices[0].message
-            
-            # Verifique as chamadas de ferramentas:
-            if response_message.tool_calls:
-                # Adicione a solicitação do assistente à conversa:
+            while True:
+                usage.steps += 1
+                final_step = usage.steps >= AGENT_MAX_STEPS
+                response = self.client.chat.completions.create(**self._completion_kwargs(messages, final_step))
+                usage.add(getattr(response, "usage", None))
+
+                response_message = response.choices[0].message
+
+                # Sem chamadas de ferramentas (ou orçamento esgotado), a resposta é final:
+                if final_step or not response_message.tool_calls:
+                    usage.record()
+                    histogram_turn_duration.record((time.perf_counter() - start) * 1000, {"path": "llm"})
+                    return response_message.content
+
+                # Adicione a solicitação do assistente à conversa e execute as ferramentas:
                 messages.append(response_message)
-                
-                # Executar ferramentas:
-                self._execute_tool_calls(response_message.tool_calls, messages)
-                
-                # Segunda chamada para o LLM:
-                second_response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                )
-                return second_response.choices[0].message.content
-            else:
-                return response_message.content
+                self._execute_tool_calls(response_message.tool_calls, messages, memo)
 
         except Exception as e:
             logger.error(f"Error processing input: {e}", exc_info=True)
             return f"Erro ao processar sua solicitação: {str(e)}"
 
-    def _execute_tool_calls(self, tool_calls: List[Any], messages: List[Dict[str, Any]]) -> None:
+    def _completion_kwargs(self, messages: List[Dict[str, Any]], final_step: bool) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"model": self.model, "messages": messages}
+        if not final_step:
+            kwargs.update(tools=tools_schema, tool_choice="auto")
+        return kwargs
+
+    async def process_message_async(
+        self,
+        user_input: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        tool_memo: Optional[ToolMemo] = None
+    ) -> str:
+        """
+        Versão assíncrona de process_message: chamadas ao LLM e às ferramentas
+        não bloqueiam o event loop, permitindo muitas sessões concorrentes por worker.
+        Consome o fluxo de stream_message e retorna apenas a resposta final.
+        """
+        response = ""
+        async for event in self.stream_message(user_input, history, tool_memo):
+            if event["type"] == "done":
+                response = event["content"]
+            elif event["type"] == "error":
+                response = event["message"]
+        return response
+
+    async def stream_message(
+        self,
+        user_input: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        tool_memo: Optional[ToolMemo] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Processa uma mensagem emitindo eventos incrementais:
+        - {"type": "token", "content": ...}: fragmento da resposta.
+        - {"type": "tool_start", "id", "name", "args"} / {"type": "tool_end", "id", "name", "ok", "cached", "duration_ms"}.
+        - {"type": "done", "content": ..., "ttft_ms": ..., "usage": {...}, "cached": bool, "route": intenção ou None}: resposta final.
+        - {"type": "error", "message": ...}: falha no processamento.
+
+        Perguntas simples reconhecidas pelo roteador são respondidas pela ferramenta e um modelo de
+        resposta, sem o LLM. Perguntas sem histórico (independentes de contexto) passam pelo cache de respostas.
+        """
+        memo = tool_memo if tool_memo is not None else ToolMemo()
+        start = time.perf_counter()
+
+        route = self._route(user_input)
+        if route is not None:
+            tool_call = route.tool_call()
+            key = ToolMemo.key(tool_call)
+            yield {"type": "tool_start", "id": tool_call.id, "name": tool_call.function.name, "args": tool_call.function.arguments}
+            content = memo.get(key)
+            cached_tool = content is not None
+            if content is None:
+                content = await self._run_tool_async(tool_call)
+                memo.put(key, content)
+            yield self._tool_end_event(tool_call, content, start, cached=cached_tool)
+
+            answer = self._render_route(route, content)
+            if answer is not None:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                histogram_turn_duration.record(elapsed_ms, {"path": "router"})
+                yield {"type": "token", "content": answer}
+                yield {
+                    "type": "done", "content": answer, "ttft_ms": elapsed_ms, "usage": TurnUsage().as_dict(),
+                    "cached": False, "route": route.intent,
+                }
+                return
+
+        cache_key, cache_vector = None, None
+        if self.response_cache is not None and not history:
+            try:
+                cache_key, cache_vector, cached = await self._lookup_response(user_input)
+            except Exception as e:
+                logger.warning(f"Falha ao consultar o cache de respostas: {e}")
+                cache_key, cached = None, None
+            if cached is not None:
+                histogram_turn_duration.record((time.perf_counter() - start) * 1000, {"path": "cache"})
+                yield {"type": "token", "content": cached}
+                yield {"type": "done", "content": cached, "ttft_ms": 0.0, "usage": TurnUsage().as_dict(), "cached": True, "route": None}
+                return
+
+        messages = self._build_messages(user_input, history)
+        usage = TurnUsage()
+        start = time.perf_counter()
+        first_token_at: Optional[float] = None
+
+        logger.debug(f"Input processing (stream): {user_input}")
+
+        try:
+            while True:
+                usage.steps += 1
+                final_step = usage.steps >= AGENT_MAX_STEPS
+                content_parts: List[str] = []
+                tool_calls: List[SimpleNamespace] = []
+
+                # Cada passo pode responder direto (tokens) ou pedir mais ferramentas:
+                async for delta in self._stream_completion(messages, final_step, tool_calls, usage):
+                    first_token_at = first_token_at or time.perf_counter()
+                    content_parts.append(delta)
+                    yield {"type": "token", "content": delta}
+
+                if final_step or not tool_calls:
+                    break
+
+                messages.append(self._assistant_tool_message("".join(content_parts), tool_calls))
+                async for event in self._run_tool_calls_streaming(tool_calls, messages, memo):
+                    yield event
+
+            ttft_ms = (first_token_at - start) * 1000 if first_token_at else None
+            if ttft_ms is not None:
+                histogram_ttft.record(ttft_ms, {"tools": usage.steps > 1})
+            usage.record()
+            answer = "".join(content_parts)
+            if cache_key is not None and answer:
+                self.response_cache.put(cache_key, answer, cache_vector)
+            histogram_turn_duration.record((time.perf_counter() - start) * 1000, {"path": "llm"})
+            yield {"type": "done", "content": answer, "ttft_ms": ttft_ms, "usage": usage.as_dict(), "cached": False, "route": None}
+
+        except Exception as e:
+            logger.error(f"Error processing input: {e}", exc_info=True)
+            yield {"type": "error", "message": f"Erro ao processar sua solicitação: {str(e)}"}
+
+    def _route(self, user_input: str) -> Optional[Route]:
+        if self.router is None:
+            return None
+        route = self.router.route(user_input)
+        if route is None:
+            counter_router.add(1, {"result": "miss"})
+        return route
+
+    @staticmethod
+    def _render_route(route: Route, content: str) -> Optional[str]:
+        # Falha da ferramenta ou resultado inesperado: a pergunta segue para o LLM.
+        answer = IntentRouter.render(route, content)
+        counter_router.add(1, {"result": "hit" if answer is not None else "fallback", "intent": route.intent})
+        return answer
+
+    async def _lookup_response(self, user_input: str) -> Tuple[str, Optional[np.ndarray], Optional[str]]:
+        """
+        Retorna (chave, vetor, resposta em cache ou None) para a pergunta.
+        """
+        now = time.monotonic()
+        if now - self._version_checked_at >= DATASET_VERSION_CHECK_SECONDS:
+            self._version_checked_at = now
+            self.response_cache.sync_version(await obter_versao_dados_async())
+
+        key = ResponseCache.normalize(user_input)
+        vector = None
+        cached = self.response_cache.get(key)
+        if cached is None and RESPONSE_CACHE_SEMANTIC:
+            vector = await self._embed(key)
+            cached = self.response_cache.get(key, vector)
+
+        counter_response_cache.add(1, {"result": "hit" if cached is not None else "miss"})
+        return key, vector, cached
+
+    async def _embed(self, text: str) -> np.ndarray:
+        response = await self.async_client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        final_step: bool,
+        tool_calls: List[SimpleNamespace],
+        usage: TurnUsage
+    ) -> AsyncIterator[str]:
+        """
+        Chama o LLM em modo stream, repassando fragmentos de texto e acumulando
+        os fragmentos de chamadas de ferramenta (por índice) em 'tool_calls'.
+        """
+        kwargs = self._completion_kwargs(messages, final_step)
+        kwargs.update(stream=True, stream_options={"include_usage": True})
+
+        stream = await self.async_client.chat.completions.create(**kwargs)
+        async for chunk in stream:
+            # O último fragmento traz apenas o consumo de tokens:
+            if getattr(chunk, "usage", None):
+                usage.add(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+
+            for fragment in (getattr(delta, "tool_calls", None) or []):
+                while len(tool_calls) <= fragment.index:
+                    tool_calls.append(SimpleNamespace(id=None, function=SimpleNamespace(name="", arguments="")))
+                call = tool_calls[fragment.index]
+                call.id = fragment.id or call.id
+                if fragment.function:
+                    call.function.name += fragment.function.name or ""
+                    call.function.arguments += fragment.function.arguments or ""
+
+            if delta.content:
+                yield delta.content
+
+    @staticmethod
+    def _assistant_tool_message(content: str, tool_calls: List[SimpleNamespace]) -> Dict[str, Any]:
+        return {
+            "role": "assistant",
+            "content": content or None,
+            "tool_calls": [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {"name": call.function.name, "arguments": call.function.arguments},
+                }
+                for call in tool_calls
+            ],
+        }
+
+    def _execute_tool_calls(self, tool_calls: List[Any], messages: List[Dict[str, Any]], memo: Optional[ToolMemo] = None) -> None:
         """
         Execute as chamadas de ferramenta detectadas e anexe os resultados à lista de mensagens.
+        As chamadas de um mesmo turno rodam em paralelo (executor limitado); os resultados
+        são anexados na ordem original. Chamadas repetidas são respondidas pela memória da sessão.
+        """
+        logger.info(f"O agente decidiu chamar {len(tool_calls)} ferramentas")
+        memo = memo if memo is not None else ToolMemo()
+
+        # Cada tarefa roda em uma cópia do contexto para preservar o ID de correlação nos logs:
+        futures: Dict[str, concurrent.futures.Future] = {}
+        keys = []
+        for tool_call in tool_calls:
+            key = ToolMemo.key(tool_call)
+            keys.append(key)
+            if key in futures or memo.get(key) is not None:
+                counter_memo_hits.add(1, {"tool": tool_call.function.name})
+                continue
+            futures[key] = self._tool_executor.submit(contextvars.copy_context().run, self._run_tool, tool_call)
+
+        # Um único prazo para o turno, contado da submissão (e não de quando cada resultado é lido):
+        _, pending = concurrent.futures.wait(futures.values(), timeout=TOOL_CALL_TIMEOUT) if futures else (set(), set())
+        for future in pending:
+            # Chamadas ainda na fila são canceladas; as que já rodam são abandonadas (threads não são interrompíveis).
+            future.cancel()
+
+        for tool_call, key in zip(tool_calls, keys):
+            function_response = memo.get(key)
+            if function_response is None:
+                if futures[key] in pending:
+                    logger.error(f"Tempo limite da ferramenta {tool_call.function.name} excedido.")
+                    function_response = json.dumps({"error": "Tempo limite da ferramenta excedido."})
+                else:
+                    function_response = futures[key].result()
+                memo.put(key, function_response)
+
+            messages.append(self._tool_message(tool_call, tool_call.function.name, function_response))
+
+    async def _execute_tool_calls_async(self, tool_calls: List[Any], messages: List[Dict[str, Any]], memo: Optional[ToolMemo] = None) -> None:
+        """
+        Versão assíncrona de _execute_tool_calls: todas as chamadas do turno são disparadas
+        juntas, cada uma com seu próprio tempo limite. O turno dura o tempo da mais lenta.
+        """
+        async for _ in self._run_tool_calls_streaming(tool_calls, messages, memo):
+            pass
+
+    async def _run_tool_calls_streaming(
+        self,
+        tool_calls: List[Any],
+        messages: List[Dict[str, Any]],
+        memo: Optional[ToolMemo] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Dispara as chamadas em paralelo, emitindo 'tool_start' para todas e 'tool_end'
+        conforme cada uma termina. As mensagens de resultado entram na ordem original.
+        Chamadas já memorizadas (ou repetidas no mesmo passo) não são executadas de novo.
         """
         logger.info(f"O agente decidiu chamar {len(tool_calls)} ferramentas")
-        
+        memo = memo if memo is not None else ToolMemo()
+
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Future] = {}
+        waiting: Dict[asyncio.Future, List[Any]] = {}
+        results: Dict[str, str] = {}
+        keys = []
         for tool_call in tool_calls:
-            function_name = tool_call.function.name
+            key = ToolMemo.key(tool_call)
+            keys.append(key)
+            yield {"type": "tool_start", "id": tool_call.id, "name": tool_call.function.name, "args": tool_call.function.arguments}
+
+            cached = memo.get(key)
+            if cached is not None or key in tasks:
+                counter_memo_hits.add(1, {"tool": tool_call.function.name})
+            if cached is not None:
+                results[key] = cached
+                yield self._tool_end_event(tool_call, cached, started, cached=True)
+                continue
+            if key not in tasks:
+                tasks[key] = asyncio.ensure_future(self._run_tool_async(tool_call))
+            waiting.setdefault(tasks[key], []).append(tool_call)
+
+        pending = set(waiting)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                for tool_call in waiting[task]:
+                    yield self._tool_end_event(tool_call, task.result(), started)
+
+        for key, task in tasks.items():
+            results[key] = task.result()
+            memo.put(key, results[key])
+
+        for tool_call, key in zip(tool_calls, keys):
+            messages.append(self._tool_message(tool_call, tool_call.function.name, results[key]))
+
+    def _tool_end_event(self, tool_call: Any, content: str, started: float, cached: bool = False) -> Dict[str, Any]:
+        return {
+            "type": "tool_end",
+            "id": tool_call.id,
+            "name": tool_call.function.name,
+            "ok": not _is_error_result(content),
+            "cached": cached,
+            "duration_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    def _run_tool(self, tool_call: Any) -> str:
+        function_name = tool_call.function.name
+        function_to_call = available_functions.get(function_name)
+
+        if not function_to_call:
+            logger.error(f"Ferramenta {function_name} não encontrada.")
+            return json.dumps({"error": f"Tool {function_name} not found"})
+
+        try:
             function_args = json.loads(tool_call.function.arguments)
-            
-            function_to_call = available_functions.get(function_name)
-            
-            if not function_to_call:
-                logger.error(f"Ferramenta {function_name} não encontrada.")
-                function_response = json.dumps({"error": f"Tool {function_name} not found"})
-            else:
-                logger.info(f"Executing tool: {function_name} with args: {function_args}")
-                try:
-                    function_response = function_to_call(**function_args)
-                except Exception as e:
-                    logger.error(f"Falha na execução da ferramenta: {e}")
-                    function_response = json.dumps({"error": str(e)})
-            
-            logger.debug(f"Tool response: {function_response}")
-            
-            messages.append(
-                {
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "name": function_name,
-                    "content": function_response,
-                }
-            )
+            logger.info(f"Executing tool: {function_name} with args: {function_args}")
+            function_response = function_to_call(**function_args)
+        except Exception as e:
+            logger.error(f"Falha na execução da ferramenta: {e}")
+            function_response = json.dumps({"error": str(e)})
+
+        logger.debug(f"Tool response: {function_response}")
+        return function_response
+
+    async def _run_tool_async(self, tool_call: Any) -> str:
+        function_name = tool_call.function.name
+        function_to_call = available_async_functions.get(function_name)
+
+        if not function_to_call:
+            logger.error(f"Ferramenta {function_name} não encontrada.")
+            return json.dumps({"error": f"Tool {function_name} not found"})
+
+        try:
+            function_args = json.loads(tool_call.function.arguments)
+            logger.info(f"Executing tool: {function_name} with args: {function_args}")
+            function_response = await asyncio.wait_for(function_to_call(**function_args), timeout=TOOL_CALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(f"Tempo limite da ferramenta {function_name} excedido.")
+            function_response = json.dumps({"error": "Tempo limite da ferramenta excedido."})
+        except Exception as e:
+            logger.error(f"Falha na execução da ferramenta: {e}")
+            function_response = json.dumps({"error": str(e)})
+
+        logger.debug(f"Tool response: {function_response}")
+        return function_response
+
+    @staticmethod
+    def _tool_message(tool_call: Any, function_name: str, content: str) -> Dict[str, Any]:
+        return {
+            "tool_call_id": tool_call.id,
+            "role": "tool",
+            "name": function_name,
+            # Saídas volumosas (ex.: listas inteiras de um tipo) são cortadas antes de voltar ao LLM:
+            "content": trim_text(content, TOOL_OUTPUT_MAX_CHARS),
+        }
@@ -0,0 +1,120 @@
+# Importar do módulo compartilhado:
+import os
+import math
+import re
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Limites de histórico por sessão (tokens estimados em ~4 caracteres por token):
+HISTORY_MAX_TOKENS = int(os.getenv("HISTORY_MAX_TOKENS", 3000))
+HISTORY_WINDOW_MESSAGES = int(os.getenv("HISTORY_WINDOW_MESSAGES", 12))
+HISTORY_SUMMARY_MAX_CHARS = int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", 1500))
+HISTORY_MESSAGE_MAX_CHARS = int(os.getenv("HISTORY_MESSAGE_MAX_CHARS", 4000))
+TOOL_OUTPUT_MAX_CHARS = int(os.getenv("TOOL_OUTPUT_MAX_CHARS", 4000))
+
+CHARS_PER_TOKEN = 4
+SUMMARY_HEADER = "Resumo da conversa anterior:"
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Estimativa barata de tokens (sem tokenizador): ~4 caracteres por token.
+    """
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+def estimate_messages_tokens(messages: List[Dict[str, Any]]) -> int:
+    # +4 tokens por mensagem para papel e delimitadores:
+    return sum(estimate_tokens(m.get("content") if isinstance(m, dict) else getattr(m, "content", None)) + 4 for m in messages)
+
+def trim_text(text: str, max_chars: int) -> str:
+    """
+    Corta textos longos mantendo o início e indicando quanto foi omitido.
+    """
+    if text is None or len(text) <= max_chars:
+        return text
+    omitted = len(text) - max_chars
+    return f"{text[:max_chars]}... [truncado: {omitted} caracteres omitidos]"
+
+def first_sentence(text: str, max_chars: int) -> str:
+    sentence = re.split(r"(?<=[.!?])\s+", " ".join((text or "").split()), maxsplit=1)[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars - 1] + "…"
+
+def fit_to_budget(messages: List[Dict[str, Any]], max_tokens: int = HISTORY_MAX_TOKENS) -> List[Dict[str, Any]]:
+    """
+    Mantém as mensagens mais recentes que cabem no orçamento de tokens.
+    Um resumo inicial (papel 'system') é preservado; o recorte nunca começa por uma resposta.
+    """
+    summary = [m for m in messages[:1] if m.get("role") == "system"]
+    budget = max_tokens - estimate_messages_tokens(summary)
+
+    kept: List[Dict[str, Any]] = []
+    for message in reversed(messages[len(summary):]):
+        cost = estimate_messages_tokens([message])
+        if cost > budget and kept:
+            break
+        kept.append(message)
+        budget -= cost
+
+    kept.reverse()
+    while len(kept) > 1 and kept[0].get("role") == "assistant":
+        kept.pop(0)
+    return summary + kept
+
+class ConversationHistory:
+    """
+    Histórico de uma sessão com memória limitada.
+
+    - Janela deslizante: só as mensagens recentes (até window_messages e max_tokens) vão inteiras ao LLM.
+    - Turnos que saem da janela viram um resumo extrativo (pergunta e primeira frase da resposta).
+    - O resumo também tem tamanho máximo; os pontos mais antigos são descartados primeiro.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = HISTORY_MAX_TOKENS,
+        window_messages: int = HISTORY_WINDOW_MESSAGES,
+        summary_max_chars: int = HISTORY_SUMMARY_MAX_CHARS,
+        message_max_chars: int = HISTORY_MESSAGE_MAX_CHARS
+    ):
+        self.max_tokens = max_tokens
+        self.window_messages = max(2, window_messages)
+        self.summary_max_chars = summary_max_chars
+        self.message_max_chars = message_max_chars
+        self.summarized_turns = 0
+        self._messages: List[Dict[str, str]] = []
+        self._summary: Deque[str] = deque()
+
+    def add_turn(self, user_input: str, response: str) -> None:
+        self._messages.append({"role": "user", "content": trim_text(user_input, self.message_max_chars)})
+        self._messages.append({"role": "assistant", "content": trim_text(response, self.message_max_chars)})
+        self._compact()
+
+    def as_messages(self) -> List[Dict[str, str]]:
+        messages = list(self._messages)
+        if self._summary:
+            messages.insert(0, {"role": "system", "content": "\n".join([SUMMARY_HEADER, *self._summary])})
+        return messages
+
+    def token_count(self) -> int:
+        return estimate_messages_tokens(self.as_messages())
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def _compact(self) -> None:
+        while len(self._messages) > 2 and (
+            len(self._messages) > self.window_messages
+            or estimate_messages_tokens(self._messages) > self.max_tokens
+        ):
+            user, assistant = self._messages[0], self._messages[1]
+            del self._messages[:2]
+            self._summarize(user["content"], assistant["content"])
+
+    def _summarize(self, user_input: str, response: str) -> None:
+        self._summary.append(f"- {first_sentence(user_input, 120)} -> {first_sentence(response, 200)}")
+        self.summarized_turns += 1
+        while len(self._summary) > 1 and sum(len(p) + 1 for p in self._summary) > self.summary_max_chars:
+            self._summary.popleft()
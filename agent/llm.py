@@ -0,0 +1,369 @@
+# Importar do módulo compartilhado:
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Origem das respostas do LLM: openai | stub | record | replay
+# (para um servidor compatível com a API da OpenAI, use openai + OPENAI_BASE_URL)
+AGENT_LLM_BACKEND = os.getenv("AGENT_LLM_BACKEND", "openai").lower()
+LLM_FIXTURES_PATH = os.getenv("LLM_FIXTURES_PATH", os.path.join("data", "llm_fixtures.jsonl"))
+# Latência simulada do stub: até o primeiro fragmento e entre fragmentos:
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", 200))
+LLM_STUB_TOKEN_DELAY_MS = float(os.getenv("LLM_STUB_TOKEN_DELAY_MS", 5))
+STUB_EMBEDDING_DIM = 64
+STUB_MODEL = "stub"
+
+def _plain(obj: Any) -> Any:
+    """
+    Converte respostas do SDK (Pydantic), SimpleNamespace e afins em estruturas JSON puras.
+    Campos None são mantidos: o agente lê, por exemplo, delta.content e message.tool_calls.
+    """
+    if hasattr(obj, "model_dump"):
+        return _plain(obj.model_dump())
+    if isinstance(obj, SimpleNamespace):
+        return _plain(vars(obj))
+    if isinstance(obj, dict):
+        return {k: _plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(v) for v in obj]
+    return obj
+
+def _namespace(obj: Any) -> Any:
+    # O agente lê as respostas por atributo (chunk.choices[0].delta.content), como no SDK:
+    if isinstance(obj, dict):
+        return SimpleNamespace(**{k: _namespace(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return [_namespace(v) for v in obj]
+    return obj
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def stub_embedding(text: str, dim: int = STUB_EMBEDDING_DIM) -> List[float]:
+    """
+    Embedding determinístico (derivado do hash do texto), normalizado.
+    """
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    vector = np.random.default_rng(seed).standard_normal(dim)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+def embeddings_response(text: Any) -> Dict[str, Any]:
+    inputs = text if isinstance(text, list) else [text]
+    return {
+        "object": "list",
+        "model": STUB_MODEL,
+        "data": [{"object": "embedding", "index": i, "embedding": stub_embedding(t)} for i, t in enumerate(inputs)],
+        "usage": {"prompt_tokens": sum(_estimate_tokens(t) for t in inputs), "total_tokens": sum(_estimate_tokens(t) for t in inputs)},
+    }
+
+class ScriptedLLM:
+    """
+    LLM roteirizado e determinístico, no formato da API de chat completions da OpenAI.
+
+    - Pergunta do usuário com ferramentas disponíveis: uma chamada de buscar_pokemon por Pokémon citado
+      (várias em paralelo em comparações) ou a chamada escolhida pelo roteador de intenções.
+    - Após resultados de ferramentas (ou sem ferramentas): texto final citando os resultados.
+    Usado pelo cliente em processo (AGENT_LLM_BACKEND=stub) e pelo servidor tests/stub_llm_server.py.
+    """
+
+    def __init__(self, router: Any = None, latency_ms: float = LLM_STUB_LATENCY_MS, token_delay_ms: float = LLM_STUB_TOKEN_DELAY_MS):
+        if router is None:
+            from agent.core import IntentRouter
+            router = IntentRouter.from_file()
+        self.router = router
+        self.latency = latency_ms / 1000
+        self.token_delay = token_delay_ms / 1000
+        self.calls = 0
+
+    def respond(self, request: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Retorna (conteúdo, chamadas de ferramenta) para a requisição.
+        """
+        self.calls += 1
+        messages = _plain(request.get("messages", []))
+        last = messages[-1] if messages else {}
+
+        if last.get("role") == "tool":
+            results = []
+            for message in reversed(messages):
+                if message.get("role") != "tool":
+                    break
+                results.insert(0, f"{message.get('name', 'ferramenta')}: {str(message.get('content', ''))[:200]}")
+            return "Consultei os dados. " + " | ".join(results), []
+
+        question = str(last.get("content") or "")
+        if request.get("tools"):
+            names = self.router.mentions(question)
+            if names:
+                return "", [("buscar_pokemon", {"nome_ou_id": name}) for name in names]
+            route = self.router.route(question)
+            if route is not None:
+                return "", [(route.tool, route.arguments)]
+        return "Sou um assistente de Pokémons: pergunte sobre stats, tipos, rankings ou confrontos.", []
+
+    def completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        content, calls = self.respond(request)
+        message: Dict[str, Any] = {
+            "role": "assistant",
+            "content": content or None,
+            "tool_calls": [self._tool_call(i, name, args) for i, (name, args) in enumerate(calls)] or None,
+        }
+        return {
+            "id": f"stub-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", STUB_MODEL),
+            "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if calls else "stop"}],
+            "usage": self._usage(request, content, calls),
+        }
+
+    def chunks(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        A mesma resposta em fragmentos de stream (texto palavra a palavra, uma chamada por fragmento).
+        """
+        content, calls = self.respond(request)
+        base = {
+            "id": f"stub-{self.calls}", "object": "chat.completion.chunk",
+            "created": int(time.time()), "model": request.get("model", STUB_MODEL),
+        }
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+            delta = {"content": None, **delta}
+            return {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+        chunks = [chunk({"role": "assistant"})]
+        for i, (name, args) in enumerate(calls):
+            chunks.append(chunk({"tool_calls": [{"index": i, **self._tool_call(i, name, args)}]}))
+        words = content.split(" ") if content else []
+        for i, word in enumerate(words):
+            chunks.append(chunk({"content": word if i == len(words) - 1 else word + " "}))
+        chunks.append(chunk({}, "tool_calls" if calls else "stop"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            chunks.append({**base, "choices": [], "usage": self._usage(request, content, calls)})
+        return chunks
+
+    def _tool_call(self, index: int, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": f"call_{self.calls}_{index}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)},
+        }
+
+    @staticmethod
+    def _usage(request: Dict[str, Any], content: str, calls: List[Any]) -> Dict[str, int]:
+        prompt = _estimate_tokens(json.dumps(_plain(request.get("messages", [])), ensure_ascii=False))
+        completion = _estimate_tokens(content + json.dumps(calls, ensure_ascii=False))
+        return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+class FixtureStore:
+    """
+    Gravações de requisição -> resposta em JSONL, indexadas por um hash das mensagens e ferramentas.
+    """
+
+    def __init__(self, path: str = LLM_FIXTURES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        # O modelo fica fora da chave: a mesma gravação serve a qualquer DEFAULT_MODEL.
+        payload = {
+            "messages": _plain(request.get("messages", [])),
+            "tools": sorted(t["function"]["name"] for t in request.get("tools") or []),
+            "stream": bool(request.get("stream")),
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        key = self.key(request)
+        entry = self._entries.get(key)
+        if entry is None:
+            raise LookupError(f"Nenhuma gravação para esta requisição (chave {key}) em {self.path}.")
+        return entry
+
+    def put(self, request: Dict[str, Any], response: Any) -> None:
+        entry = {"key": self.key(request), "response": _plain(response)}
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# --- Clientes com a mesma interface usada do SDK (client.chat.completions.create / client.embeddings.create) ---
+class _Completions(ABC):
+    """
+    Base das variantes offline: 'produce' devolve um dicionário (resposta completa)
+    ou uma lista de fragmentos quando a requisição pede stream.
+    """
+
+    latency = 0.0
+    token_delay = 0.0
+
+    def __init__(self, is_async: bool):
+        self.is_async = is_async
+
+    @abstractmethod
+    def produce(self, request: Dict[str, Any]) -> Any:
+        pass
+
+    def create(self, **request: Any) -> Any:
+        if self.is_async:
+            return self._create_async(request)
+        time.sleep(self.latency)
+        result = self.produce(request)
+        if not request.get("stream"):
+            return _namespace(result)
+        return self._iterate(result)
+
+    def _iterate(self, chunks: List[Dict[str, Any]]) -> Iterator[Any]:
+        for chunk in chunks:
+            yield _namespace(chunk)
+            time.sleep(self.token_delay)
+
+    async def _create_async(self, request: Dict[str, Any]) -> Any:
+        await asyncio.sleep(self.latency)
+        result = self.produce(request)
+        if not request.get("stream"):
+            return _namespace(result)
+        return self._iterate_async(result)
+
+    async def _iterate_async(self, chunks: List[Dict[str, Any]]) -> AsyncIterator[Any]:
+        for chunk in chunks:
+            yield _namespace(chunk)
+            await asyncio.sleep(self.token_delay)
+
+class StubCompletions(_Completions):
+    def __init__(self, llm: ScriptedLLM, is_async: bool):
+        super().__init__(is_async)
+        self.llm = llm
+        self.latency = llm.latency
+        self.token_delay = llm.token_delay
+
+    def produce(self, request: Dict[str, Any]) -> Any:
+        return self.llm.chunks(request) if request.get("stream") else self.llm.completion(request)
+
+class ReplayCompletions(_Completions):
+    def __init__(self, store: FixtureStore, is_async: bool):
+        super().__init__(is_async)
+        self.store = store
+
+    def produce(self, request: Dict[str, Any]) -> Any:
+        return self.store.get(request)["response"]
+
+class RecordingCompletions:
+    """
+    Repassa as chamadas ao cliente real e grava cada resposta (inclusive streams, fragmento a fragmento).
+    """
+
+    def __init__(self, inner: Any, store: FixtureStore, is_async: bool):
+        self.inner = inner
+        self.store = store
+        self.is_async = is_async
+
+    def create(self, **request: Any) -> Any:
+        if self.is_async:
+            return self._create_async(request)
+        response = self.inner.create(**request)
+        if not request.get("stream"):
+            self.store.put(request, response)
+            return response
+        return self._record(request, response)
+
+    def _record(self, request: Dict[str, Any], stream: Any) -> Iterator[Any]:
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        self.store.put(request, chunks)
+
+    async def _create_async(self, request: Dict[str, Any]) -> Any:
+        response = await self.inner.create(**request)
+        if not request.get("stream"):
+            self.store.put(request, response)
+            return response
+        return self._record_async(request, response)
+
+    async def _record_async(self, request: Dict[str, Any], stream: Any) -> AsyncIterator[Any]:
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        self.store.put(request, chunks)
+
+class _StubEmbeddings:
+    def __init__(self, is_async: bool):
+        self.is_async = is_async
+
+    def create(self, model: str = STUB_MODEL, input: Any = "", **kwargs: Any) -> Any:
+        response = _namespace(embeddings_response(input))
+        if not self.is_async:
+            return response
+
+        async def done() -> Any:
+            return response
+        return done()
+
+class OfflineClient:
+    """
+    Cliente no formato do SDK da OpenAI (client.chat.completions, client.embeddings).
+    """
+
+    def __init__(self, completions: Any, embeddings: Any):
+        self.chat = SimpleNamespace(completions=completions)
+        self.embeddings = embeddings
+
+def create_llm_clients(
+    kind: str = AGENT_LLM_BACKEND,
+    client: Any = None,
+    async_client: Any = None,
+    fixtures_path: str = LLM_FIXTURES_PATH
+) -> Tuple[Any, Any]:
+    """
+    Retorna (cliente síncrono, cliente assíncrono) para o backend escolhido.
+    'record' envolve os clientes reais recebidos; 'stub' e 'replay' não usam rede nem chave de API.
+    """
+    if kind == "openai":
+        return client, async_client
+    if kind == "stub":
+        llm = ScriptedLLM()
+        return (
+            OfflineClient(StubCompletions(llm, is_async=False), _StubEmbeddings(is_async=False)),
+            OfflineClient(StubCompletions(llm, is_async=True), _StubEmbeddings(is_async=True)),
+        )
+    store = FixtureStore(fixtures_path)
+    if kind == "replay":
+        logger.info(f"LLM em modo replay: {len(store)} gravações de {fixtures_path}")
+        return (
+            OfflineClient(ReplayCompletions(store, is_async=False), _StubEmbeddings(is_async=False)),
+            OfflineClient(ReplayCompletions(store, is_async=True), _StubEmbeddings(is_async=True)),
+        )
+    if kind == "record":
+        logger.info(f"LLM em modo record: gravando em {fixtures_path}")
+        # Embeddings não são gravados: seguem para a API real.
+        return (
+            OfflineClient(RecordingCompletions(client.chat.completions, store, is_async=False), client.embeddings),
+            OfflineClient(RecordingCompletions(async_client.chat.completions, store, is_async=True), async_client.embeddings),
+        )
+    raise ValueError(f"AGENT_LLM_BACKEND desconhecido: {kind} (use openai, stub, record ou replay)")
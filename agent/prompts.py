@@ -22,6 +22,8 @@ DIRETRIZES CRÍTICAS (OBRIGATÓRIAS):
 POLÍTICA DE USO DE FERRAMENTAS:
 - Identifique corretamente a ferramenta necessária antes de responder.
 - Execute chamadas de forma sequencial e lógica quando múltiplos dados forem exigidos.
+- Peça apenas os campos necessários (parâmetro 'campos') quando a pergunta for sobre atributos específicos.
+- Listas longas vêm limitadas: use o campo 'total' para informar a quantidade real.
 - Se a ferramenta não retornar dados ou falhar:
   - Informe educadamente que a informação não está disponível.
   - Sugira verificar a grafia ou tentar outro Pokémon.
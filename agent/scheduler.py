@@ -0,0 +1,147 @@
+# Importar do módulo compartilhado:
+import os
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from opentelemetry import metrics
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Controle de admissão do caminho caro (LLM):
+AGENT_MAX_CONCURRENT_TURNS = int(os.getenv("AGENT_MAX_CONCURRENT_TURNS", 16))
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", 200))
+WS_QUEUE_DEPTH = int(os.getenv("WS_QUEUE_DEPTH", 3))
+# Tempo máximo de espera por uma vaga antes de recusar o turno com um quadro "busy":
+AGENT_TURN_WAIT_TIMEOUT = float(os.getenv("AGENT_TURN_WAIT_TIMEOUT", 30))
+
+meter = metrics.get_meter(__name__)
+updown_queue_depth = meter.create_up_down_counter("pokemon.agent.ws.queue_depth", description="Messages waiting in per-connection queues")
+updown_in_flight = meter.create_up_down_counter("pokemon.agent.turns.in_flight", description="Agent turns currently running")
+updown_sessions = meter.create_up_down_counter("pokemon.agent.ws.sessions", description="Open WebSocket sessions")
+histogram_wait = meter.create_histogram("pokemon.agent.ws.wait_time", unit="ms", description="Time a message waits before its turn starts")
+counter_rejected = meter.create_counter("pokemon.agent.ws.rejected", description="Messages or connections refused with a busy frame")
+
+SendEvent = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class TurnScheduler:
+    """
+    Agenda os turnos do agente entre as conexões WebSocket.
+
+    - Semáforo global: no máximo max_concurrent turnos em andamento no processo.
+    - Cada conexão tem uma fila limitada e um único consumidor: seus turnos rodam em ordem,
+      um por vez. Como cada sessão disputa no máximo uma vaga e o semáforo atende em ordem
+      de chegada, uma sessão que envia muitas mensagens não monopoliza o agente.
+    - Sobrecarga é explícita: fila cheia, espera longa demais ou conexões demais geram
+      quadros {"type": "busy", "reason": ...} em vez de acumular trabalho.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = AGENT_MAX_CONCURRENT_TURNS,
+        max_sessions: int = WS_MAX_CONNECTIONS,
+        queue_depth: int = WS_QUEUE_DEPTH,
+        wait_timeout: float = AGENT_TURN_WAIT_TIMEOUT
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_sessions = max_sessions
+        self.queue_depth = queue_depth
+        self.wait_timeout = wait_timeout
+        self.sessions = 0
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def open_session(self) -> bool:
+        """
+        Reserva uma vaga de conexão; False se o limite foi atingido.
+        """
+        if self.sessions >= self.max_sessions:
+            counter_rejected.add(1, {"reason": "too_many_connections"})
+            return False
+        self.sessions += 1
+        updown_sessions.add(1)
+        return True
+
+    def close_session(self) -> None:
+        self.sessions -= 1
+        updown_sessions.add(-1)
+
+    async def serve(
+        self,
+        receive: Callable[[], Awaitable[str]],
+        send_event: SendEvent,
+        handle_turn: Callable[[str], Awaitable[None]]
+    ) -> None:
+        """
+        Lê mensagens da conexão e as entrega ao consumidor da sessão.
+        Retorna (ou propaga a exceção de desconexão) quando o cliente sai; turnos pendentes são descartados.
+        """
+        queue: "asyncio.Queue[Tuple[str, float]]" = asyncio.Queue(maxsize=self.queue_depth)
+        worker = asyncio.create_task(self._consume(queue, send_event, handle_turn))
+
+        try:
+            while True:
+                message = await receive()
+                if worker.done():
+                    # Falha no consumidor: propague em vez de aceitar mensagens que nunca serão atendidas.
+                    worker.result()
+                try:
+                    queue.put_nowait((message, time.perf_counter()))
+                    updown_queue_depth.add(1)
+                except asyncio.QueueFull:
+                    counter_rejected.add(1, {"reason": "queue_full"})
+                    await send_event({"type": "busy", "reason": "queue_full", "queue_depth": self.queue_depth})
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+            if queue.qsize():
+                updown_queue_depth.add(-queue.qsize())
+
+    async def _consume(
+        self,
+        queue: "asyncio.Queue[Tuple[str, float]]",
+        send_event: SendEvent,
+        handle_turn: Callable[[str], Awaitable[None]]
+    ) -> None:
+        while True:
+            message, enqueued_at = await queue.get()
+            updown_queue_depth.add(-1)
+
+            if not await self._acquire_slot():
+                counter_rejected.add(1, {"reason": "overloaded"})
+                logger.warning(f"Turno recusado após {self.wait_timeout}s aguardando vaga.")
+                await send_event({"type": "busy", "reason": "overloaded"})
+                continue
+
+            histogram_wait.record((time.perf_counter() - enqueued_at) * 1000)
+            self.in_flight += 1
+            updown_in_flight.add(1)
+            try:
+                await handle_turn(message)
+            finally:
+                self.in_flight -= 1
+                updown_in_flight.add(-1)
+                self._semaphore.release()
+
+    async def _acquire_slot(self) -> bool:
+        """
+        Aguarda uma vaga global por até wait_timeout segundos.
+        Evita asyncio.wait_for: no Python 3.10/3.11 ele pode engolir um cancelamento que chega junto
+        com a aquisição, e o consumidor de uma conexão já fechada seguiria rodando turnos.
+        """
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            done, _ = await asyncio.wait({acquire}, timeout=self.wait_timeout)
+        except asyncio.CancelledError:
+            self._abandon(acquire)
+            raise
+        if not done:
+            self._abandon(acquire)
+            return False
+        return True
+
+    def _abandon(self, acquire: "asyncio.Future[bool]") -> None:
+        # Se a aquisição já tinha terminado, a vaga é nossa e precisa ser devolvida:
+        if not acquire.cancel() and not acquire.cancelled() and acquire.exception() is None:
+            self._semaphore.release()
@@ -24,4 +24,7 @@ def mock_env(monkeypatch):
 @pytest.fixture
 def pokemon_agent(mock_env, mock_openai):
     """Inicialize um PokemonAgent com dependências simuladas."""
-    return PokemonAgent()
+    agent = PokemonAgent()
+    # Estes testes exercitam o caminho do LLM; o roteador tem testes próprios (test_router.py):
+    agent.router = None
+    return agent
@@ -18,6 +18,7 @@ def agent(mock_openai_client):
     with patch('agent.core.get_openai_api_key', return_value="fake-key"):
         agent = PokemonAgent()
         agent.client = mock_openai_client
+        agent.router = None
         return agent
 
 def test_basic_conversation_flow(agent, mock_openai_client):
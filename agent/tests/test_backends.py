@@ -0,0 +1,139 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from agent import tools
+from agent.backends import ServiceBackend, SnapshotBackend, build_snapshot
+from api.schemas import PokemonDetail, PokemonStats
+
+def _pokemon(pokemon_id, name, types, hp, speed):
+    return {
+        "id": pokemon_id, "name": name, "height": 10, "weight": 100, "types": types,
+        "stats": {"hp": hp, "attack": 50, "defense": 50, "special_attack": 50, "special_defense": 50, "speed": speed},
+    }
+
+SNAPSHOT = {
+    "version": "abc123",
+    "pokemons": [
+        _pokemon(25, "pikachu", ["electric"], 35, 90),
+        _pokemon(4, "charmander", ["fire"], 39, 65),
+        _pokemon(7, "squirtle", ["water"], 44, 43),
+        _pokemon(26, "raichu", ["electric"], 60, 110),
+    ],
+}
+
+@pytest.fixture
+def snapshot():
+    return SnapshotBackend(SNAPSHOT, fallback=MagicMock())
+
+def test_snapshot_lookups_by_name_and_id(snapshot):
+    assert snapshot.get_pokemon("Pikachu")["id"] == 25
+    assert snapshot.get_pokemon("026")["name"] == "raichu"
+    assert snapshot.get_pokemon("pikachuu") == {"error": "Recurso não encontrado.", "sugestoes": ["pikachu"]}
+    assert snapshot.get_pokemon("999") == {"error": "Recurso não encontrado."}
+
+def test_snapshot_lists_and_rankings(snapshot):
+    assert snapshot.list_by_type("electric") == ["pikachu", "raichu"]
+    assert snapshot.ranking("speed", 2) == [
+        {"rank": 1, "name": "raichu", "value": 110},
+        {"rank": 2, "name": "pikachu", "value": 90},
+    ]
+    assert "error" in snapshot.ranking("luck", 2)
+    assert snapshot.dataset_version() == "abc123"
+
+def test_snapshot_matchups_and_similarity_run_locally(snapshot):
+    result = snapshot.evaluate_teams(["squirtle"], ["charmander"])
+    assert result["best_counters"] == {"charmander": "squirtle"}
+    assert [r["name"] for r in snapshot.similar("pikachu", 2)][0] in {"raichu", "charmander", "squirtle"}
+    assert snapshot.evaluate_teams(["missingno"], ["pikachu"]) == {"error": "Recurso não encontrado."}
+    snapshot.fallback.evaluate_teams.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_snapshot_delegates_evolutions_to_fallback(snapshot):
+    snapshot.fallback.evolutions.return_value = {"species": "pikachu", "steps": []}
+    snapshot.fallback.call_async = MagicMock(side_effect=lambda operation, *args: _resolved(snapshot.fallback.evolutions(*args)))
+
+    assert snapshot.evolutions("pikachu") == {"species": "pikachu", "steps": []}
+    assert await snapshot.call_async("evolutions", "pikachu") == {"species": "pikachu", "steps": []}
+
+async def _resolved(value):
+    return value
+
+def test_empty_snapshot_matchups_report_not_found():
+    empty = SnapshotBackend({"version": "v0", "pokemons": []}, fallback=MagicMock())
+    assert empty.evaluate_teams(["pikachu"], ["charmander"]) == {"error": "Recurso não encontrado."}
+    empty.fallback.evaluate_teams.assert_not_called()
+
+def test_snapshot_loads_from_file(tmp_path):
+    path = tmp_path / "pokedex.json"
+    path.write_text(json.dumps(SNAPSHOT), encoding="utf-8")
+    assert len(SnapshotBackend.from_file(str(path)).pokemons) == 4
+
+@pytest.mark.asyncio
+async def test_tools_use_configured_backend(snapshot, mocker):
+    mocker.patch.object(tools, "_tool_backend", snapshot)
+    request = mocker.patch("agent.tools._safe_request")
+
+    assert json.loads(tools.buscar_pokemon("#25", campos=["speed"])) == {"name": "pikachu", "speed": 90}
+    assert json.loads(await tools.top_n_por_stat_async("hp", 1)) == {"stat": "hp", "ranking": [["raichu", 60]]}
+    assert await tools.obter_versao_dados_async() == "abc123"
+    request.assert_not_called()
+
+def test_incomplete_backend_fails_on_instantiation():
+    class PartialBackend(tools.ToolBackend):
+        def get_pokemon(self, nome_ou_id):
+            return {}
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+def test_create_tool_backend_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        tools.create_tool_backend("ftp")
+
+def test_service_backend_calls_services_without_http(mocker):
+    session = MagicMock()
+    detail = PokemonDetail(
+        id=25, name="pikachu", height=4, weight=60, types=["electric"],
+        stats=PokemonStats(hp=35, attack=55, defense=40, special_attack=50, special_defense=50, speed=90),
+    )
+    mocker.patch("api.services.pokemon.PokemonService.get_pokemon_details", side_effect=[detail, None])
+    mocker.patch("api.services.search.SearchService.did_you_mean", return_value=["pikachu"])
+    backend = ServiceBackend(session_factory=lambda: session, redis_client=MagicMock())
+
+    assert backend.get_pokemon("pikachu")["stats"]["speed"] == 90
+    assert backend.get_pokemon("pikachuu") == {"error": "Recurso não encontrado.", "sugestoes": ["pikachu"]}
+    # Cada consulta abre e fecha sua própria sessão:
+    assert session.close.call_count == 2
+
+def test_service_backend_evolutions_handles_unknown_and_unloaded(mocker):
+    from api.services.indexes import UnknownPokemonError
+    mocker.patch("api.services.pokemon.PokemonService.get_evolution_chain", side_effect=[UnknownPokemonError("pikachuu"), None])
+    mocker.patch("api.services.search.SearchService.did_you_mean", return_value=["pikachu"])
+    backend = ServiceBackend(session_factory=MagicMock, redis_client=MagicMock())
+
+    assert backend.evolutions("pikachuu") == {"error": "Recurso não encontrado.", "sugestoes": ["pikachu"]}
+    assert backend.evolutions("pikachu") == {"error": "Recurso não encontrado."}
+
+def test_build_snapshot_pages_through_id_ranges():
+    pages = {1: SNAPSHOT["pokemons"][:2], 3: SNAPSHOT["pokemons"][2:], 5: []}
+
+    def fetch(method, endpoint, params=None, **kwargs):
+        if endpoint == "/v1/dataset/version":
+            return {"version": "v9"}
+        return pages[params["start"]]
+
+    snapshot = build_snapshot(fetch, page_size=2)
+    assert snapshot["version"] == "v9"
+    assert len(snapshot["pokemons"]) == 4
+
+def test_build_snapshot_crosses_id_gaps_up_to_max_id():
+    forms = [_pokemon(10001, "deoxys-attack", ["psychic"], 50, 150)]
+    pages = {1: SNAPSHOT["pokemons"][:2], 10001: forms}
+
+    def fetch(method, endpoint, params=None, **kwargs):
+        if endpoint == "/v1/dataset/version":
+            return {"version": "v9", "pokemons": 3, "max_id": 10001}
+        return pages.get(params["start"], [])
+
+    snapshot = build_snapshot(fetch, page_size=500)
+    assert [p["id"] for p in snapshot["pokemons"]] == [25, 4, 10001]
@@ -92,3 +92,32 @@ def test_tool_execution_error(pokemon_agent, mock_openai, mocker):
     
     assert tool_message['role'] == 'tool'
     assert "Database error" in tool_message['content']
+
+def test_process_message_chains_tool_calls_until_answer(pokemon_agent, mock_openai, mocker):
+    """O laço continua chamando ferramentas até o LLM responder sem elas."""
+    mock_tool_func = MagicMock(return_value='{"name": "pikachu"}')
+    mocker.patch.dict('agent.core.available_functions', {'buscar_pokemon': mock_tool_func})
+
+    def tool_response(call_id, arguments):
+        tool_call = MagicMock(id=call_id)
+        tool_call.function.name = "buscar_pokemon"
+        tool_call.function.arguments = arguments
+        response = MagicMock()
+        response.choices[0].message.tool_calls = [tool_call]
+        return response
+
+    final = MagicMock()
+    final.choices[0].message.content = "Pikachu e Raichu."
+    final.choices[0].message.tool_calls = None
+
+    mock_openai.chat.completions.create.side_effect = [
+        tool_response("call_1", '{"nome_ou_id": "pikachu"}'),
+        tool_response("call_2", '{"nome_ou_id": "raichu"}'),
+        tool_response("call_3", '{"nome_ou_id": "pikachu"}'),
+        final,
+    ]
+
+    assert pokemon_agent.process_message("Compare Pikachu e Raichu") == "Pikachu e Raichu."
+    assert mock_openai.chat.completions.create.call_count == 4
+    # A terceira chamada repete a primeira e é respondida pela memória:
+    assert mock_tool_func.call_count == 2
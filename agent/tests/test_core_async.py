@@ -0,0 +1,245 @@
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+def _chunk(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+def _response(content=None, tool_calls=None):
+    """Resposta em modo stream: texto em dois fragmentos e chamadas de ferramenta fragmentadas."""
+    chunks = []
+    for i, call in enumerate(tool_calls or []):
+        arguments = call.function.arguments
+        chunks.append(_chunk(tool_calls=[_tool_delta(i, call.id, call.function.name, arguments[:3])]))
+        chunks.append(_chunk(tool_calls=[_tool_delta(i, arguments=arguments[3:])]))
+    if content:
+        middle = len(content) // 2
+        chunks += [_chunk(content[:middle]), _chunk(content[middle:])]
+    return _stream(*chunks)
+
+def _tool_call(call_id, name, arguments):
+    tool_call = MagicMock(id=call_id)
+    tool_call.function.name = name
+    tool_call.function.arguments = arguments
+    return tool_call
+
+@pytest.fixture
+def async_agent(pokemon_agent, mocker):
+    mocker.patch("agent.core.obter_versao_dados_async", AsyncMock(return_value="v1"))
+    pokemon_agent.async_client = MagicMock()
+    pokemon_agent.async_client.chat.completions.create = AsyncMock()
+    return pokemon_agent
+
+@pytest.mark.asyncio
+async def test_process_message_async_simple_response(async_agent):
+    async_agent.async_client.chat.completions.create.return_value = _response("Pikachu é elétrico.")
+    assert await async_agent.process_message_async("Quem é Pikachu?") == "Pikachu é elétrico."
+
+@pytest.mark.asyncio
+async def test_process_message_async_runs_async_tools(async_agent, mocker):
+    tool = AsyncMock(return_value='{"name": "pikachu"}')
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": tool})
+    async_agent.async_client.chat.completions.create.side_effect = [
+        _response(tool_calls=[_tool_call("call_1", "buscar_pokemon", '{"nome_ou_id": "pikachu"}')]),
+        _response("Pikachu encontrado."),
+    ]
+
+    assert await async_agent.process_message_async("Quem é Pikachu?") == "Pikachu encontrado."
+    tool.assert_awaited_once_with(nome_ou_id="pikachu")
+    messages = async_agent.async_client.chat.completions.create.call_args_list[1].kwargs["messages"]
+    assert messages[-1]["role"] == "tool"
+    assert messages[-1]["tool_call_id"] == "call_1"
+    # Os fragmentos da chamada de ferramenta são remontados na mensagem do assistente:
+    assert messages[-2]["tool_calls"][0]["function"] == {"name": "buscar_pokemon", "arguments": '{"nome_ou_id": "pikachu"}'}
+
+@pytest.mark.asyncio
+async def test_stream_message_emits_tokens_tool_events_and_done(async_agent, mocker):
+    mocker.patch.dict("agent.core.available_async_functions", {
+        "buscar_pokemon": AsyncMock(return_value='{"name": "pikachu"}'),
+        "listar_por_tipo": AsyncMock(return_value='{"error": "Recurso não encontrado."}'),
+    })
+    async_agent.async_client.chat.completions.create.side_effect = [
+        _response(tool_calls=[
+            _tool_call("call_1", "buscar_pokemon", '{"nome_ou_id": "pikachu"}'),
+            _tool_call("call_2", "listar_por_tipo", '{"tipo": "xyz"}'),
+        ]),
+        _response("Pikachu encontrado."),
+    ]
+
+    events = [event async for event in async_agent.stream_message("Quem é Pikachu?")]
+
+    assert [e["type"] for e in events[:2]] == ["tool_start", "tool_start"]
+    tool_ends = {e["id"]: e["ok"] for e in events if e["type"] == "tool_end"}
+    assert tool_ends == {"call_1": True, "call_2": False}
+    assert "".join(e["content"] for e in events if e["type"] == "token") == "Pikachu encontrado."
+    assert events[-1]["type"] == "done"
+    assert events[-1]["content"] == "Pikachu encontrado."
+    assert events[-1]["ttft_ms"] is not None
+
+@pytest.mark.asyncio
+async def test_stream_message_reports_errors_as_events(async_agent):
+    async_agent.async_client.chat.completions.create.side_effect = RuntimeError("boom")
+    events = [event async for event in async_agent.stream_message("Oi")]
+    assert events == [{"type": "error", "message": "Erro ao processar sua solicitação: boom"}]
+
+@pytest.mark.asyncio
+async def test_concurrent_conversations_do_not_block_each_other(async_agent):
+    async def slow_completion(**kwargs):
+        await asyncio.sleep(0.2)
+        return _response("ok")
+
+    async_agent.async_client.chat.completions.create.side_effect = slow_completion
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(async_agent.process_message_async(f"Pergunta {i}") for i in range(10)))
+    elapsed = time.perf_counter() - start
+
+    assert results == ["ok"] * 10
+    # Dez conversas concorrentes levam ~uma latência, não dez:
+    assert elapsed < 1.0
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently_in_original_order(async_agent, mocker):
+    async def slow_tool(nome_ou_id):
+        await asyncio.sleep(0.3 if nome_ou_id == "lento" else 0.05)
+        return f'{{"name": "{nome_ou_id}"}}'
+
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": slow_tool})
+    calls = [_tool_call(f"call_{i}", "buscar_pokemon", f'{{"nome_ou_id": "{name}"}}')
+             for i, name in enumerate(["lento", "rapido", "medio"])]
+    messages = []
+
+    start = time.perf_counter()
+    await async_agent._execute_tool_calls_async(calls, messages)
+    elapsed = time.perf_counter() - start
+
+    assert [m["tool_call_id"] for m in messages] == ["call_0", "call_1", "call_2"]
+    assert "lento" in messages[0]["content"]
+    # Duração da chamada mais lenta, não a soma:
+    assert elapsed < 0.45
+
+@pytest.mark.asyncio
+async def test_tool_call_timeout_is_reported(async_agent, mocker):
+    async def hanging_tool(**kwargs):
+        await asyncio.sleep(10)
+
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": hanging_tool})
+    mocker.patch("agent.core.TOOL_CALL_TIMEOUT", 0.05)
+    messages = []
+
+    await async_agent._execute_tool_calls_async([_tool_call("call_1", "buscar_pokemon", "{}")], messages)
+    assert "Tempo limite" in messages[0]["content"]
+
+def test_sync_tool_calls_run_concurrently(pokemon_agent, mocker):
+    def slow_tool(nome_ou_id):
+        time.sleep(0.2)
+        return nome_ou_id
+
+    mocker.patch.dict("agent.core.available_functions", {"buscar_pokemon": slow_tool})
+    calls = [_tool_call(f"call_{i}", "buscar_pokemon", f'{{"nome_ou_id": "p{i}"}}') for i in range(3)]
+    messages = []
+
+    start = time.perf_counter()
+    pokemon_agent._execute_tool_calls(calls, messages)
+
+    assert time.perf_counter() - start < 0.5
+    assert [m["content"] for m in messages] == ["p0", "p1", "p2"]
+
+def test_sync_tool_calls_share_one_deadline(pokemon_agent, mocker):
+    def hanging_tool(nome_ou_id):
+        time.sleep(0.5)
+        return nome_ou_id
+
+    mocker.patch.dict("agent.core.available_functions", {"buscar_pokemon": hanging_tool})
+    mocker.patch("agent.core.TOOL_CALL_TIMEOUT", 0.1)
+    calls = [_tool_call(f"call_{i}", "buscar_pokemon", f'{{"nome_ou_id": "p{i}"}}') for i in range(3)]
+    messages = []
+
+    start = time.perf_counter()
+    pokemon_agent._execute_tool_calls(calls, messages)
+
+    # O prazo vale para o turno: não soma um tempo limite por chamada.
+    assert time.perf_counter() - start < 0.25
+    assert all("Tempo limite" in m["content"] for m in messages)
+
+@pytest.mark.asyncio
+async def test_multi_step_loop_chains_tool_calls(async_agent, mocker):
+    buscar = AsyncMock(return_value='{"name": "pikachu", "types": ["electric"]}')
+    listar = AsyncMock(return_value='{"pokemons": ["pikachu", "raichu"]}')
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": buscar, "listar_por_tipo": listar})
+    async_agent.async_client.chat.completions.create.side_effect = [
+        _response(tool_calls=[_tool_call("call_1", "buscar_pokemon", '{"nome_ou_id": "pikachu"}')]),
+        _response(tool_calls=[_tool_call("call_2", "listar_por_tipo", '{"tipo": "electric"}')]),
+        _response("Pikachu e Raichu são elétricos."),
+    ]
+
+    events = [event async for event in async_agent.stream_message("Quais Pokémons têm o tipo do Pikachu?")]
+
+    assert events[-1]["content"] == "Pikachu e Raichu são elétricos."
+    assert events[-1]["usage"]["steps"] == 3
+    buscar.assert_awaited_once()
+    listar.assert_awaited_once_with(tipo="electric")
+
+@pytest.mark.asyncio
+async def test_step_budget_forces_final_answer(async_agent, mocker):
+    mocker.patch("agent.core.AGENT_MAX_STEPS", 2)
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": AsyncMock(return_value="{}")})
+    create = async_agent.async_client.chat.completions.create
+    create.side_effect = [
+        _response(tool_calls=[_tool_call("call_1", "buscar_pokemon", '{"nome_ou_id": "mew"}')]),
+        _response("Resposta final."),
+    ]
+
+    assert await async_agent.process_message_async("Quem é Mew?") == "Resposta final."
+    # A última chamada do orçamento é feita sem ferramentas:
+    assert "tools" in create.call_args_list[0].kwargs
+    assert "tools" not in create.call_args_list[1].kwargs
+
+@pytest.mark.asyncio
+async def test_identical_tool_calls_are_answered_from_session_memo(async_agent, mocker):
+    from agent.core import ToolMemo
+
+    tool = AsyncMock(return_value='{"name": "pikachu"}')
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": tool})
+    memo = ToolMemo()
+    calls = [
+        _tool_call("call_1", "buscar_pokemon", '{"nome_ou_id": "pikachu"}'),
+        _tool_call("call_2", "buscar_pokemon", '{ "nome_ou_id":"pikachu" }'),
+    ]
+
+    # Duplicada no mesmo passo: executa uma vez.
+    messages = []
+    events = [e async for e in async_agent._run_tool_calls_streaming(calls, messages, memo)]
+    assert tool.await_count == 1
+    assert [m["tool_call_id"] for m in messages] == ["call_1", "call_2"]
+    assert len([e for e in events if e["type"] == "tool_end"]) == 2
+
+    # Repetida em outro turno da mesma conversa: vem da memória.
+    messages = []
+    events = [e async for e in async_agent._run_tool_calls_streaming(calls[:1], messages, memo)]
+    assert tool.await_count == 1
+    assert events[-1]["cached"] is True
+    assert messages[0]["content"] == '{"name": "pikachu"}'
+
+@pytest.mark.asyncio
+async def test_error_results_are_not_memoized(async_agent, mocker):
+    from agent.core import ToolMemo
+
+    tool = AsyncMock(return_value='{"error": "Falha na conexão"}')
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": tool})
+    memo = ToolMemo()
+    call = _tool_call("call_1", "buscar_pokemon", '{"nome_ou_id": "pikachu"}')
+
+    await async_agent._execute_tool_calls_async([call], [], memo)
+    await async_agent._execute_tool_calls_async([call], [], memo)
+    assert tool.await_count == 2
+    assert len(memo) == 0
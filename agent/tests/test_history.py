@@ -0,0 +1,51 @@
+from agent.history import (
+    SUMMARY_HEADER, ConversationHistory, estimate_tokens, fit_to_budget, trim_text
+)
+
+def test_estimate_tokens_uses_four_chars_per_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+def test_trim_text_marks_omitted_chars():
+    assert trim_text("curto", 10) == "curto"
+    assert trim_text("x" * 30, 10) == "x" * 10 + "... [truncado: 20 caracteres omitidos]"
+
+def test_window_slides_and_old_turns_become_summary():
+    history = ConversationHistory(window_messages=4, max_tokens=10_000)
+    for i in range(5):
+        history.add_turn(f"Pergunta {i}?", f"Resposta {i}. Detalhes longos que não entram no resumo.")
+
+    messages = history.as_messages()
+    assert len(history) == 4
+    assert history.summarized_turns == 3
+    assert messages[0]["role"] == "system"
+    assert messages[0]["content"].startswith(SUMMARY_HEADER)
+    assert "- Pergunta 0? -> Resposta 0." in messages[0]["content"]
+    assert "Detalhes longos" not in messages[0]["content"]
+    assert [m["content"] for m in messages[1:] if m["role"] == "user"] == ["Pergunta 3?", "Pergunta 4?"]
+
+def test_token_budget_and_summary_are_hard_caps():
+    history = ConversationHistory(window_messages=100, max_tokens=200, summary_max_chars=300, message_max_chars=400)
+    for i in range(200):
+        history.add_turn(f"Pergunta {i} " + "x" * 300, f"Resposta {i}. " + "y" * 300)
+
+    summary = history.as_messages()[0]["content"]
+    assert len(summary) <= 300 + len(SUMMARY_HEADER) + 1
+    assert history.token_count() < 200 + 100
+    # Só o último turno cabe na janela; o resumo mantém os mais recentes que saíram dela:
+    assert history.as_messages()[-2]["content"].startswith("Pergunta 199")
+    assert "Pergunta 198" in summary
+    assert "Pergunta 0 " not in summary
+
+def test_fit_to_budget_keeps_recent_messages_and_summary():
+    messages = [{"role": "system", "content": "Resumo"}]
+    for i in range(10):
+        messages += [{"role": "user", "content": "u" * 40}, {"role": "assistant", "content": "a" * 40}]
+
+    fitted = fit_to_budget(messages, max_tokens=60)
+
+    assert fitted[0] == messages[0]
+    assert fitted[1]["role"] == "user"
+    assert fitted[-1] == messages[-1]
+    assert len(fitted) < len(messages)
@@ -0,0 +1,76 @@
+import json
+import pytest
+from unittest.mock import AsyncMock
+from agent.core import IntentRouter
+from agent.llm import FixtureStore, OfflineClient, ScriptedLLM, StubCompletions, _StubEmbeddings, create_llm_clients
+
+def _stub_clients(llm):
+    return (
+        OfflineClient(StubCompletions(llm, is_async=False), _StubEmbeddings(is_async=False)),
+        OfflineClient(StubCompletions(llm, is_async=True), _StubEmbeddings(is_async=True)),
+    )
+
+@pytest.fixture
+def llm():
+    return ScriptedLLM(IntentRouter(["pikachu", "charizard"]), latency_ms=0, token_delay_ms=0)
+
+@pytest.fixture
+def offline_agent(pokemon_agent, mocker):
+    mocker.patch("agent.core.obter_versao_dados_async", AsyncMock(return_value="v1"))
+    mocker.patch.dict("agent.core.available_async_functions", {
+        "buscar_pokemon": AsyncMock(side_effect=lambda nome_ou_id, campos=None: json.dumps({"name": nome_ou_id})),
+    })
+    pokemon_agent.response_cache = None
+    return pokemon_agent
+
+async def _events(agent, question):
+    return [event async for event in agent.stream_message(question)]
+
+@pytest.mark.asyncio
+async def test_stub_fans_out_tool_calls_and_answers(offline_agent, llm):
+    offline_agent.client, offline_agent.async_client = _stub_clients(llm)
+
+    events = await _events(offline_agent, "Compare Pikachu e Charizard")
+
+    starts = [e for e in events if e["type"] == "tool_start"]
+    assert [json.loads(e["args"])["nome_ou_id"] for e in starts] == ["pikachu", "charizard"]
+    done = events[-1]
+    assert done["type"] == "done"
+    assert '{"name": "pikachu"}' in done["content"] and '{"name": "charizard"}' in done["content"]
+    assert done["usage"]["steps"] == 2 and done["usage"]["prompt_tokens"] > 0
+
+def test_stub_sync_completion_without_tools(llm):
+    client, _ = _stub_clients(llm)
+    response = client.chat.completions.create(model="x", messages=[{"role": "user", "content": "Oi"}])
+    assert response.choices[0].message.tool_calls is None
+    assert "Pokémons" in response.choices[0].message.content
+
+@pytest.mark.asyncio
+async def test_record_then_replay_is_reproducible(offline_agent, llm, tmp_path):
+    path = str(tmp_path / "fixtures.jsonl")
+    client, async_client = _stub_clients(llm)
+
+    offline_agent.client, offline_agent.async_client = create_llm_clients("record", client, async_client, path)
+    recorded = await _events(offline_agent, "Quem é Pikachu?")
+    assert len(FixtureStore(path)) == 2  # pedido da ferramenta + resposta final
+
+    offline_agent.client, offline_agent.async_client = create_llm_clients("replay", fixtures_path=path)
+    replayed = await _events(offline_agent, "Quem é Pikachu?")
+
+    def strip(events):
+        return [(e["type"], e.get("content"), e.get("name")) for e in events]
+    assert strip(replayed) == strip(recorded)
+    assert llm.calls == 2  # o replay não chamou o LLM
+
+@pytest.mark.asyncio
+async def test_replay_without_recording_reports_error(offline_agent, tmp_path):
+    offline_agent.client, offline_agent.async_client = create_llm_clients("replay", fixtures_path=str(tmp_path / "empty.jsonl"))
+
+    events = await _events(offline_agent, "Pergunta nunca gravada")
+
+    assert events[-1]["type"] == "error"
+    assert "Nenhuma gravação" in events[-1]["message"]
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_llm_clients("claude-não-existe")
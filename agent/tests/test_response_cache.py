@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from agent.core import ResponseCache
+from agent.tests.test_core_async import _response
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_normalize_ignores_case_accents_and_punctuation():
+    assert ResponseCache.normalize("  Quem é   PIKACHU?! ") == "quem e pikachu"
+    assert ResponseCache.normalize("quem e pikachu") == ResponseCache.normalize("Quem é Pikachu?")
+
+def test_entries_expire_after_ttl(mocker):
+    clock = mocker.patch("agent.core.time.monotonic", return_value=100.0)
+    cache = ResponseCache(ttl_seconds=10)
+    cache.put("quem e pikachu", "Elétrico.")
+    assert cache.get("quem e pikachu") == "Elétrico."
+
+    clock.return_value = 111.0
+    assert cache.get("quem e pikachu") is None
+    assert len(cache) == 0
+
+def test_dataset_version_change_clears_cache():
+    cache = ResponseCache()
+    cache.sync_version("v1")
+    cache.put("quem e pikachu", "Elétrico.")
+
+    cache.sync_version("v1")
+    assert cache.get("quem e pikachu") == "Elétrico."
+
+    # Versão indisponível não invalida:
+    cache.sync_version(None)
+    assert len(cache) == 1
+
+    cache.sync_version("v2")
+    assert cache.get("quem e pikachu") is None
+
+def test_semantic_match_uses_similarity_threshold():
+    cache = ResponseCache(similarity_threshold=0.9)
+    cache.put("quem e pikachu", "Elétrico.", _unit(1.0, 0.0, 0.0))
+    cache.put("qual o tipo do charizard", "Fogo/Voador.", _unit(0.0, 1.0, 0.0))
+
+    assert cache.get("me fale do pikachu", _unit(0.99, 0.1, 0.0)) == "Elétrico."
+    assert cache.get("quem e bulbasaur", _unit(0.5, 0.5, 0.7)) is None
+
+def test_lru_eviction_drops_vectors():
+    cache = ResponseCache(maxsize=1)
+    cache.put("a", "A", _unit(1.0, 0.0))
+    cache.put("b", "B", _unit(0.0, 1.0))
+    assert cache.get("x", _unit(1.0, 0.0)) is None
+    assert cache.get("b") == "B"
+
+@pytest.fixture
+def cached_agent(pokemon_agent, mocker):
+    mocker.patch("agent.core.obter_versao_dados_async", AsyncMock(return_value="v1"))
+    pokemon_agent.async_client = MagicMock()
+    pokemon_agent.async_client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: _response("Pikachu é elétrico."))
+    return pokemon_agent
+
+@pytest.mark.asyncio
+async def test_repeated_question_is_served_without_llm(cached_agent):
+    create = cached_agent.async_client.chat.completions.create
+
+    assert await cached_agent.process_message_async("Quem é Pikachu?") == "Pikachu é elétrico."
+    events = [e async for e in cached_agent.stream_message("quem e pikachu")]
+
+    assert create.await_count == 1
+    assert events[-1]["cached"] is True
+    assert events[-1]["content"] == "Pikachu é elétrico."
+
+@pytest.mark.asyncio
+async def test_questions_with_history_bypass_cache(cached_agent):
+    create = cached_agent.async_client.chat.completions.create
+    history = [{"role": "user", "content": "Fale do Raichu"}, {"role": "assistant", "content": "Raichu..."}]
+
+    await cached_agent.process_message_async("Quem é Pikachu?", history)
+    await cached_agent.process_message_async("Quem é Pikachu?", history)
+
+    assert create.await_count == 2
+    assert len(cached_agent.response_cache) == 0
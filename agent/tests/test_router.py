@@ -0,0 +1,130 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from agent.core import IntentRouter, ToolMemo
+
+@pytest.fixture
+def router():
+    return IntentRouter(["pikachu", "charizard", "mr-mime"])
+
+@pytest.mark.parametrize("question, tool, arguments", [
+    ("Quem é Pikachu?", "buscar_pokemon", {"nome_ou_id": "pikachu"}),
+    ("stats do pikachu", "buscar_pokemon", {"nome_ou_id": "pikachu"}),
+    ("mr. mime", "buscar_pokemon", {"nome_ou_id": "mr-mime"}),
+    ("qual a velocidade do charizard?", "buscar_pokemon", {"nome_ou_id": "charizard", "campos": ["speed"]}),
+    ("pokémons do tipo fogo", "listar_por_tipo", {"tipo": "fire"}),
+    ("liste 10 pokemons de água", "listar_por_tipo", {"tipo": "water", "limite": 10}),
+    ("top 3 speed", "top_n_por_stat", {"stat": "speed", "n": 3}),
+    ("os mais rápidos", "top_n_por_stat", {"stat": "speed", "n": 5}),
+    ("ranking de ataque especial", "top_n_por_stat", {"stat": "special_attack", "n": 5}),
+    ("Evolução do Pikachu?", "buscar_evolucoes", {"nome": "pikachu"}),
+])
+def test_routes_unambiguous_questions(router, question, tool, arguments):
+    route = router.route(question)
+    assert route is not None
+    assert (route.tool, route.arguments) == (tool, arguments)
+
+@pytest.mark.parametrize("question", [
+    "Oi",
+    "Compare Pikachu e Charizard",
+    "pikachu ganha do charizard?",
+    "Quais Pokémons têm o tipo do Pikachu?",
+    "qual a velocidade",
+    "top 5 pikachu",
+    "evoluções do tipo fogo",
+    "Quem é Bulbasaur?",  # fora do índice local
+])
+def test_ambiguous_or_unknown_questions_go_to_llm(router, question):
+    assert router.route(question) is None
+
+def test_from_file_reads_index_and_snapshot(tmp_path):
+    index = tmp_path / "index.json"
+    index.write_text(json.dumps([{"id": 25, "name": "pikachu"}]))
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text(json.dumps({"version": "v1", "pokemons": [{"id": 151, "name": "mew"}]}))
+
+    assert IntentRouter.from_file(str(index)).route("pikachu") is not None
+    assert IntentRouter.from_file(str(snapshot)).route("mew") is not None
+    # Sem índice, rankings e tipos continuam funcionando:
+    missing = IntentRouter.from_file(str(tmp_path / "missing.json"))
+    assert missing.route("pikachu") is None
+    assert missing.route("top 5 defesa") is not None
+
+def test_render_templates(router):
+    pokemon = json.dumps({
+        "id": 25, "name": "pikachu", "types": ["electric"], "height": 4, "weight": 60,
+        "hp": 35, "attack": 55, "defense": 40, "special_attack": 50, "special_defense": 50, "speed": 90,
+    })
+    answer = IntentRouter.render(router.route("pikachu"), pokemon)
+    assert "**Pikachu** (#25)" in answer and "electric" in answer and "Velocidade: 90" in answer
+    assert "0.4 m" in answer and "6 kg" in answer
+
+    stat = json.dumps({"name": "pikachu", "speed": 90})
+    assert IntentRouter.render(router.route("velocidade do pikachu"), stat) == "A velocidade de **Pikachu** é 90."
+
+    ranking = json.dumps({"stat": "speed", "ranking": [["electrode", 140], ["jolteon", 130]]})
+    assert IntentRouter.render(router.route("top 2 speed"), ranking) == "Top 2 em velocidade:\n1. Electrode — 140\n2. Jolteon — 130"
+
+    listing = json.dumps({"total": 3, "pokemons": ["charmander"], "omitidos": 2})
+    assert IntentRouter.render(router.route("tipo fogo"), listing) == "Há 3 Pokémons do tipo fire: Charmander. (mais 2 não listados)"
+
+def test_render_evolution_chain(router):
+    chain = json.dumps({"pokemon": "pikachu", "base": ["pichu"], "evolucoes": [["pichu", "pikachu", None], ["pikachu", "raichu", "item thunder-stone"]]})
+    assert IntentRouter.render(router.route("evolução do pikachu"), chain) == (
+        "Cadeia de evolução de **Pikachu**:\n- Pichu → Pikachu\n- Pikachu → Raichu (item thunder-stone)"
+    )
+    single = json.dumps({"pokemon": "charizard", "base": ["charizard"], "evolucoes": []})
+    assert IntentRouter.render(router.route("charizard evolui?"), single) == "**Charizard** não evolui."
+
+def test_render_errors_fall_back(router):
+    route = router.route("pikachu")
+    assert IntentRouter.render(route, json.dumps({"error": "Falha na conexão"})) is None
+    assert IntentRouter.render(route, "not json") is None
+    assert IntentRouter.render(route, json.dumps({"name": "pikachu"})) is None
+
+@pytest.fixture
+def routed_agent(pokemon_agent, mocker):
+    mocker.patch("agent.core.obter_versao_dados_async", AsyncMock(return_value="v1"))
+    pokemon_agent.router = IntentRouter(["pikachu"])
+    pokemon_agent.async_client = MagicMock()
+    pokemon_agent.async_client.chat.completions.create = AsyncMock()
+    return pokemon_agent
+
+@pytest.mark.asyncio
+async def test_stream_answers_routed_question_without_llm(routed_agent, mocker):
+    tool = AsyncMock(return_value=json.dumps({"name": "pikachu", "speed": 90}))
+    mocker.patch.dict("agent.core.available_async_functions", {"buscar_pokemon": tool})
+
+    memo = ToolMemo()
+    events = [e async for e in routed_agent.stream_message("velocidade do pikachu", tool_memo=memo)]
+
+    assert [e["type"] for e in events] == ["tool_start", "tool_end", "token", "done"]
+    assert events[-1]["content"] == "A velocidade de **Pikachu** é 90."
+    assert events[-1]["route"] == "pokemon_stat"
+    tool.assert_awaited_once_with(nome_ou_id="pikachu", campos=["speed"])
+    routed_agent.async_client.chat.completions.create.assert_not_called()
+    # O resultado fica na memória da sessão para perguntas seguintes:
+    assert len(memo) == 1
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_to_llm_when_tool_fails(routed_agent, mocker):
+    from agent.tests.test_core_async import _response
+    mocker.patch.dict("agent.core.available_async_functions", {
+        "buscar_pokemon": AsyncMock(return_value=json.dumps({"error": "Falha na conexão"})),
+    })
+    routed_agent.async_client.chat.completions.create.side_effect = lambda **kwargs: _response("Não consegui consultar agora.")
+
+    events = [e async for e in routed_agent.stream_message("pikachu")]
+
+    assert events[-1]["type"] == "done"
+    assert events[-1]["content"] == "Não consegui consultar agora."
+    assert events[-1]["route"] is None
+    routed_agent.async_client.chat.completions.create.assert_called_once()
+
+def test_process_message_uses_router(pokemon_agent, mock_openai, mocker):
+    pokemon_agent.router = IntentRouter(["pikachu"])
+    listing = json.dumps({"total": 1, "pokemons": ["pikachu"]})
+    mocker.patch.dict("agent.core.available_functions", {"listar_por_tipo": MagicMock(return_value=listing)})
+
+    assert pokemon_agent.process_message("pokémons do tipo elétrico") == "Há 1 Pokémons do tipo electric: Pikachu."
+    mock_openai.chat.completions.create.assert_not_called()
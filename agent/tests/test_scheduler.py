@@ -0,0 +1,156 @@
+import asyncio
+import pytest
+from agent.scheduler import TurnScheduler
+
+class FakeConnection:
+    """Conexão simulada: entrega as mensagens e depois 'desconecta' quando liberada."""
+
+    def __init__(self, messages):
+        self.inbox = asyncio.Queue()
+        for message in messages:
+            self.inbox.put_nowait(message)
+        self.sent = []
+
+    async def receive(self):
+        message = await self.inbox.get()
+        if message is None:
+            raise ConnectionError("disconnected")
+        return message
+
+    async def send(self, event):
+        self.sent.append(event)
+
+    def disconnect(self):
+        self.inbox.put_nowait(None)
+
+async def _serve(scheduler, connection, handle_turn):
+    with pytest.raises(ConnectionError):
+        await scheduler.serve(connection.receive, connection.send, handle_turn)
+
+@pytest.mark.asyncio
+async def test_turns_of_one_session_run_in_order():
+    scheduler = TurnScheduler(max_concurrent=4, queue_depth=5)
+    connection = FakeConnection(["a", "b", "c"])
+    done = []
+    finished = asyncio.Event()
+
+    async def handle_turn(message):
+        await asyncio.sleep(0)
+        done.append(message)
+        if len(done) == 3:
+            finished.set()
+
+    task = asyncio.create_task(_serve(scheduler, connection, handle_turn))
+    await asyncio.wait_for(finished.wait(), 1)
+    connection.disconnect()
+    await task
+
+    assert done == ["a", "b", "c"]
+    assert connection.sent == []
+
+@pytest.mark.asyncio
+async def test_full_queue_sends_busy_frame():
+    scheduler = TurnScheduler(max_concurrent=1, queue_depth=1)
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def handle_turn(message):
+        started.set()
+        await release.wait()
+
+    connection = FakeConnection(["a"])
+    task = asyncio.create_task(_serve(scheduler, connection, handle_turn))
+    await asyncio.wait_for(started.wait(), 1)
+
+    # "a" está em andamento: "b" ocupa a fila e "c" é recusada.
+    for message in ("b", "c"):
+        connection.inbox.put_nowait(message)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert connection.sent == [{"type": "busy", "reason": "queue_full", "queue_depth": 1}]
+    release.set()
+    connection.disconnect()
+    await task
+
+@pytest.mark.asyncio
+async def test_global_limit_is_shared_fairly_between_sessions():
+    scheduler = TurnScheduler(max_concurrent=1, queue_depth=5)
+    order = []
+    running = 0
+    peak = 0
+
+    async def handle_turn(message):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        order.append(message)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    flooder = FakeConnection(["f1", "f2", "f3"])
+    polite = FakeConnection(["p1"])
+    tasks = [
+        asyncio.create_task(_serve(scheduler, flooder, handle_turn)),
+        asyncio.create_task(_serve(scheduler, polite, handle_turn)),
+    ]
+    while len(order) < 4:
+        await asyncio.sleep(0.01)
+    flooder.disconnect()
+    polite.disconnect()
+    await asyncio.gather(*tasks)
+
+    assert peak == 1
+    # A sessão com uma única mensagem não espera por toda a fila da outra:
+    assert order.index("p1") <= 1
+
+@pytest.mark.asyncio
+async def test_turn_waiting_too_long_is_refused():
+    scheduler = TurnScheduler(max_concurrent=1, queue_depth=2, wait_timeout=0.01)
+    await scheduler._semaphore.acquire()
+    handled = []
+
+    async def handle_turn(message):
+        handled.append(message)
+
+    connection = FakeConnection(["a"])
+    task = asyncio.create_task(_serve(scheduler, connection, handle_turn))
+    while not connection.sent:
+        await asyncio.sleep(0.01)
+    connection.disconnect()
+    await task
+
+    assert connection.sent == [{"type": "busy", "reason": "overloaded"}]
+    assert handled == []
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_running_turn():
+    scheduler = TurnScheduler(max_concurrent=1, queue_depth=2)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def handle_turn(message):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    connection = FakeConnection(["a"])
+    task = asyncio.create_task(_serve(scheduler, connection, handle_turn))
+    await asyncio.wait_for(started.wait(), 1)
+    connection.disconnect()
+    await task
+
+    assert cancelled.is_set()
+    assert scheduler.in_flight == 0
+    # A vaga global foi devolvida:
+    assert not scheduler._semaphore.locked()
+
+def test_session_limit():
+    scheduler = TurnScheduler(max_sessions=1)
+    assert scheduler.open_session()
+    assert not scheduler.open_session()
+    scheduler.close_session()
+    assert scheduler.open_session()
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from agent import tools
+from agent.tools import ToolResultCache
+
+@pytest.fixture
+def cache(mocker):
+    cache = ToolResultCache(ttl_seconds=60, maxsize=2)
+    mocker.patch.object(tools, "tool_cache", cache)
+    return cache
+
+def test_key_ignores_case_and_param_order():
+    assert ToolResultCache.key("GET", "/v1/pokemons/Pikachu") == ToolResultCache.key("GET", "/v1/pokemons/pikachu")
+    assert ToolResultCache.key("GET", "/v1/stats/ranking", {"stat": "hp", "limit": 5}) == \
+        ToolResultCache.key("GET", "/v1/stats/ranking", {"limit": 5, "stat": "hp"})
+
+def test_ttl_and_lru_bounds(mocker):
+    clock = mocker.patch("agent.tools.time.monotonic", return_value=0.0)
+    cache = ToolResultCache(ttl_seconds=10, maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"name": key})
+
+    assert cache.get("a") is None
+    assert cache.get("c") == {"name": "c"}
+    clock.return_value = 11.0
+    assert cache.get("c") is None
+
+def test_errors_are_not_cached(cache):
+    cache.put("k", {"error": "Falha na conexão"})
+    assert len(cache) == 0
+
+def test_sync_tools_reuse_cached_results(cache, mocker):
+    request = mocker.patch("agent.tools._request", return_value={"name": "pikachu"})
+
+    tools.buscar_pokemon("Pikachu")
+    tools.buscar_pokemon("pikachu")
+
+    request.assert_called_once()
+    assert (cache.misses, cache.hits) == (1, 1)
+
+def test_sync_concurrent_identical_calls_are_coalesced(cache, mocker):
+    started = threading.Event()
+
+    def slow_request(*args):
+        started.set()
+        time.sleep(0.2)
+        return {"pokemons": ["pikachu"]}
+
+    request = mocker.patch("agent.tools._request", side_effect=slow_request)
+    threads = [threading.Thread(target=tools.listar_por_tipo, args=("electric",)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    request.assert_called_once()
+    assert cache.misses == 1
+    assert cache.hits + cache.coalesced == 4
+
+@pytest.mark.asyncio
+async def test_async_concurrent_identical_calls_are_coalesced(cache, mocker):
+    calls = []
+
+    async def slow_request(*args):
+        calls.append(args)
+        await asyncio.sleep(0.1)
+        return [{"rank": 1, "name": "blissey", "value": 255}]
+
+    mocker.patch("agent.tools._request_async", side_effect=slow_request)
+    results = await asyncio.gather(*(tools.top_n_por_stat_async("hp", 1) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert len(set(results)) == 1
+    assert (cache.misses, cache.coalesced) == (1, 9)
+
+    # Depois de concluída, a consulta é servida pelo cache:
+    await tools.top_n_por_stat_async("hp", 1)
+    assert cache.hits == 1
+
+@pytest.mark.asyncio
+async def test_async_caller_timeout_does_not_cancel_shared_request(cache, mocker):
+    async def slow_request(*args):
+        await asyncio.sleep(0.1)
+        return {"name": "mew"}
+
+    mocker.patch("agent.tools._request_async", side_effect=slow_request)
+    impatient = asyncio.ensure_future(asyncio.wait_for(tools.buscar_pokemon_async("mew"), timeout=0.01))
+    patient = asyncio.ensure_future(tools.buscar_pokemon_async("mew"))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await impatient
+    assert await patient == '{"name":"mew"}'
+
+def test_dataset_version_bypasses_cache(cache, mocker):
+    request = mocker.patch("agent.tools._request_async", MagicMock())
+    async def version(*args):
+        return {"version": "v1"}
+    request.side_effect = version
+
+    async def run():
+        await tools.obter_versao_dados_async()
+        await tools.obter_versao_dados_async()
+
+    asyncio.run(run())
+    assert request.call_count == 2
+    assert len(cache) == 0
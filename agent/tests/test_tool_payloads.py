@@ -0,0 +1,60 @@
+import json
+import pytest
+from agent import tools
+
+PIKACHU = {
+    "id": 25, "name": "pikachu", "height": 4, "weight": 60, "types": ["electric"],
+    "stats": {"hp": 35, "attack": 55, "defense": 40, "special_attack": 50, "special_defense": 50, "speed": 90},
+}
+
+@pytest.fixture
+def api(mocker):
+    return mocker.patch("agent.tools._safe_request")
+
+def test_buscar_pokemon_flattens_and_minifies(api):
+    api.return_value = PIKACHU
+    payload = tools.buscar_pokemon("pikachu")
+
+    assert " " not in payload
+    assert json.loads(payload)["speed"] == 90
+    assert "stats" not in json.loads(payload)
+
+def test_buscar_pokemon_projects_requested_fields(api):
+    api.return_value = PIKACHU
+    assert json.loads(tools.buscar_pokemon("pikachu", campos=["types", "desconhecido"])) == {"name": "pikachu", "types": ["electric"]}
+
+def test_listar_por_tipo_caps_list_with_total(api):
+    api.return_value = [f"p{i}" for i in range(120)]
+    result = json.loads(tools.listar_por_tipo("water", limite=10))
+
+    assert result["total"] == 120
+    assert result["omitidos"] == 110
+    assert result["pokemons"] == [f"p{i}" for i in range(10)]
+
+def test_small_lists_are_not_marked_as_truncated(api):
+    api.return_value = ["pikachu", "raichu"]
+    assert json.loads(tools.listar_por_tipo("electric")) == {"total": 2, "pokemons": ["pikachu", "raichu"]}
+
+def test_ranking_uses_name_value_pairs(api):
+    api.return_value = [{"rank": 1, "name": "blissey", "value": 255}, {"rank": 2, "name": "chansey", "value": 250}]
+    assert json.loads(tools.top_n_por_stat("hp", 2)) == {"stat": "hp", "ranking": [["blissey", 255], ["chansey", 250]]}
+
+def test_errors_pass_through_unchanged(api):
+    api.return_value = {"error": "Recurso não encontrado.", "sugestoes": ["pikachu"]}
+    assert json.loads(tools.buscar_pokemon("pikachuu", campos=["types"])) == api.return_value
+    # Sem escapes de acentos:
+    assert "não" in tools.buscar_pokemon("pikachuu")
+
+def test_buscar_evolucoes_lists_links_with_conditions(api):
+    api.return_value = {"species": "eevee", "steps": [
+        {"species": "eevee", "stage": 1, "evolves_from": None, "trigger": None, "min_level": None, "item": None},
+        {"species": "vaporeon", "stage": 2, "evolves_from": "eevee", "trigger": "use-item", "min_level": None, "item": "water-stone"},
+        {"species": "umbreon", "stage": 2, "evolves_from": "eevee", "trigger": "level-up", "min_level": None, "item": None},
+        {"species": "kadabra", "stage": 2, "evolves_from": "abra", "trigger": "level-up", "min_level": 16, "item": None},
+    ]}
+    assert json.loads(tools.buscar_evolucoes("eevee")) == {
+        "pokemon": "eevee",
+        "base": ["eevee"],
+        "evolucoes": [["eevee", "vaporeon", "item water-stone"], ["eevee", "umbreon", "subir de nível"], ["abra", "kadabra", "nível 16"]],
+    }
+    api.assert_called_once_with("GET", "/v1/pokemons/eevee/evolutions")
@@ -1,3 +1,4 @@
+import json
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 import pytest
@@ -9,8 +10,16 @@ client = TestClient(app)
 def mock_app_agent(mocker):
     """Simule a instância do agente global em agent_app."""
     mock_agent = MagicMock()
-    # Configure o mock para retornar uma resposta previsível:
-    mock_agent.process_message.return_value = "Pika pika!"
+
+    # Configure o mock para emitir um fluxo previsível de eventos:
+    async def stream_message(user_input, history, tool_memo=None):
+        yield {"type": "tool_start", "id": "call_1", "name": "buscar_pokemon", "args": "{}"}
+        yield {"type": "tool_end", "id": "call_1", "name": "buscar_pokemon", "ok": True, "duration_ms": 1.0}
+        yield {"type": "token", "content": "Pika "}
+        yield {"type": "token", "content": "pika!"}
+        yield {"type": "done", "content": "Pika pika!", "ttft_ms": 1.0}
+
+    mock_agent.stream_message = MagicMock(side_effect=stream_message)
     
     # Corrija a variável 'agent' no módulo agent_app:
     mocker.patch("agent.agent_app.agent", mock_agent)
@@ -26,22 +35,40 @@ def test_websocket_message_flow(mock_app_agent):
     """Teste o envio de uma mensagem e o recebimento de uma resposta."""
     with client.websocket_connect("/ws") as websocket:
         websocket.send_text("Hello agent")
-        response = websocket.receive_text()
-        assert response == "Pika pika!"
+        events = [json.loads(websocket.receive_text()) for _ in range(5)]
+        assert [e["type"] for e in events] == ["tool_start", "tool_end", "token", "token", "done"]
+        assert "".join(e["content"] for e in events if e["type"] == "token") == "Pika pika!"
+        assert events[-1]["content"] == "Pika pika!"
         
         # O agente de verificação foi chamado:
-        mock_app_agent.process_message.assert_called_once()
-        args = mock_app_agent.process_message.call_args
+        mock_app_agent.stream_message.assert_called_once()
+        args = mock_app_agent.stream_message.call_args
         assert args[0][0] == "Hello agent" # O primeiro argumento é user_input:
 
+def test_websocket_history_keeps_completed_turns(mock_app_agent):
+    """O segundo turno recebe o histórico com a resposta completa do primeiro."""
+    with client.websocket_connect("/ws") as websocket:
+        for question in ("Primeira", "Segunda"):
+            websocket.send_text(question)
+            while json.loads(websocket.receive_text())["type"] != "done":
+                pass
+
+    first_call, second_call = mock_app_agent.stream_message.call_args_list
+    assert first_call[0][1] == []
+    assert second_call[0][1] == [
+        {"role": "user", "content": "Primeira"},
+        {"role": "assistant", "content": "Pika pika!"},
+    ]
+
 def test_websocket_agent_not_initialized(mocker):
     """Comportamento do teste quando o agente não inicializa."""
     # Defina o agente como Nenhum:
     mocker.patch("agent.agent_app.agent", None)
     
     with client.websocket_connect("/ws") as websocket:
-        response = websocket.receive_text()
-        assert "Erro: Agente não inicializado" in response
+        event = json.loads(websocket.receive_text())
+        assert event["type"] == "error"
+        assert "Erro: Agente não inicializado" in event["message"]
         # A conexão deve ser fechada:
         with pytest.raises(Exception): # starlette.websockets.WebSocketDisconnect ou similar
              websocket.receive_text()
@@ -54,3 +81,14 @@ def test_websocket_disconnect(mock_app_agent):
 # Se o aplicativo não travar, o teste passa.
 # Não podemos verificar os logs facilmente aqui sem capturá-los,
 # mas o objetivo principal é garantir que o servidor não retorne 500.
+
+def test_websocket_rejects_when_connection_limit_reached(mock_app_agent, mocker):
+    """Acima do limite de sessões, a conexão recebe um quadro 'busy' e é fechada."""
+    mocker.patch("agent.agent_app.scheduler.max_sessions", 0)
+
+    with client.websocket_connect("/ws") as websocket:
+        event = json.loads(websocket.receive_text())
+        assert event == {"type": "busy", "reason": "too_many_connections"}
+        with pytest.raises(Exception):
+            websocket.receive_text()
+    mock_app_agent.stream_message.assert_not_called()
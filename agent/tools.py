@@ -1,8 +1,17 @@
 # Importar do módulo compartilhado:
+import os
+import asyncio
 import requests
+import httpx
 import json
 import time
-from typing import Optional, Dict, Any
+import threading
+import contextvars
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Tuple
+from opentelemetry import metrics
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from common.config import API_BASE_URL, ENABLE_JSON_LOGS, APP_ENV
@@ -12,6 +21,13 @@ REQUEST_TIMEOUT = 60  # Segundos.
 
 logger = get_logger("pokemon_tools")
 
+# Cache de resultados compartilhado entre sessões (TTL 0 desativa):
+TOOL_CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", 300))
+TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", 1024))
+
+meter = metrics.get_meter(__name__)
+counter_tool_cache = meter.create_counter("pokemon.agent.tool_cache", description="Tool HTTP lookups by cache result")
+
 # --- Configuração de sessão de rede ---
 def create_retry_session(
     retries=3,
@@ -33,14 +49,187 @@ def create_retry_session(
 
 http_session = create_retry_session()
 
+# Executor para requisições independentes disparadas por uma mesma ferramenta:
+_parallel_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-http")
+
+# --- Cliente HTTP assíncrono (caminho não bloqueante do agente) ---
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+ASYNC_RETRIES = 3
+ASYNC_BACKOFF_FACTOR = 1
+
+_async_client: Optional[httpx.AsyncClient] = None
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente assíncrono compartilhado (pool de conexões único para todas as sessões).
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            transport=httpx.AsyncHTTPTransport(retries=ASYNC_RETRIES),
+        )
+    return _async_client
+
+async def close_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+# --- Cache de resultados ---
+class ToolResultCache:
+    """
+    Cache em processo das respostas GET da API, com TTL e limite de tamanho (LRU).
+
+    Consultas idênticas simultâneas são coalescidas (single-flight): apenas a primeira
+    vai à API e as demais aguardam o mesmo resultado. Respostas com erro não são guardadas.
+    """
+
+    def __init__(self, ttl_seconds: float = TOOL_CACHE_TTL, maxsize: int = TOOL_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_async: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.maxsize > 0
+
+    @staticmethod
+    def key(method: str, endpoint: str, params: Optional[Dict] = None, json_body: Optional[Dict] = None) -> str:
+        # A API não diferencia maiúsculas em nomes e tipos:
+        return json.dumps([method, endpoint, params or {}, json_body], sort_keys=True, default=str).lower()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value: Any) -> None:
+        if isinstance(value, dict) and "error" in value:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, result: str) -> None:
+        setattr(self, result, getattr(self, result) + 1)
+        counter_tool_cache.add(1, {"result": result})
+
+    def load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor em cache ou executa 'loader' uma única vez entre threads concorrentes.
+        """
+        value = self.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            self._count("coalesced")
+            return future.result()
+
+        self._count("misses")
+        try:
+            value = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def load_async(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Versão assíncrona de load. A consulta compartilhada roda em uma tarefa própria:
+        o cancelamento de um chamador (ex.: tempo limite) não afeta os demais.
+        """
+        value = self.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+
+        inflight_key = (asyncio.get_running_loop(), key)
+        task = self._inflight_async.get(inflight_key)
+        if task is None:
+            self._count("misses")
+            task = asyncio.ensure_future(loader())
+            self._inflight_async[inflight_key] = task
+            task.add_done_callback(lambda t: self._finish_async(inflight_key, t))
+        else:
+            self._count("coalesced")
+        return await asyncio.shield(task)
+
+    def _finish_async(self, inflight_key: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Future) -> None:
+        self._inflight_async.pop(inflight_key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.put(inflight_key[1], task.result())
+
+tool_cache = ToolResultCache()
+
 # --- Função Helper ---
-def _safe_request(method: str, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+def _extract_suggestions(response: Any) -> list:
+    try:
+        body = response.json()
+    except ValueError:
+        return []
+    return body.get("suggestions", []) if isinstance(body, dict) else []
+
+def _safe_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict] = None,
+    json_body: Optional[Dict] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Requisição à API com tratamento de erros. Consultas GET passam pelo cache compartilhado.
+    """
+    if use_cache and method == "GET" and tool_cache.enabled:
+        key = ToolResultCache.key(method, endpoint, params, json_body)
+        return tool_cache.load(key, lambda: _request(method, endpoint, params, json_body))
+    return _request(method, endpoint, params, json_body)
+
+def _request(method: str, endpoint: str, params: Optional[Dict] = None, json_body: Optional[Dict] = None) -> Dict[str, Any]:
     url = f"{API_BASE_URL}{endpoint}"
     logger.info(f"Solicitando: {method} {url} Params={params}")
     
     try:
         start_time = time.time()
-        response = http_session.request(method, url, params=params, timeout=REQUEST_TIMEOUT)
+        response = http_session.request(method, url, params=params, json=json_body, timeout=REQUEST_TIMEOUT)
         duration = time.time() - start_time
         
         logger.info(f"Resposta: {response.status_code} Duração={duration:.2f}s")
@@ -49,7 +238,12 @@ def _safe_request(method: str, endpoint: str, params: Optional[Dict] = None) ->
             return response.json()
         elif response.status_code == 404:
             logger.warning(f"Recurso não encontrado: {url}")
-            return {"error": "Recurso não encontrado."}
+            error = {"error": "Recurso não encontrado."}
+            suggestions = _extract_suggestions(response)
+            if suggestions:
+                # Permite que o LLM corrija o nome sem novas tentativas às cegas:
+                error["sugestoes"] = suggestions
+            return error
         else:
             logger.error(f"Erro da API {response.status_code}: {response.text}")
             return {"error": f"Erro da API: {response.status_code}"}
@@ -64,43 +258,375 @@ def _safe_request(method: str, endpoint: str, params: Optional[Dict] = None) ->
         logger.exception("Erro inesperado")
         return {"error": "Erro interno inesperado."}
 
+async def _safe_request_async(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict] = None,
+    json_body: Optional[Dict] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Equivalente assíncrono de _safe_request: mesmas mensagens de erro, mesma política de
+    retentativas e o mesmo cache (consultas idênticas entre sessões são coalescidas).
+    """
+    if use_cache and method == "GET" and tool_cache.enabled:
+        key = ToolResultCache.key(method, endpoint, params, json_body)
+        return await tool_cache.load_async(key, lambda: _request_async(method, endpoint, params, json_body))
+    return await _request_async(method, endpoint, params, json_body)
+
+async def _request_async(method: str, endpoint: str, params: Optional[Dict] = None, json_body: Optional[Dict] = None) -> Dict[str, Any]:
+    client = get_async_client()
+    url = f"{API_BASE_URL}{endpoint}"
+    logger.info(f"Solicitando: {method} {url} Params={params}")
+
+    try:
+        start_time = time.time()
+        for attempt in range(ASYNC_RETRIES + 1):
+            response = await client.request(method, endpoint, params=params, json=json_body)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == ASYNC_RETRIES:
+                break
+            # Backoff exponencial, como o Retry do urllib3 na sessão síncrona:
+            await asyncio.sleep(ASYNC_BACKOFF_FACTOR * (2 ** attempt))
+        duration = time.time() - start_time
+
+        logger.info(f"Resposta: {response.status_code} Duração={duration:.2f}s")
+
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 404:
+            logger.warning(f"Recurso não encontrado: {url}")
+            error = {"error": "Recurso não encontrado."}
+            suggestions = _extract_suggestions(response)
+            if suggestions:
+                error["sugestoes"] = suggestions
+            return error
+        else:
+            logger.error(f"Erro da API {response.status_code}: {response.text}")
+            return {"error": f"Erro da API: {response.status_code}"}
+
+    except httpx.TimeoutException:
+        logger.error(f"Tempo limite ao conectar a {url}")
+        return {"error": "Tempo limite de conexão excedido."}
+    except httpx.HTTPError as e:
+        logger.error(f"Erro de rede: {str(e)}")
+        return {"error": f"Falha na conexão: {str(e)}"}
+    except Exception as e:
+        logger.exception("Erro inesperado")
+        return {"error": "Erro interno inesperado."}
+
+# --- Formatação compacta das saídas (o que volta ao LLM) ---
+POKEMON_FIELDS = (
+    "id", "name", "types", "height", "weight",
+    "hp", "attack", "defense", "special_attack", "special_defense", "speed",
+)
+DEFAULT_LIST_LIMIT = 50
+
+def _dumps(result: Any) -> str:
+    """
+    JSON minificado e sem escapes de acentos: menos tokens para o mesmo conteúdo.
+    """
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+def _project_pokemon(result: Any, campos: Optional[List[str]] = None) -> Any:
+    """
+    Achata os stats no nível principal e mantém apenas os campos pedidos (o nome sempre vem).
+    """
+    if _is_error(result) or not isinstance(result, dict):
+        return result
+    flat = {k: v for k, v in result.items() if k != "stats"}
+    flat.update(result.get("stats") or {})
+    wanted = [f for f in (campos or POKEMON_FIELDS) if f in POKEMON_FIELDS]
+    if "name" not in wanted:
+        wanted.insert(0, "name")
+    return {f: flat[f] for f in wanted if f in flat}
+
+def _cap_list(items: Any, limite: int, key: str) -> Any:
+    """
+    Limita listas longas informando o total, para o LLM saber que há mais itens.
+    """
+    if _is_error(items) or not isinstance(items, list):
+        return items
+    limite = max(1, limite)
+    capped = {"total": len(items), key: items[:limite]}
+    if len(items) > limite:
+        capped["omitidos"] = len(items) - limite
+    return capped
+
+def _format_ranking(result: Any, stat: str) -> Any:
+    if _is_error(result) or not isinstance(result, list):
+        return result
+    # Pares [nome, valor] na ordem do ranking (a posição é implícita):
+    return {"stat": stat, "ranking": [[item["name"], item["value"]] for item in result]}
+
+def _format_matchup(result: Any) -> Any:
+    if _is_error(result) or not isinstance(result, dict):
+        return result
+    return {
+        "team_a": result.get("team_a"),
+        "team_b": result.get("team_b"),
+        "score": round(result.get("score", 0.0), 2),
+        "advantage": [[round(v, 2) for v in row] for row in result.get("advantage", [])],
+        "best_counters": result.get("best_counters"),
+    }
+
+def _format_similar(result: Any) -> Any:
+    if _is_error(result) or not isinstance(result, list):
+        return result
+    return {"similares": [[item["name"], round(item["score"], 3)] for item in result]}
+
+def _evolution_condition(step: Dict[str, Any]) -> Optional[str]:
+    if step.get("min_level"):
+        return f"nível {step['min_level']}"
+    if step.get("item"):
+        return f"item {step['item']}"
+    return {"level-up": "subir de nível", "trade": "troca"}.get(step.get("trigger"), step.get("trigger"))
+
+def _format_evolutions(result: Any) -> Any:
+    if _is_error(result) or not isinstance(result, dict):
+        return result
+    steps = result.get("steps", [])
+    # Um elo [de, para, condição] por evolução; estágios e ramificações ficam implícitos nos elos.
+    return {
+        "pokemon": result.get("species"),
+        "base": [s["species"] for s in steps if s.get("stage") == 1],
+        "evolucoes": [[s["evolves_from"], s["species"], _evolution_condition(s)] for s in steps if s.get("evolves_from")],
+    }
+
+def _clean_id(nome_ou_id: str) -> str:
+    # IDs como "#025" são aceitos como "025" (busca por chave primária):
+    return str(nome_ou_id).strip().lstrip('#')
+
+# --- Backends de dados das ferramentas ---
+class ToolBackend(ABC):
+    """
+    Origem dos dados das ferramentas. Toda implementação retorna os mesmos dicionários/listas
+    da API HTTP, inclusive os erros ({"error": ..., "sugestoes": [...]}).
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get_pokemon(self, nome_ou_id: str) -> Any:
+        pass
+
+    @abstractmethod
+    def list_by_type(self, tipo: Optional[str]) -> Any:
+        pass
+
+    @abstractmethod
+    def ranking(self, stat: str, limit: int) -> Any:
+        pass
+
+    @abstractmethod
+    def evaluate_teams(self, team_a: List[str], team_b: List[str]) -> Any:
+        pass
+
+    @abstractmethod
+    def similar(self, nome: str, k: int) -> Any:
+        pass
+
+    @abstractmethod
+    def evolutions(self, nome: str) -> Any:
+        pass
+
+    @abstractmethod
+    def dataset_version(self) -> Optional[str]:
+        pass
+
+    def call(self, operation: str, *args: Any) -> Any:
+        return getattr(self, operation)(*args)
+
+    async def call_async(self, operation: str, *args: Any) -> Any:
+        # Implementações bloqueantes rodam fora do event loop (to_thread preserva o contexto de logs):
+        return await asyncio.to_thread(self.call, operation, *args)
+
+class HttpBackend(ToolBackend):
+    """
+    Consulta a API via HTTP (padrão), com o cache de resultados compartilhado.
+    """
+
+    name = "http"
+
+    def get_pokemon(self, nome_ou_id: str) -> Any:
+        return _safe_request("GET", f"/v1/pokemons/{nome_ou_id}")
+
+    def list_by_type(self, tipo: Optional[str]) -> Any:
+        return _safe_request("GET", "/v1/pokemons", params={"type": tipo})
+
+    def ranking(self, stat: str, limit: int) -> Any:
+        return _safe_request("GET", "/v1/stats/ranking", params={"stat": stat, "limit": limit})
+
+    def evaluate_teams(self, team_a: List[str], team_b: List[str]) -> Any:
+        return _safe_request("POST", "/v1/matchups/teams", json_body={"team_a": team_a, "team_b": team_b})
+
+    def similar(self, nome: str, k: int) -> Any:
+        return _safe_request("GET", f"/v1/pokemons/{nome}/similar", params={"k": k})
+
+    def evolutions(self, nome: str) -> Any:
+        return _safe_request("GET", f"/v1/pokemons/{nome}/evolutions")
+
+    def dataset_version(self) -> Optional[str]:
+        return _safe_request("GET", "/v1/dataset/version", use_cache=False).get("version")
+
+    async def call_async(self, operation: str, *args: Any) -> Any:
+        return await getattr(self, f"_{operation}_async")(*args)
+
+    async def _get_pokemon_async(self, nome_ou_id: str) -> Any:
+        return await _safe_request_async("GET", f"/v1/pokemons/{nome_ou_id}")
+
+    async def _list_by_type_async(self, tipo: Optional[str]) -> Any:
+        return await _safe_request_async("GET", "/v1/pokemons", params={"type": tipo})
+
+    async def _ranking_async(self, stat: str, limit: int) -> Any:
+        return await _safe_request_async("GET", "/v1/stats/ranking", params={"stat": stat, "limit": limit})
+
+    async def _evaluate_teams_async(self, team_a: List[str], team_b: List[str]) -> Any:
+        return await _safe_request_async("POST", "/v1/matchups/teams", json_body={"team_a": team_a, "team_b": team_b})
+
+    async def _similar_async(self, nome: str, k: int) -> Any:
+        return await _safe_request_async("GET", f"/v1/pokemons/{nome}/similar", params={"k": k})
+
+    async def _evolutions_async(self, nome: str) -> Any:
+        return await _safe_request_async("GET", f"/v1/pokemons/{nome}/evolutions")
+
+    async def _dataset_version_async(self) -> Optional[str]:
+        return (await _safe_request_async("GET", "/v1/dataset/version", use_cache=False)).get("version")
+
+# Seleção por configuração: http (padrão), service (PokemonService no mesmo processo) ou snapshot (arquivo local):
+AGENT_TOOL_BACKEND = os.getenv("AGENT_TOOL_BACKEND", "http").lower()
+
+_tool_backend: Optional[ToolBackend] = None
+_tool_backend_lock = threading.Lock()
+
+def create_tool_backend(kind: str = AGENT_TOOL_BACKEND) -> ToolBackend:
+    if kind == "http":
+        return HttpBackend()
+    # Importações tardias: 'service' depende do pacote api (SQLAlchemy, Redis), ausente na imagem do agente.
+    if kind == "service":
+        from agent.backends import ServiceBackend
+        return ServiceBackend()
+    if kind == "snapshot":
+        from agent.backends import SnapshotBackend
+        return SnapshotBackend.from_file()
+    raise ValueError(f"Backend de ferramentas inválido: {kind}")
+
+def get_tool_backend() -> ToolBackend:
+    global _tool_backend
+    if _tool_backend is None:
+        with _tool_backend_lock:
+            if _tool_backend is None:
+                _tool_backend = create_tool_backend()
+                logger.info(f"Backend de ferramentas: {_tool_backend.name}")
+    return _tool_backend
+
 # --- Implementações de ferramentas ---
-def buscar_pokemon(nome_ou_id: str) -> str:
+def buscar_pokemon(nome_ou_id: str, campos: Optional[List[str]] = None) -> str:
     """
     Busca detalhes de um Pokémon pelo nome ou ID.
-    Retorna stats, tipos, altura, peso, etc.
+    Retorna stats, tipos, altura, peso, etc. (ou apenas os 'campos' pedidos).
     """
-    result = _safe_request("GET", f"/v1/pokemons/{nome_ou_id}")
-    return json.dumps(result)
+    result = get_tool_backend().call("get_pokemon", _clean_id(nome_ou_id))
+    return _dumps(_project_pokemon(result, campos))
 
-def listar_por_tipo(tipo: str) -> str:
+def listar_por_tipo(tipo: str, limite: int = DEFAULT_LIST_LIMIT) -> str:
     """
-    Lista todos os pokémons de um determinado tipo (ex: fire, water).
+    Lista os pokémons de um determinado tipo (ex: fire, water), até 'limite' nomes com o total.
     """
-    result = _safe_request("GET", "/v1/pokemons", params={"type": tipo})
-    return json.dumps(result)
+    result = get_tool_backend().call("list_by_type", tipo)
+    return _dumps(_cap_list(result, limite, "pokemons"))
 
 def top_n_por_stat(stat: str, n: int = 5) -> str:
     """
     Retorna os N pokémons com maior valor no stat especificado.
-    Stat deve ser um de: hp, attack, defense, special_attack, special_defense, speed.
     """
-    result = _safe_request("GET", "/v1/stats/ranking", params={"stat": stat, "limit": n})
-    return json.dumps(result)
+    result = get_tool_backend().call("ranking", stat, n)
+    return _dumps(_format_ranking(result, stat))
 
-def comparar_pokemons(pokemon_a: str, pokemon_b: str) -> str:
+def comparar_pokemons(pokemon_a: str, pokemon_b: str, campos: Optional[List[str]] = None) -> str:
     """
     Busca detalhes de dois pokémons para comparação.
     Retorna um objeto com os dados de ambos.
     """
-    data_a = _safe_request("GET", f"/v1/pokemons/{pokemon_a}")
-    data_b = _safe_request("GET", f"/v1/pokemons/{pokemon_b}")
+    backend = get_tool_backend()
+    # As duas consultas são independentes: dispare-as em paralelo.
+    future_a = _parallel_executor.submit(contextvars.copy_context().run, backend.call, "get_pokemon", _clean_id(pokemon_a))
+    future_b = _parallel_executor.submit(contextvars.copy_context().run, backend.call, "get_pokemon", _clean_id(pokemon_b))
+    data_a, data_b = future_a.result(), future_b.result()
     
     combined = {
-        "pokemon_a": data_a,
-        "pokemon_b": data_b
+        "pokemon_a": _project_pokemon(data_a, campos),
+        "pokemon_b": _project_pokemon(data_b, campos)
     }
-    return json.dumps(combined)
+    return _dumps(combined)
+
+def avaliar_confronto(time_a: List[str], time_b: List[str]) -> str:
+    """
+    Avalia a vantagem de tipos de um time contra outro (1x1 ou time contra time).
+    Retorna a matriz de vantagens, a pontuação média e o melhor contra-ataque para cada oponente.
+    """
+    result = get_tool_backend().call("evaluate_teams", time_a, time_b)
+    return _dumps(_format_matchup(result))
+
+def buscar_similares(nome: str, n: int = 5) -> str:
+    """
+    Retorna os N pokémons com atributos base mais parecidos com o informado.
+    """
+    result = get_tool_backend().call("similar", nome, n)
+    return _dumps(_format_similar(result))
+
+def buscar_evolucoes(nome: str) -> str:
+    """
+    Retorna a cadeia de evolução do Pokémon: forma básica e cada evolução com sua condição.
+    """
+    result = get_tool_backend().call("evolutions", _clean_id(nome))
+    return _dumps(_format_evolutions(result))
+
+# --- Implementações assíncronas (mesmo contrato, sem bloquear o event loop) ---
+async def buscar_pokemon_async(nome_ou_id: str, campos: Optional[List[str]] = None) -> str:
+    result = await get_tool_backend().call_async("get_pokemon", _clean_id(nome_ou_id))
+    return _dumps(_project_pokemon(result, campos))
+
+async def listar_por_tipo_async(tipo: str, limite: int = DEFAULT_LIST_LIMIT) -> str:
+    result = await get_tool_backend().call_async("list_by_type", tipo)
+    return _dumps(_cap_list(result, limite, "pokemons"))
+
+async def top_n_por_stat_async(stat: str, n: int = 5) -> str:
+    result = await get_tool_backend().call_async("ranking", stat, n)
+    return _dumps(_format_ranking(result, stat))
+
+async def comparar_pokemons_async(pokemon_a: str, pokemon_b: str, campos: Optional[List[str]] = None) -> str:
+    backend = get_tool_backend()
+    data_a, data_b = await asyncio.gather(
+        backend.call_async("get_pokemon", _clean_id(pokemon_a)),
+        backend.call_async("get_pokemon", _clean_id(pokemon_b)),
+    )
+    return _dumps({"pokemon_a": _project_pokemon(data_a, campos), "pokemon_b": _project_pokemon(data_b, campos)})
+
+async def avaliar_confronto_async(time_a: List[str], time_b: List[str]) -> str:
+    result = await get_tool_backend().call_async("evaluate_teams", time_a, time_b)
+    return _dumps(_format_matchup(result))
+
+async def buscar_similares_async(nome: str, n: int = 5) -> str:
+    result = await get_tool_backend().call_async("similar", nome, n)
+    return _dumps(_format_similar(result))
+
+async def buscar_evolucoes_async(nome: str) -> str:
+    result = await get_tool_backend().call_async("evolutions", _clean_id(nome))
+    return _dumps(_format_evolutions(result))
+
+# --- Metadados (não expostos ao LLM) ---
+async def obter_versao_dados_async() -> Optional[str]:
+    """
+    Versão do conjunto de dados servido pelo backend, ou None se indisponível.
+    """
+    try:
+        return await get_tool_backend().call_async("dataset_version")
+    except Exception as e:
+        logger.warning(f"Versão dos dados indisponível: {e}")
+        return None
 
 
 # --- Definição de ferramentas para OpenAI ---
@@ -115,7 +641,12 @@ tools_schema = [
                 "properties": {
                     "nome_ou_id": {
                         "type": "string",
-                        "description": "Nome ou ID do Pokémon."
+                        "description": "Nome ou ID numérico da Dex Nacional (ex: 'pikachu' ou '25')."
+                    },
+                    "campos": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["id", "name", "types", "height", "weight", "hp", "attack", "defense", "special_attack", "special_defense", "speed"]},
+                        "description": "Campos necessários para responder (ex: ['types'] ou ['speed']). Omitir retorna todos."
                     }
                 },
                 "required": ["nome_ou_id"]
@@ -133,6 +664,11 @@ tools_schema = [
                     "tipo": {
                         "type": "string",
                         "description": "O tipo do Pokémon (ex: fire, water, grass)."
+                    },
+                    "limite": {
+                        "type": "integer",
+                        "description": "Máximo de nomes retornados (padrão 50); o total é sempre informado.",
+                        "default": 50
                     }
                 },
                 "required": ["tipo"]
@@ -171,11 +707,72 @@ tools_schema = [
                 "type": "object",
                 "properties": {
                     "pokemon_a": {"type": "string", "description": "Nome do primeiro Pokémon."},
-                    "pokemon_b": {"type": "string", "description": "Nome do segundo Pokémon."}
+                    "pokemon_b": {"type": "string", "description": "Nome do segundo Pokémon."},
+                    "campos": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["id", "name", "types", "height", "weight", "hp", "attack", "defense", "special_attack", "special_defense", "speed"]},
+                        "description": "Campos necessários para responder (ex: ['types'] ou ['speed']). Omitir retorna todos."
+                    }
                 },
                 "required": ["pokemon_a", "pokemon_b"]
             }
         }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "avaliar_confronto",
+            "description": "Calcula a vantagem de tipos entre Pokémons ou times (quem leva vantagem e o melhor contra-ataque para cada oponente).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "time_a": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Nomes dos Pokémons do primeiro time (um ou mais)."
+                    },
+                    "time_b": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Nomes dos Pokémons do time adversário (um ou mais)."
+                    }
+                },
+                "required": ["time_a", "time_b"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "buscar_similares",
+            "description": "Encontra os Pokémons com atributos base (stats) mais parecidos com um Pokémon informado.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "nome": {"type": "string", "description": "Nome do Pokémon de referência."},
+                    "n": {
+                        "type": "integer",
+                        "description": "Quantidade de pokémons similares (padrão 5).",
+                        "default": 5
+                    }
+                },
+                "required": ["nome"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "buscar_evolucoes",
+            "description": "Retorna a cadeia de evolução de um Pokémon (pré-evoluções e evoluções, com nível, item ou troca necessários).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "nome": {"type": "string", "description": "Nome ou ID do Pokémon (ex: 'eevee')."}
+                },
+                "required": ["nome"]
+            }
+        }
     }
 ]
 
@@ -184,4 +781,17 @@ available_functions = {
     "listar_por_tipo": listar_por_tipo,
     "top_n_por_stat": top_n_por_stat,
     "comparar_pokemons": comparar_pokemons,
+    "avaliar_confronto": avaliar_confronto,
+    "buscar_similares": buscar_similares,
+    "buscar_evolucoes": buscar_evolucoes,
+}
+
+available_async_functions = {
+    "buscar_pokemon": buscar_pokemon_async,
+    "listar_por_tipo": listar_por_tipo_async,
+    "top_n_por_stat": top_n_por_stat_async,
+    "comparar_pokemons": comparar_pokemons_async,
+    "avaliar_confronto": avaliar_confronto_async,
+    "buscar_similares": buscar_similares_async,
+    "buscar_evolucoes": buscar_evolucoes_async,
 }
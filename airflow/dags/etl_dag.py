@@ -14,6 +14,9 @@ if PROJECT_ROOT not in sys.path:
 
 try:
     from etl import extract, transform, load
+    from etl.checkpoint import CheckpointStore
+    from etl.client import PokeAPIClient
+    from etl.related import RelatedResources
     from api.schemas import PokemonDetail
 except ImportError as e:
     logging.error(f"Failed to import project modules: {e}")
@@ -33,16 +36,28 @@ default_args = {
 
 def run_extract(**kwargs):
     """
-    Extrai dados e serializa modelos Pydantic em dicionários para XCom.
+    Extrai dados e serializa modelos Pydantic em dicionários para XCom, junto com os recursos
+    relacionados (habilidades, movimentos, espécies e cadeias de evolução, cada um buscado uma vez).
     """
     limit = kwargs.get('limit', 50) # Mantenha pequeno para demonstração.
     logging.info(f"Extracting {limit} pokemon...")
     
+    # Checkpoint por execução do DAG: uma retentativa desta tarefa retoma a extração
+    # em vez de buscar de novo o que já chegou (ETL_CHECKPOINT_DIR deve sobreviver entre tentativas).
+    checkpoint = CheckpointStore.for_run(kwargs['run_id'])
+    
     # Retorna List[PokemonDetail].
-    data = extract.fetch_pokemon_data(limit=limit)
+    client = PokeAPIClient()
+    related = RelatedResources()
+    data = extract.fetch_pokemon_data(limit=limit, client=client, checkpoint=checkpoint, related=related)
+    checkpoint.close()
+    related.fetch(client)
     
     # Serializar para formato compatível com JSON:
-    serialized_data = [p.model_dump() for p in data]
+    serialized_data = {
+        'pokemon': [p.model_dump() for p in data],
+        'related': related.to_dict()
+    }
     return serialized_data
 
 def run_transform(**kwargs):
@@ -50,10 +65,11 @@ def run_transform(**kwargs):
    Desserializa dados, transforma e serializa DataFrames para XCom.
     """
     ti = kwargs['ti']
-    raw_data_dicts = ti.xcom_pull(task_ids='extract_task')
+    extracted = ti.xcom_pull(task_ids='extract_task')
     
-    if not raw_data_dicts:
+    if not extracted or not extracted['pokemon']:
         raise ValueError("No data received from extract task")
+    raw_data_dicts = extracted['pokemon']
         
     logging.info(f"Received {len(raw_data_dicts)} records. Transforming...")
     
@@ -63,13 +79,18 @@ def run_transform(**kwargs):
     
     # Retorna uma tupla [DataFrame, DataFrame, DataFrame, DataFrame]
     df_pokemon, df_dim_type, df_types_link, df_stats = transform.transform_data(pydantic_models)
+    related_frames = transform.transform_related(RelatedResources.from_dict(extracted['related']))
     
-    # Serializar DataFrames em dicionários
+    # Serializar DataFrames em dicionários (nulos do pandas viram None, compatível com JSON):
     return {
         'df_pokemon': df_pokemon.to_dict('records'),
         'df_dim_type': df_dim_type.to_dict('records'),
         'df_types_link': df_types_link.to_dict('records'),
-        'df_stats': df_stats.to_dict('records')
+        'df_stats': df_stats.to_dict('records'),
+        'related': {
+            table: df.astype(object).where(df.notna(), None).to_dict('records')
+            for table, df in related_frames.items()
+        }
     }
 
 def run_load(**kwargs):
@@ -90,8 +111,18 @@ def run_load(**kwargs):
     df_types_link = pd.DataFrame(data_dict['df_types_link'])
     df_stats = pd.DataFrame(data_dict['df_stats'])
     
+    # Os schemas restauram os inteiros anuláveis que o JSON transformou em float:
+    related_frames = {
+        table: transform.RELATED_SCHEMAS[table].validate(pd.DataFrame(records, columns=list(transform.RELATED_SCHEMAS[table].columns)))
+        for table, records in data_dict['related'].items()
+    }
+    
     # Load
     load.load_data(df_pokemon, df_dim_type, df_types_link, df_stats)
+    load.load_related(related_frames)
+
+    # Execução concluída: o checkpoint da extração não é mais necessário.
+    CheckpointStore.for_run(kwargs['run_id']).clear()
 
 with DAG(
     'pokemon_etl_pipeline',
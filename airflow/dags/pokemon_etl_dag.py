@@ -24,7 +24,8 @@ with DAG(
 
     run_etl = BashOperator(
         task_id='run_pokemon_etl',
-        bash_command='python /opt/airflow/etl/main.py',
+        # O run_id do Airflow identifica o checkpoint: a retentativa retoma a extração já feita.
+        bash_command='python /opt/airflow/etl/main.py run-pipeline --run-id "{{ run_id }}"',
         env={
             **os.environ,
             'PYTHONPATH': '/opt/airflow',
@@ -5,6 +5,7 @@ from sqlalchemy.orm import sessionmaker
 
 # --- Configuração ---
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_DB = int(os.getenv("REDIS_DB", 0))
 POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
 MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
 
@@ -35,6 +36,6 @@ def get_db():
 
 # --- Configuração do Redis ---
 try:
-    redis_client = redis.Redis(host=REDIS_HOST, port=6379, db=0, decode_responses=True, socket_timeout=2)
+    redis_client = redis.Redis(host=REDIS_HOST, port=6379, db=REDIS_DB, decode_responses=True, socket_timeout=2)
 except Exception:
     redis_client = None # Recurso alternativo caso o Redis esteja inativo.
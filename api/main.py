@@ -1,14 +1,21 @@
 from fastapi import FastAPI, HTTPException, Query, Depends, APIRouter, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 import uuid
 
 from prometheus_fastapi_instrumentator import Instrumentator
 from api.database import get_db, redis_client
-from api.schemas import PokemonDetail, PokemonStats, PokemonRank
+from api.schemas import PokemonDetail, PokemonStats, PokemonRank, MatchupResult, TeamMatchup, TeamMatchupRequest, SimilarPokemon, PokemonQuery, DatasetVersion
+from api.schemas import PokemonAbility, PokemonMove, EvolutionChain
 
 from api.repositories.pokemon import PokemonRepository
 from api.services.pokemon import PokemonService
+from api.services.matchup import MatchupService
+from api.services.similarity import SimilarityService
+from api.services.search import SearchService
+from api.services.query import QueryService
+from api.services.indexes import UnknownPokemonError
 
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from common.telemetry import configure_telemetry
@@ -21,6 +28,9 @@ logger = get_logger("main")
 app = FastAPI(title="API Pokedex")
 router_v1 = APIRouter()
 
+# Tamanho máximo de um lote por intervalo de IDs:
+MAX_ID_RANGE = 500
+
 # --- Observabilidade ---
 # Configurar OpenTelemetry:
 configure_telemetry("pokemon-api")
@@ -46,23 +56,144 @@ def get_pokemon_service(db: Session = Depends(get_db)) -> PokemonService:
     repository = PokemonRepository(db)
     return PokemonService(repository, redis_client)
 
+def get_matchup_service(db: Session = Depends(get_db)) -> MatchupService:
+    """
+    Factory para o serviço de confrontos (índice de tipos em memória).
+    """
+    return MatchupService(PokemonRepository(db))
+
+def get_similarity_service(db: Session = Depends(get_db)) -> SimilarityService:
+    """
+    Factory para o serviço de similaridade (índice k-NN em memória).
+    """
+    return SimilarityService(PokemonRepository(db))
+
+def get_search_service(db: Session = Depends(get_db)) -> SearchService:
+    """
+    Factory para o serviço de busca de nomes (índice em memória).
+    """
+    return SearchService(PokemonRepository(db))
+
+def get_query_service(db: Session = Depends(get_db)) -> QueryService:
+    """
+    Factory para a camada de consulta com seleção de campos.
+    """
+    return QueryService(PokemonRepository(db))
+
+def pokemon_not_found(name: str, search: SearchService) -> JSONResponse:
+    """
+    404 de Pokémon desconhecido com "Você quis dizer", a partir do índice em memória (sem nova consulta ao banco).
+    """
+    suggestions = [] if name.strip().isascii() and name.strip().isdigit() else search.did_you_mean(name)
+    return JSONResponse(
+        status_code=404,
+        content={"detail": "Pokémon não encontrado!", "suggestions": suggestions}
+    )
+
 # --- V1 Endpoints ---
 
-@router_v1.get("/pokemons/{name}", response_model=PokemonDetail)
+# Declarado antes de /pokemons/{name} para não ser capturado como nome:
+@router_v1.get("/pokemons/suggest", response_model=List[str])
+def suggest_pokemons(
+    q: str = Query(..., min_length=1, max_length=50, description="Prefixo ou nome aproximado."),
+    limit: int = Query(10, ge=1, le=50),
+    search: SearchService = Depends(get_search_service)
+) -> List[str]:
+    """
+    Sugere nomes de Pokémons por prefixo e correção de erros de digitação.
+    """
+    return search.suggest(q, limit)
+
+@router_v1.get("/pokemons/range", response_model=List[PokemonDetail])
+def get_pokemons_by_id_range(
+    start: int = Query(..., ge=1, description="Primeiro ID da Dex Nacional (inclusive)."),
+    end: int = Query(..., ge=1, description="Último ID da Dex Nacional (inclusive)."),
+    service: PokemonService = Depends(get_pokemon_service)
+) -> List[PokemonDetail]:
+    """
+    Obtém detalhes de um intervalo de IDs da Dex Nacional em lote.
+    """
+    if end < start or end - start + 1 > MAX_ID_RANGE:
+        raise HTTPException(status_code=422, detail=f"Intervalo inválido: use start <= end e no máximo {MAX_ID_RANGE} IDs.")
+    return service.get_pokemons_by_id_range(start, end)
+
+@router_v1.get("/pokemons/{name}", response_model=PokemonDetail, responses={404: {"description": "Pokémon não encontrado, com sugestões."}})
 def get_pokemon_details(
     name: str, 
-    service: PokemonService = Depends(get_pokemon_service)
+    service: PokemonService = Depends(get_pokemon_service),
+    search: SearchService = Depends(get_search_service)
 ) -> PokemonDetail:
     """
-    Obtém detalhes específicos de um Pokémon pelo nome.
+    Obtém detalhes específicos de um Pokémon pelo nome ou pelo ID da Dex Nacional.
     """
     result = service.get_pokemon_details(name)
     
     if not result:
-        raise HTTPException(status_code=404, detail="Pokémon não encontrado!")
+        return pokemon_not_found(name, search)
     
     return result
 
+@router_v1.get("/pokemons/{name}/abilities", response_model=List[PokemonAbility], responses={404: {"description": "Pokémon não encontrado, com sugestões."}})
+def get_pokemon_abilities(
+    name: str,
+    service: PokemonService = Depends(get_pokemon_service),
+    search: SearchService = Depends(get_search_service)
+) -> List[PokemonAbility]:
+    """
+    Lista as habilidades de um Pokémon (nome ou ID), incluindo a oculta.
+    """
+    try:
+        return service.get_abilities(name)
+    except UnknownPokemonError:
+        return pokemon_not_found(name, search)
+
+@router_v1.get("/pokemons/{name}/moves", response_model=List[PokemonMove], responses={404: {"description": "Pokémon não encontrado, com sugestões."}})
+def get_pokemon_moves(
+    name: str,
+    learn_method: Optional[str] = Query(None, description="Filtrar pelo método de aprendizado (ex: level-up, machine, egg)."),
+    service: PokemonService = Depends(get_pokemon_service),
+    search: SearchService = Depends(get_search_service)
+) -> List[PokemonMove]:
+    """
+    Lista os movimentos que um Pokémon (nome ou ID) aprende.
+    """
+    try:
+        return service.get_moves(name, learn_method)
+    except UnknownPokemonError:
+        return pokemon_not_found(name, search)
+
+@router_v1.get("/pokemons/{name}/evolutions", response_model=EvolutionChain, responses={404: {"description": "Pokémon não encontrado ou sem cadeia de evolução carregada."}})
+def get_pokemon_evolutions(
+    name: str,
+    service: PokemonService = Depends(get_pokemon_service),
+    search: SearchService = Depends(get_search_service)
+) -> EvolutionChain:
+    """
+    Obtém a cadeia de evolução completa de um Pokémon (nome ou ID), com gatilhos, níveis e itens.
+    """
+    try:
+        result = service.get_evolution_chain(name)
+    except UnknownPokemonError:
+        return pokemon_not_found(name, search)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Cadeia de evolução não carregada para este Pokémon.")
+    return result
+
+@router_v1.get("/pokemons/{name}/similar", response_model=List[SimilarPokemon])
+def get_similar_pokemons(
+    name: str,
+    k: int = Query(5, ge=1, le=50, description="Quantidade de vizinhos."),
+    metric: str = Query("cosine", pattern="^(cosine|euclidean)$"),
+    service: SimilarityService = Depends(get_similarity_service)
+) -> List[SimilarPokemon]:
+    """
+    Obtém os Pokémons com atributos base mais parecidos (k-NN exato).
+    """
+    try:
+        return service.find_similar(name, k, metric)
+    except UnknownPokemonError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router_v1.get("/pokemons", response_model=List[str])
 def list_pokemons(
     type: str = Query(None, description="Filtrar por tipo de Pokémon (ex: fire, water)"),
@@ -84,6 +215,54 @@ def get_strongest_pokemons(
     """
     return service.get_ranking(stat, limit)
 
+@router_v1.get("/matchups/{name}", response_model=List[MatchupResult])
+def get_matchups(
+    name: str,
+    opponents: Optional[List[str]] = Query(None, description="Oponentes a avaliar; vazio avalia contra toda a Pokédex."),
+    limit: int = Query(10, ge=1, le=100),
+    service: MatchupService = Depends(get_matchup_service)
+) -> List[MatchupResult]:
+    """
+    Avalia um Pokémon contra vários oponentes com base na efetividade de tipos.
+    """
+    try:
+        return service.score_against(name, opponents, limit)
+    except UnknownPokemonError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router_v1.post("/matchups/teams", response_model=TeamMatchup)
+def evaluate_team_matchup(
+    payload: TeamMatchupRequest,
+    service: MatchupService = Depends(get_matchup_service)
+) -> TeamMatchup:
+    """
+    Avalia time contra time em uma única operação matricial.
+    """
+    try:
+        return service.evaluate_teams(payload.team_a, payload.team_b)
+    except UnknownPokemonError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router_v1.post("/pokemons/query", response_model=List[Dict[str, Any]])
+def query_pokemons(
+    payload: PokemonQuery,
+    service: QueryService = Depends(get_query_service)
+) -> List[Dict[str, Any]]:
+    """
+    Consulta vários Pokémons retornando apenas os campos pedidos.
+    """
+    try:
+        return service.query(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router_v1.get("/dataset/version", response_model=DatasetVersion)
+def get_dataset_version(service: PokemonService = Depends(get_pokemon_service)) -> DatasetVersion:
+    """
+    Versão dos dados carregados; muda quando o ETL altera Pokémons, atributos ou tipos.
+    """
+    return service.get_dataset_version()
+
 # --- Composição do aplicativo ---
 app.include_router(router_v1, prefix="/v1")
 
@@ -0,0 +1,61 @@
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class Deferred(Generic[V]):
+    """
+    Valor prometido por um DataLoader; o acesso via get() dispara o lote pendente.
+    """
+
+    def __init__(self, loader: "DataLoader", key):
+        self._loader = loader
+        self._key = key
+
+    def get(self) -> V:
+        return self._loader.resolve(self._key)
+
+class DataLoader(Generic[K, V]):
+    """
+    Implementação síncrona do padrão DataLoader.
+    As chaves pedidas via load() são acumuladas e buscadas em uma única chamada
+    de batch_fn na primeira resolução; os resultados ficam memorizados por
+    requisição, eliminando consultas N+1.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Dict[K, V]], default: Optional[Callable[[], V]] = None):
+        self._batch_fn = batch_fn
+        self._default = default
+        self._cache: Dict[K, V] = {}
+        # Dict como conjunto ordenado: O(1) por load() e as chaves chegam a batch_fn na ordem pedida.
+        self._pending: Dict[K, None] = {}
+        self.batches = 0
+
+    def load(self, key: K) -> Deferred[V]:
+        if key not in self._cache:
+            self._pending[key] = None
+        return Deferred(self, key)
+
+    def load_many(self, keys: Iterable[K]) -> List[Deferred[V]]:
+        return [self.load(k) for k in keys]
+
+    def dispatch(self) -> None:
+        if not self._pending:
+            return
+        keys, self._pending = list(self._pending), {}
+        self.batches += 1
+        results = self._batch_fn(keys)
+        for key in keys:
+            self._cache[key] = results[key] if key in results else (self._default() if self._default else None)
+
+    def resolve(self, key: K) -> V:
+        if key not in self._cache:
+            self._pending[key] = None
+            self.dispatch()
+        return self._cache[key]
+
+def type_loader(repository) -> DataLoader[int, List[str]]:
+    """
+    DataLoader de tipos por ID de Pokémon (uma consulta por lote).
+    """
+    return DataLoader(repository.get_types_for_ids, default=list)
@@ -1,8 +1,8 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from api.repositories.base import BaseRepository
-from api.schemas import PokemonDetail, PokemonStats, PokemonRank
+from api.schemas import PokemonAbility, PokemonDetail, PokemonMove, PokemonStats, PokemonRank
 
 class PokemonRepository(BaseRepository):
     """
@@ -13,9 +13,11 @@ class PokemonRepository(BaseRepository):
     def __init__(self, db_session: Session):
         self.db = db_session
 
-    def get_by_id(self, id: int) -> Optional[Any]:
-        # Implementação genérica se necessário, ou específica abaixo
-        pass
+    def get_by_id(self, id: int) -> Optional[PokemonDetail]:
+        """
+        Busca detalhes completos de um Pokémon pelo ID da Dex Nacional (chave primária).
+        """
+        return self._get_pokemon_details("p.id = :id", {"id": id})
 
     def get_all(self, limit: int = 10, offset: int = 0) -> List[Any]:
         pass
@@ -24,15 +26,48 @@ class PokemonRepository(BaseRepository):
         """
         Busca detalhes completos de um Pokémon pelo nome.
         """
+        return self._get_pokemon_details("p.name = :name", {"name": name.lower()})
+
+    def get_pokemons_by_id_range(self, start: int, end: int) -> List[PokemonDetail]:
+        """
+        Busca detalhes de todos os Pokémons com ID entre 'start' e 'end' (inclusive).
+        Usa duas consultas (atributos e tipos) independentemente do tamanho do intervalo.
+        """
         stmt = text("""
             SELECT 
                 p.id, p.name, p.height, p.weight,
                 f.hp, f.attack, f.defense, f.special_attack, f.special_defense, f.speed
             FROM dim_pokemon p
             JOIN fact_stats f ON p.id = f.pokemon_id
-            WHERE p.name = :name
+            WHERE p.id BETWEEN :start AND :end
+            ORDER BY p.id
         """)
-        result = self.db.execute(stmt, {"name": name.lower()}).fetchone()
+        rows = self.db.execute(stmt, {"start": start, "end": end}).fetchall()
+
+        stmt_types = text("""
+            SELECT pt.pokemon_id, t.name
+            FROM dim_type t
+            JOIN pokemon_types pt ON t.id = pt.type_id
+            WHERE pt.pokemon_id BETWEEN :start AND :end
+            ORDER BY pt.pokemon_id, pt.slot
+        """)
+        types_by_id: Dict[int, List[str]] = {}
+        for pokemon_id, type_name in self.db.execute(stmt_types, {"start": start, "end": end}).fetchall():
+            types_by_id.setdefault(pokemon_id, []).append(type_name)
+
+        return [self._to_detail(row, types_by_id.get(row.id, [])) for row in rows]
+
+    def _get_pokemon_details(self, condition: str, params: Dict[str, Any]) -> Optional[PokemonDetail]:
+        # 'condition' é sempre uma constante interna, nunca entrada do usuário:
+        stmt = text(f"""
+            SELECT 
+                p.id, p.name, p.height, p.weight,
+                f.hp, f.attack, f.defense, f.special_attack, f.special_defense, f.speed
+            FROM dim_pokemon p
+            JOIN fact_stats f ON p.id = f.pokemon_id
+            WHERE {condition}
+        """)
+        result = self.db.execute(stmt, params).fetchone()
         
         if not result:
             return None
@@ -48,19 +83,23 @@ class PokemonRepository(BaseRepository):
         types_res = self.db.execute(stmt_types, {"pid": result.id}).fetchall()
         types = [t[0] for t in types_res]
         
+        return self._to_detail(result, types)
+
+    @staticmethod
+    def _to_detail(row: Any, types: List[str]) -> PokemonDetail:
         return PokemonDetail(
-            id=result.id,
-            name=result.name,
-            height=result.height,
-            weight=result.weight,
+            id=row.id,
+            name=row.name,
+            height=row.height,
+            weight=row.weight,
             types=types,
             stats=PokemonStats(
-                hp=result.hp,
-                attack=result.attack,
-                defense=result.defense,
-                special_attack=result.special_attack,
-                special_defense=result.special_defense,
-                speed=result.speed
+                hp=row.hp,
+                attack=row.attack,
+                defense=row.defense,
+                special_attack=row.special_attack,
+                special_defense=row.special_defense,
+                speed=row.speed
             )
         )
 
@@ -105,3 +144,232 @@ class PokemonRepository(BaseRepository):
             PokemonRank(rank=i+1, name=row.name, value=row.value)
             for i, row in enumerate(results)
         ]
+
+    def get_type_assignments(self) -> List[Tuple[int, str, List[str]]]:
+        """
+        Lista todos os Pokémons com seus tipos ordenados por slot, em uma única consulta.
+        Usado para construir os perfis de efetividade em memória.
+        """
+        stmt = text("""
+            SELECT p.id, p.name, t.name AS type_name
+            FROM dim_pokemon p
+            LEFT JOIN pokemon_types pt ON p.id = pt.pokemon_id
+            LEFT JOIN dim_type t ON pt.type_id = t.id
+            ORDER BY p.id, pt.slot
+        """)
+        results = self.db.execute(stmt).fetchall()
+
+        assignments: Dict[int, Tuple[int, str, List[str]]] = {}
+        for row in results:
+            entry = assignments.setdefault(row.id, (row.id, row.name, []))
+            if row.type_name:
+                entry[2].append(row.type_name)
+
+        return list(assignments.values())
+
+    def get_stat_vectors(self) -> List[Tuple[int, str, List[int]]]:
+        """
+        Lista os seis atributos base de todos os Pokémons, ordenados por ID.
+        """
+        stmt = text("""
+            SELECT p.id, p.name,
+                f.hp, f.attack, f.defense, f.special_attack, f.special_defense, f.speed
+            FROM dim_pokemon p
+            JOIN fact_stats f ON p.id = f.pokemon_id
+            ORDER BY p.id
+        """)
+        results = self.db.execute(stmt).fetchall()
+
+        return [
+            (row.id, row.name, [row.hp, row.attack, row.defense, row.special_attack, row.special_defense, row.speed])
+            for row in results
+        ]
+
+    def get_neighbors(self, name: str, k: int) -> List[Tuple[int, str, float]]:
+        """
+        Lê os k primeiros vizinhos pré-calculados pelo ETL (pokemon_neighbors, similaridade de
+        cosseno) como (rank, nome, score). Lista vazia se o Pokémon ou a tabela não existirem.
+        """
+        stmt = text("""
+            SELECT n.rank, v.name, n.score
+            FROM pokemon_neighbors n
+            JOIN dim_pokemon p ON p.id = n.pokemon_id
+            JOIN dim_pokemon v ON v.id = n.neighbor_id
+            WHERE p.name = :name AND n.rank <= :k
+            ORDER BY n.rank
+        """)
+        results = self.db.execute(stmt, {"name": name.lower(), "k": k}).fetchall()
+        return [(row.rank, row.name, float(row.score)) for row in results]
+
+    def get_dataset_fingerprint(self) -> Dict[str, Any]:
+        """
+        Impressão digital do conteúdo carregado: md5 de cada Pokémon (nome, medidas, espécie,
+        atributos e tipos por slot), em ordem de ID, e md5 dos dados relacionados que a API e o
+        agente servem (espécies e cadeias de evolução, habilidades e movimentos com seus vínculos).
+        Qualquer renomeação, troca de tipo, redistribuição de atributos ou recarga só dos dados
+        relacionados muda o resultado, mesmo com contagens e somas iguais.
+        Percorre as tabelas inteiras; o serviço guarda o resultado no cache.
+        """
+        stmt = text("""
+            SELECT
+                COUNT(p.id) AS pokemons,
+                COALESCE(MAX(p.id), 0) AS max_id,
+                md5(COALESCE(string_agg(
+                    concat_ws(',', p.id, p.name, p.height, p.weight, p.species_id,
+                              f.hp, f.attack, f.defense, f.special_attack, f.special_defense, f.speed, t.types),
+                    '|' ORDER BY p.id
+                ), '')) AS content
+            FROM dim_pokemon p
+            LEFT JOIN fact_stats f ON p.id = f.pokemon_id
+            LEFT JOIN (
+                SELECT pt.pokemon_id, string_agg(dt.name, '/' ORDER BY pt.slot) AS types
+                FROM pokemon_types pt
+                JOIN dim_type dt ON dt.id = pt.type_id
+                GROUP BY pt.pokemon_id
+            ) t ON p.id = t.pokemon_id
+        """)
+        row = self.db.execute(stmt).fetchone()
+
+        related_stmt = text("""
+            SELECT md5(concat_ws('|',
+                (SELECT md5(COALESCE(string_agg(
+                    concat_ws(',', id, name, generation, is_legendary, is_mythical, capture_rate,
+                              evolution_chain_id, evolves_from_id, evolution_trigger, min_level, evolution_item),
+                    ';' ORDER BY id), '')) FROM dim_species),
+                (SELECT md5(COALESCE(string_agg(concat_ws(',', id, name, short_effect), ';' ORDER BY id), '')) FROM dim_ability),
+                (SELECT md5(COALESCE(string_agg(
+                    concat_ws(',', pokemon_id, slot, ability_id, is_hidden), ';' ORDER BY pokemon_id, slot), ''))
+                 FROM pokemon_abilities),
+                (SELECT md5(COALESCE(string_agg(
+                    concat_ws(',', id, name, type_name, power, accuracy, pp, damage_class), ';' ORDER BY id), ''))
+                 FROM dim_move),
+                (SELECT md5(COALESCE(string_agg(
+                    concat_ws(',', pokemon_id, move_id, learn_method, level), ';' ORDER BY pokemon_id, move_id), ''))
+                 FROM pokemon_moves)
+            )) AS related
+        """)
+        return {
+            "pokemons": int(row.pokemons),
+            "max_id": int(row.max_id),
+            "content": row.content,
+            "related": self.db.execute(related_stmt).scalar(),
+        }
+
+    def get_types_for_ids(self, ids: List[int]) -> Dict[int, List[str]]:
+        """
+        Busca os tipos (ordenados por slot) de vários Pokémons em uma única consulta.
+        """
+        if not ids:
+            return {}
+        stmt = text("""
+            SELECT pt.pokemon_id, t.name
+            FROM dim_type t
+            JOIN pokemon_types pt ON t.id = pt.type_id
+            WHERE pt.pokemon_id IN :ids
+            ORDER BY pt.pokemon_id, pt.slot
+        """).bindparams(bindparam("ids", expanding=True))
+
+        types_by_id: Dict[int, List[str]] = {}
+        for pokemon_id, type_name in self.db.execute(stmt, {"ids": list(ids)}).fetchall():
+            types_by_id.setdefault(pokemon_id, []).append(type_name)
+        return types_by_id
+
+    def query_pokemons(
+        self,
+        columns: List[str],
+        names: Optional[List[str]] = None,
+        ids: Optional[List[int]] = None,
+        type_name: Optional[str] = None,
+        order_by: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Consulta apenas as colunas pedidas (já validadas pelo serviço contra uma lista fixa).
+        fact_stats só entra no JOIN quando algum atributo ou a ordenação o exige.
+        """
+        stat_columns = {"hp", "attack", "defense", "special_attack", "special_defense", "speed"}
+        select = ["p.id"] + [f"f.{c}" if c in stat_columns else f"p.{c}" for c in columns if c != "id"]
+        joins = []
+        if order_by or stat_columns.intersection(columns):
+            joins.append("JOIN fact_stats f ON p.id = f.pokemon_id")
+
+        conditions, params, expanding = [], {"limit": limit}, []
+        # Filtro vazio (ex.: {"names": []}) não casa nada; None é que significa "sem filtro":
+        if (names is not None and not names) or (ids is not None and not ids):
+            return []
+        if names is not None:
+            conditions.append("p.name IN :names")
+            params["names"] = [n.lower() for n in names]
+            expanding.append("names")
+        if ids is not None:
+            conditions.append("p.id IN :ids")
+            params["ids"] = list(ids)
+            expanding.append("ids")
+        if type_name:
+            joins.append("""JOIN pokemon_types pt ON p.id = pt.pokemon_id
+                JOIN dim_type t ON pt.type_id = t.id""")
+            conditions.append("t.name = :type_name")
+            params["type_name"] = type_name.lower()
+
+        query = f"""
+            SELECT {', '.join(select)}
+            FROM dim_pokemon p
+            {' '.join(joins)}
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            ORDER BY {f'f.{order_by} DESC, ' if order_by else ''}p.id
+            LIMIT :limit
+        """
+        stmt = text(query)
+        if expanding:
+            stmt = stmt.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+
+        return [dict(row._mapping) for row in self.db.execute(stmt, params).fetchall()]
+
+    def get_pokemon_ref(self, name_or_id: str) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Resolve um nome ou ID da Dex Nacional em (ID, ID da espécie); None se o Pokémon não existir.
+        """
+        key = name_or_id.strip().lower()
+        if key.isascii() and key.isdigit():
+            row = self.db.execute(text("SELECT id, species_id FROM dim_pokemon WHERE id = :id"), {"id": int(key)}).fetchone()
+        else:
+            row = self.db.execute(text("SELECT id, species_id FROM dim_pokemon WHERE name = :name"), {"name": key}).fetchone()
+        return (row.id, row.species_id) if row else None
+
+    def get_abilities(self, pokemon_id: int) -> List[PokemonAbility]:
+        """
+        Lista as habilidades de um Pokémon, ordenadas por slot.
+        """
+        stmt = text("""
+            SELECT a.name, pa.slot, pa.is_hidden, a.short_effect
+            FROM pokemon_abilities pa
+            JOIN dim_ability a ON a.id = pa.ability_id
+            WHERE pa.pokemon_id = :pid
+            ORDER BY pa.slot
+        """)
+        return [PokemonAbility(**row._mapping) for row in self.db.execute(stmt, {"pid": pokemon_id}).fetchall()]
+
+    def get_moves(self, pokemon_id: int) -> List[PokemonMove]:
+        """
+        Lista os movimentos de um Pokémon, por método de aprendizado e nível.
+        """
+        stmt = text("""
+            SELECT m.name, m.type_name AS type, m.power, m.accuracy, m.pp, m.damage_class, pm.learn_method, pm.level
+            FROM pokemon_moves pm
+            JOIN dim_move m ON m.id = pm.move_id
+            WHERE pm.pokemon_id = :pid
+            ORDER BY pm.learn_method, pm.level, m.name
+        """)
+        return [PokemonMove(**row._mapping) for row in self.db.execute(stmt, {"pid": pokemon_id}).fetchall()]
+
+    def get_evolution_chain(self, species_id: int) -> List[Dict[str, Any]]:
+        """
+        Lista todas as espécies da cadeia de evolução de uma espécie, em uma única consulta.
+        """
+        stmt = text("""
+            SELECT s.id, s.name, s.evolution_chain_id, s.evolves_from_id, s.evolution_trigger, s.min_level, s.evolution_item
+            FROM dim_species s
+            WHERE s.evolution_chain_id = (SELECT evolution_chain_id FROM dim_species WHERE id = :sid)
+            ORDER BY s.id
+        """)
+        return [dict(row._mapping) for row in self.db.execute(stmt, {"sid": species_id}).fetchall()]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List, Optional
 
 class PokemonStats(BaseModel):
     hp: int = Field(..., gt=0, description="Os Pontos de Vida (PV) do Pokémon, que determinam quanto dano ele pode receber.")
@@ -30,3 +30,68 @@ class PokemonRank(BaseModel):
 
     class Config:
         from_attributes = True
+
+class MatchupResult(BaseModel):
+    attacker: str = Field(..., description="O Pokémon avaliado como atacante.")
+    defender: str = Field(..., description="O Pokémon oponente.")
+    offense: float = Field(..., ge=0, description="Melhor multiplicador de dano do atacante contra o oponente (tipos com STAB).")
+    defense: float = Field(..., ge=0, description="Melhor multiplicador de dano do oponente contra o atacante.")
+    advantage: float = Field(..., description="Vantagem do atacante: ofensa menos defesa.")
+
+class TeamMatchupRequest(BaseModel):
+    team_a: List[str] = Field(..., min_length=1, max_length=50, description="Nomes dos Pokémons do time A.")
+    team_b: List[str] = Field(..., min_length=1, max_length=50, description="Nomes dos Pokémons do time B.")
+
+class TeamMatchup(BaseModel):
+    team_a: List[str] = Field(..., description="Nomes normalizados do time A (linhas da matriz).")
+    team_b: List[str] = Field(..., description="Nomes normalizados do time B (colunas da matriz).")
+    advantage: List[List[float]] = Field(..., description="Matriz de vantagens de cada membro de A contra cada membro de B.")
+    score: float = Field(..., description="Vantagem média do time A sobre o time B.")
+    best_counters: Dict[str, str] = Field(..., description="Para cada membro de B, o membro de A com maior vantagem.")
+
+class SimilarPokemon(BaseModel):
+    rank: int = Field(..., gt=0, description="A posição do vizinho, do mais ao menos similar.")
+    name: str = Field(..., description="O nome do Pokémon vizinho.")
+    score: float = Field(..., description="Similaridade de cosseno ou distância euclidiana, conforme a métrica escolhida.")
+
+class PokemonQuery(BaseModel):
+    fields: List[str] = Field(["id", "name"], min_length=1, description="Campos a retornar (ex: 'name', 'types', 'stats', 'stats.speed', 'rank').")
+    names: Optional[List[str]] = Field(None, max_length=1000, description="Filtrar por nomes.")
+    ids: Optional[List[int]] = Field(None, max_length=1000, description="Filtrar por IDs da Dex Nacional.")
+    type: Optional[str] = Field(None, description="Filtrar por tipo (ex: fire, water).")
+    order_by: Optional[str] = Field(None, pattern="^(hp|attack|defense|special_attack|special_defense|speed)$", description="Ordenar (decrescente) por um atributo; habilita o campo 'rank'.")
+    limit: int = Field(100, ge=1, le=1000, description="Quantidade máxima de resultados.")
+
+class DatasetVersion(BaseModel):
+    version: str = Field(..., description="Impressão digital do conteúdo carregado; muda a cada carga que altera os dados.")
+    pokemons: int = Field(..., ge=0, description="Quantidade de Pokémons carregados.")
+    max_id: Optional[int] = Field(None, ge=0, description="Maior ID carregado (os IDs têm lacunas, ex.: formas a partir de 10001).")
+
+class PokemonAbility(BaseModel):
+    name: str = Field(..., description="O nome da habilidade.")
+    slot: int = Field(..., ge=1, le=3, description="A posição da habilidade no Pokémon (a oculta costuma ser a 3).")
+    is_hidden: bool = Field(..., description="Se é a habilidade oculta.")
+    short_effect: Optional[str] = Field(None, description="Resumo do efeito, em inglês como na PokeAPI.")
+
+class PokemonMove(BaseModel):
+    name: str = Field(..., description="O nome do movimento.")
+    type: Optional[str] = Field(None, description="O tipo elemental do movimento.")
+    power: Optional[int] = Field(None, description="Poder base; vazio para movimentos de status.")
+    accuracy: Optional[int] = Field(None, description="Precisão em %; vazio para movimentos que nunca erram.")
+    pp: Optional[int] = Field(None, description="Quantidade de usos (Power Points).")
+    damage_class: Optional[str] = Field(None, description="Classe de dano: physical, special ou status.")
+    learn_method: Optional[str] = Field(None, description="Como o Pokémon aprende o movimento (ex: level-up, machine, egg).")
+    level: Optional[int] = Field(None, description="Nível em que o movimento é aprendido (0 fora de level-up).")
+
+class EvolutionStep(BaseModel):
+    species: str = Field(..., description="A espécie desta etapa da cadeia.")
+    stage: int = Field(..., ge=1, description="O estágio na cadeia (1 é a forma básica).")
+    evolves_from: Optional[str] = Field(None, description="A espécie da qual esta evolui.")
+    trigger: Optional[str] = Field(None, description="O gatilho da evolução (ex: level-up, use-item, trade).")
+    min_level: Optional[int] = Field(None, description="Nível mínimo para evoluir, quando o gatilho é nível.")
+    item: Optional[str] = Field(None, description="Item usado para evoluir (ex: water-stone).")
+
+class EvolutionChain(BaseModel):
+    chain_id: int = Field(..., description="O identificador da cadeia de evolução na PokeAPI.")
+    species: str = Field(..., description="A espécie do Pokémon consultado.")
+    steps: List[EvolutionStep] = Field(..., description="Todas as etapas da cadeia, por estágio; cadeias ramificadas têm várias etapas no mesmo estágio.")
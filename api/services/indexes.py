@@ -0,0 +1,58 @@
+import os
+import threading
+import time
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+from api.repositories.pokemon import PokemonRepository
+
+# Tempo de vida dos índices em memória antes de uma nova leitura do banco:
+INDEX_TTL_SECONDS = int(os.getenv("INDEX_TTL_SECONDS", 300))
+
+T = TypeVar("T")
+
+class UnknownPokemonError(LookupError):
+    """
+    Sinaliza que um ou mais nomes não existem no índice consultado.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = list(names)
+        super().__init__(f"Pokémon não encontrado: {', '.join(self.names)}")
+
+class IndexCache(Generic[T]):
+    """
+    Mantém um índice em memória construído a partir do repositório.
+    Quando o TTL expira, um novo snapshot é construído e trocado de forma atômica,
+    de modo que leitores concorrentes sempre enxergam um índice completo.
+    """
+
+    def __init__(self, builder: Callable[[PokemonRepository], T], ttl_seconds: int = INDEX_TTL_SECONDS):
+        self._builder = builder
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._index: Optional[T] = None
+        self._built_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return self._index is not None and (time.monotonic() - self._built_at) < self._ttl
+
+    def get(self, repository: PokemonRepository) -> T:
+        """
+        Retorna o índice atual, reconstruindo-o se estiver ausente ou expirado.
+        """
+        if self._is_fresh():
+            return self._index
+
+        with self._lock:
+            # Outra thread pode ter reconstruído enquanto esperávamos o lock:
+            if not self._is_fresh():
+                self._index = self._builder(repository)
+                self._built_at = time.monotonic()
+            return self._index
+
+    def invalidate(self) -> None:
+        """
+        Descarta o snapshot atual; a próxima leitura reconstrói o índice.
+        """
+        with self._lock:
+            self._index = None
+            self._built_at = 0.0
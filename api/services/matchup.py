@@ -0,0 +1,207 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from api.repositories.pokemon import PokemonRepository
+from api.schemas import MatchupResult, TeamMatchup
+from api.services.indexes import IndexCache, UnknownPokemonError
+
+# --- Tabela de efetividade de tipos (Geração 6+) ---
+TYPE_NAMES: Tuple[str, ...] = (
+    "normal", "fire", "water", "electric", "grass", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy",
+)
+TYPE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(TYPE_NAMES)}
+
+# Atacante -> defensores afetados:
+_SUPER_EFFECTIVE = {
+    "fire": ("grass", "ice", "bug", "steel"),
+    "water": ("fire", "ground", "rock"),
+    "electric": ("water", "flying"),
+    "grass": ("water", "ground", "rock"),
+    "ice": ("grass", "ground", "flying", "dragon"),
+    "fighting": ("normal", "ice", "rock", "dark", "steel"),
+    "poison": ("grass", "fairy"),
+    "ground": ("fire", "electric", "poison", "rock", "steel"),
+    "flying": ("grass", "fighting", "bug"),
+    "psychic": ("fighting", "poison"),
+    "bug": ("grass", "psychic", "dark"),
+    "rock": ("fire", "ice", "flying", "bug"),
+    "ghost": ("psychic", "ghost"),
+    "dragon": ("dragon",),
+    "dark": ("psychic", "ghost"),
+    "steel": ("ice", "rock", "fairy"),
+    "fairy": ("fighting", "dragon", "dark"),
+}
+
+_NOT_VERY_EFFECTIVE = {
+    "normal": ("rock", "steel"),
+    "fire": ("fire", "water", "rock", "dragon"),
+    "water": ("water", "grass", "dragon"),
+    "electric": ("electric", "grass", "dragon"),
+    "grass": ("fire", "grass", "poison", "flying", "bug", "dragon", "steel"),
+    "ice": ("fire", "water", "ice", "steel"),
+    "fighting": ("poison", "flying", "psychic", "bug", "fairy"),
+    "poison": ("poison", "ground", "rock", "ghost"),
+    "ground": ("grass", "bug"),
+    "flying": ("electric", "rock", "steel"),
+    "psychic": ("psychic", "steel"),
+    "bug": ("fire", "fighting", "poison", "flying", "ghost", "steel", "fairy"),
+    "rock": ("fighting", "ground", "steel"),
+    "ghost": ("dark",),
+    "dragon": ("steel",),
+    "dark": ("fighting", "dark", "fairy"),
+    "steel": ("fire", "water", "electric", "steel"),
+    "fairy": ("fire", "poison", "steel"),
+}
+
+_NO_EFFECT = {
+    "normal": ("ghost",),
+    "electric": ("ground",),
+    "fighting": ("ghost",),
+    "poison": ("steel",),
+    "ground": ("flying",),
+    "psychic": ("dark",),
+    "ghost": ("normal",),
+    "dragon": ("fairy",),
+}
+
+def build_type_chart() -> np.ndarray:
+    """
+    Constrói a matriz 18x18 de multiplicadores: chart[atacante, defensor].
+    """
+    chart = np.ones((len(TYPE_NAMES), len(TYPE_NAMES)), dtype=np.float32)
+    for multiplier, table in ((2.0, _SUPER_EFFECTIVE), (0.5, _NOT_VERY_EFFECTIVE), (0.0, _NO_EFFECT)):
+        for attacker, defenders in table.items():
+            for defender in defenders:
+                chart[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = multiplier
+    chart.setflags(write=False)
+    return chart
+
+TYPE_CHART = build_type_chart()
+
+class MatchupEngine:
+    """
+    Motor vetorizado de confrontos entre Pokémons.
+
+    Mantém duas matrizes alinhadas por Pokémon:
+    - attack_mask (N x 18): 1.0 nos tipos do Pokémon (ataques com STAB).
+    - defense_profiles (N x 18): multiplicador de dano recebido de cada tipo atacante.
+    """
+
+    def __init__(self, names: Sequence[str], types: Sequence[Sequence[str]]):
+        self.names = [n.lower() for n in names]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+        # Coluna sentinela (índice 18) com multiplicador 1.0 para Pokémons com menos tipos que o máximo:
+        sentinel = len(TYPE_NAMES)
+        max_slots = max((len(t) for t in types), default=1) or 1
+        slots = np.full((len(self.names), max_slots), sentinel, dtype=np.intp)
+        for row, type_list in enumerate(types):
+            cols = [TYPE_INDEX[t] for t in type_list if t in TYPE_INDEX]
+            slots[row, :len(cols)] = cols
+
+        chart_ext = np.hstack([TYPE_CHART, np.ones((len(TYPE_NAMES), 1), dtype=np.float32)])
+        # chart_ext.T[slots] -> (N, slots, 18); o produto sobre os slots é o perfil defensivo:
+        self.defense_profiles = chart_ext.T[slots].prod(axis=1)
+
+        mask_ext = np.zeros((len(self.names), sentinel + 1), dtype=np.float32)
+        np.put_along_axis(mask_ext, slots, 1.0, axis=1)
+        self.attack_mask = mask_ext[:, :sentinel]
+
+    @classmethod
+    def from_repository(cls, repository: PokemonRepository) -> "MatchupEngine":
+        rows = repository.get_type_assignments()
+        return cls([name for _, name, _ in rows], [types for _, _, types in rows])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def positions(self, names: Sequence[str]) -> np.ndarray:
+        """
+        Converte nomes em posições nas matrizes.
+
+        Raises:
+            UnknownPokemonError: Se algum nome não existir no índice.
+        """
+        keys = [n.lower() for n in names]
+        missing = [k for k in keys if k not in self._positions]
+        if missing:
+            raise UnknownPokemonError(missing)
+        return np.fromiter((self._positions[k] for k in keys), dtype=np.intp, count=len(keys))
+
+    def offense_matrix(self, attackers: np.ndarray, defenders: np.ndarray) -> np.ndarray:
+        """
+        Melhor multiplicador de cada atacante contra cada defensor (M x N), em uma única operação.
+        """
+        return (self.attack_mask[attackers][:, None, :] * self.defense_profiles[defenders][None, :, :]).max(axis=2)
+
+    def score(self, attackers: np.ndarray, defenders: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retorna as matrizes (ofensa, defesa, vantagem) de atacantes contra defensores.
+        A vantagem é a diferença entre o dano causado e o dano recebido.
+        """
+        offense = self.offense_matrix(attackers, defenders)
+        defense = self.offense_matrix(defenders, attackers).T
+        return offense, defense, offense - defense
+
+_engine_cache: IndexCache[MatchupEngine] = IndexCache(MatchupEngine.from_repository)
+
+class MatchupService:
+    """
+    Casos de uso de confrontos sobre o motor de efetividade em memória.
+    """
+
+    def __init__(self, repository: Optional[PokemonRepository], engine: Optional[MatchupEngine] = None):
+        self.repository = repository
+        # Motor já construído (ex.: a partir de um snapshot); sem ele, usa o índice em cache do banco:
+        self._engine = engine
+
+    @property
+    def engine(self) -> MatchupEngine:
+        # 'is not None': um motor vazio tem len() == 0 e seria falso.
+        return self._engine if self._engine is not None else _engine_cache.get(self.repository)
+
+    def score_against(self, name: str, opponents: Optional[List[str]] = None, limit: int = 10) -> List[MatchupResult]:
+        """
+        Avalia um Pokémon contra vários oponentes em lote.
+        Sem oponentes, avalia contra toda a Pokédex e retorna os 'limit' melhores confrontos.
+        """
+        engine = self.engine
+        attacker = engine.positions([name])
+        defenders = engine.positions(opponents) if opponents else np.arange(len(engine), dtype=np.intp)
+
+        offense, defense, advantage = (m[0] for m in engine.score(attacker, defenders))
+
+        order = np.arange(len(defenders))
+        if not opponents:
+            order = order[defenders != attacker[0]]
+            order = order[np.argsort(-advantage[order], kind="stable")][:limit]
+
+        return [
+            MatchupResult(
+                attacker=engine.names[attacker[0]],
+                defender=engine.names[defenders[i]],
+                offense=float(offense[i]),
+                defense=float(defense[i]),
+                advantage=float(advantage[i]),
+            )
+            for i in order
+        ]
+
+    def evaluate_teams(self, team_a: List[str], team_b: List[str]) -> TeamMatchup:
+        """
+        Avalia time contra time: a matriz de vantagens (A x B) é calculada de uma só vez.
+        """
+        engine = self.engine
+        rows = engine.positions(team_a)
+        cols = engine.positions(team_b)
+        _, _, advantage = engine.score(rows, cols)
+
+        best_rows = advantage.argmax(axis=0)
+        return TeamMatchup(
+            team_a=[engine.names[i] for i in rows],
+            team_b=[engine.names[j] for j in cols],
+            advantage=advantage.round(3).tolist(),
+            score=float(advantage.mean()),
+            best_counters={engine.names[cols[j]]: engine.names[rows[i]] for j, i in enumerate(best_rows)},
+        )
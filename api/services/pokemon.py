@@ -1,7 +1,13 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import json
+import hashlib
 from api.repositories.pokemon import PokemonRepository
-from api.schemas import PokemonDetail, PokemonRank
+from api.schemas import DatasetVersion, EvolutionChain, EvolutionStep, PokemonAbility, PokemonDetail, PokemonMove, PokemonRank
+from api.services.indexes import UnknownPokemonError
+
+RANKING_CACHE_TTL_SECONDS = 60
+DETAILS_CACHE_TTL_SECONDS = 300
+VERSION_CACHE_TTL_SECONDS = 60
 
 class PokemonService:
     """
@@ -13,11 +19,50 @@ class PokemonService:
         self.repository = repository
         self.redis = redis_client
 
-    def get_pokemon_details(self, name: str) -> Optional[PokemonDetail]:
+    def get_pokemon_details(self, name_or_id: str) -> Optional[PokemonDetail]:
+        """
+        Obtém detalhes do Pokémon pelo nome ou pelo ID da Dex Nacional (Com Cache).
+        Entradas numéricas usam a busca por chave primária.
+        """
+        key = name_or_id.strip().lower()
+        if key.isascii() and key.isdigit():
+            cache_key = f"pokemon:id:{int(key)}"
+        else:
+            cache_key = f"pokemon:name:{key}"
+
+        cached = self._cache_get(cache_key)
+        if cached:
+            return PokemonDetail(**cached)
+
+        if key.isascii() and key.isdigit():
+            result = self.repository.get_by_id(int(key))
+        else:
+            result = self.repository.get_pokemon_by_name(key)
+
+        if result:
+            # O mesmo payload atende consultas futuras por nome e por ID:
+            data = result.model_dump()
+            self._cache_set(f"pokemon:id:{result.id}", data, DETAILS_CACHE_TTL_SECONDS)
+            self._cache_set(f"pokemon:name:{result.name}", data, DETAILS_CACHE_TTL_SECONDS)
+
+        return result
+
+    def get_pokemons_by_id_range(self, start: int, end: int) -> List[PokemonDetail]:
         """
-        Obtém detalhes do Pokémon pelo nome.
+        Obtém detalhes de um intervalo de IDs, servindo do cache quando todos estiverem presentes.
         """
-        return self.repository.get_pokemon_by_name(name)
+        keys = [f"pokemon:id:{i}" for i in range(start, end + 1)]
+        cached = self._cache_get_many(keys)
+        if cached is not None:
+            return [PokemonDetail(**item) for item in cached]
+
+        result = self.repository.get_pokemons_by_id_range(start, end)
+        for detail in result:
+            data = detail.model_dump()
+            self._cache_set(f"pokemon:id:{detail.id}", data, DETAILS_CACHE_TTL_SECONDS)
+            self._cache_set(f"pokemon:name:{detail.name}", data, DETAILS_CACHE_TTL_SECONDS)
+
+        return result
 
     def list_pokemons(self, type_filter: Optional[str] = None) -> List[str]:
         """
@@ -32,30 +77,163 @@ class PokemonService:
         Obtém ranking de atributos com suporte a Caching (Redis).
         """
         cache_key = f"ranking:{stat}:{limit}"
-        CACHE_TTL_SECONDS = 60
         
         # Tentar obter do Cache
-        if self.redis:
-            try:
-                cached = self.redis.get(cache_key)
-                if cached:
-                    # Deserializar e retornar lista de modelos
-                    data_json = json.loads(cached)
-                    return [PokemonRank(**item) for item in data_json]
-            except Exception:
-                # Falha silenciosa no cache (fallback para DB)
-                pass
+        cached = self._cache_get(cache_key)
+        if cached:
+            return [PokemonRank(**item) for item in cached]
 
         # Buscar no Banco de Dados
         result = self.repository.get_ranking_by_stat(stat, limit)
 
         # Salvar no Cache
-        if self.redis and result:
-            try:
-                # Serializar lista de modelos para JSON
-                json_data = json.dumps([r.dict() for r in result])
-                self.redis.setex(cache_key, CACHE_TTL_SECONDS, json_data)
-            except Exception:
-                pass
+        if result:
+            self._cache_set(cache_key, [r.model_dump() for r in result], RANKING_CACHE_TTL_SECONDS)
+
+        return result
+
+    def get_abilities(self, name_or_id: str) -> List[PokemonAbility]:
+        """
+        Habilidades do Pokémon (Com Cache).
+
+        Raises:
+            UnknownPokemonError: O Pokémon não existe.
+        """
+        key = name_or_id.strip().lower()
+        cached = self._cache_get(f"pokemon:abilities:{key}")
+        # 'is not None': uma lista vazia em cache também é resposta.
+        if cached is not None:
+            return [PokemonAbility(**item) for item in cached]
+
+        pokemon_id, _ = self._pokemon_ref(key)
+        result = self.repository.get_abilities(pokemon_id)
+        self._cache_set(f"pokemon:abilities:{key}", [a.model_dump() for a in result], DETAILS_CACHE_TTL_SECONDS)
+        return result
+
+    def get_moves(self, name_or_id: str, learn_method: Optional[str] = None) -> List[PokemonMove]:
+        """
+        Movimentos do Pokémon, opcionalmente filtrados pelo método de aprendizado (Com Cache).
+        A lista completa é cacheada uma vez e filtrada em memória.
+
+        Raises:
+            UnknownPokemonError: O Pokémon não existe.
+        """
+        key = name_or_id.strip().lower()
+        cached = self._cache_get(f"pokemon:moves:{key}")
+        if cached is not None:
+            result = [PokemonMove(**item) for item in cached]
+        else:
+            pokemon_id, _ = self._pokemon_ref(key)
+            result = self.repository.get_moves(pokemon_id)
+            self._cache_set(f"pokemon:moves:{key}", [m.model_dump() for m in result], DETAILS_CACHE_TTL_SECONDS)
 
+        if learn_method:
+            result = [m for m in result if m.learn_method == learn_method.lower()]
         return result
+
+    def get_evolution_chain(self, name_or_id: str) -> Optional[EvolutionChain]:
+        """
+        Cadeia de evolução completa do Pokémon (Com Cache); None se a espécie ainda não foi carregada.
+
+        Raises:
+            UnknownPokemonError: O Pokémon não existe.
+        """
+        key = name_or_id.strip().lower()
+        cached = self._cache_get(f"pokemon:evolution:{key}")
+        if cached:
+            return EvolutionChain(**cached)
+
+        _, species_id = self._pokemon_ref(key)
+        if species_id is None:
+            return None
+        result = self._build_chain(species_id, self.repository.get_evolution_chain(species_id))
+        if result:
+            self._cache_set(f"pokemon:evolution:{key}", result.model_dump(), DETAILS_CACHE_TTL_SECONDS)
+        return result
+
+    def get_dataset_version(self) -> DatasetVersion:
+        """
+        Versão do conjunto de dados carregado, usada pelos clientes para invalidar seus caches (Com Cache).
+        """
+        cached = self._cache_get("dataset:version")
+        if cached:
+            return DatasetVersion(**cached)
+
+        fingerprint = self.repository.get_dataset_fingerprint()
+        digest = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:12]
+        result = DatasetVersion(version=digest, pokemons=fingerprint["pokemons"], max_id=fingerprint["max_id"])
+        self._cache_set("dataset:version", result.model_dump(), VERSION_CACHE_TTL_SECONDS)
+        return result
+
+    def _pokemon_ref(self, key: str) -> Tuple[int, Optional[int]]:
+        ref = self.repository.get_pokemon_ref(key)
+        if ref is None:
+            raise UnknownPokemonError([key])
+        return ref
+
+    @staticmethod
+    def _build_chain(species_id: int, rows: List[Dict[str, Any]]) -> Optional[EvolutionChain]:
+        """
+        Monta as etapas a partir das linhas planas (espécie, pré-evolução): o estágio é a
+        profundidade na árvore; etapas do mesmo estágio (ramificações) ficam em ordem de ID.
+        """
+        by_id = {row["id"]: row for row in rows}
+        if species_id not in by_id:
+            return None
+
+        stages: Dict[int, int] = {}
+
+        def stage(sid: int) -> int:
+            if sid not in stages:
+                parent = by_id[sid]["evolves_from_id"]
+                # Pré-evolução fora da cadeia carregada: a espécie vira a forma básica.
+                stages[sid] = 1 if parent not in by_id else stage(parent) + 1
+            return stages[sid]
+
+        steps = [
+            EvolutionStep(
+                species=row["name"],
+                stage=stage(row["id"]),
+                evolves_from=by_id[row["evolves_from_id"]]["name"] if row["evolves_from_id"] in by_id else None,
+                trigger=row["evolution_trigger"],
+                min_level=row["min_level"],
+                item=row["evolution_item"],
+            )
+            for row in rows
+        ]
+        steps.sort(key=lambda step: step.stage)
+        return EvolutionChain(chain_id=by_id[species_id]["evolution_chain_id"], species=by_id[species_id]["name"], steps=steps)
+
+    # --- Helpers de Cache (Redis) ---
+    # Falhas do Redis são silenciosas: o banco de dados é sempre o fallback.
+
+    def _cache_get(self, key: str) -> Optional[Any]:
+        if not self.redis:
+            return None
+        try:
+            cached = self.redis.get(key)
+            return json.loads(cached) if cached else None
+        except Exception:
+            return None
+
+    def _cache_get_many(self, keys: List[str]) -> Optional[List[Any]]:
+        """
+        Retorna todos os valores, ou None se algum estiver ausente (miss parcial conta como miss).
+        """
+        if not self.redis or not keys:
+            return None
+        try:
+            values = self.redis.mget(keys)
+        except Exception:
+            return None
+        if any(v is None for v in values):
+            return None
+        return [json.loads(v) for v in values]
+
+    def _cache_set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        if not self.redis:
+            return
+        try:
+            self.redis.setex(key, ttl_seconds, json.dumps(value))
+        except Exception:
+            pass
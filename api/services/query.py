@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Tuple
+from api.repositories.loaders import type_loader
+from api.repositories.pokemon import PokemonRepository
+from api.schemas import PokemonQuery
+
+BASE_FIELDS = ("id", "name", "height", "weight")
+STAT_FIELDS = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+AVAILABLE_FIELDS = BASE_FIELDS + ("types", "rank", "stats") + tuple(f"stats.{s}" for s in STAT_FIELDS)
+
+def parse_fields(fields: List[str]) -> Tuple[List[str], List[str], bool, bool]:
+    """
+    Converte a lista de campos pedidos em (colunas base, atributos, inclui tipos, inclui rank).
+
+    Raises:
+        ValueError: Se algum campo não for suportado.
+    """
+    unknown = [f for f in fields if f not in AVAILABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos não suportados: {', '.join(unknown)}. Disponíveis: {', '.join(AVAILABLE_FIELDS)}")
+
+    base = [f for f in BASE_FIELDS if f in fields]
+    stats = list(STAT_FIELDS) if "stats" in fields else [s for s in STAT_FIELDS if f"stats.{s}" in fields]
+    return base, stats, "types" in fields, "rank" in fields
+
+class QueryService:
+    """
+    Camada de consulta com seleção de campos (sparse fieldsets).
+    Cada cliente pede só o que precisa; tipos são resolvidos por um DataLoader,
+    em uma única consulta para todo o resultado.
+    """
+
+    def __init__(self, repository: PokemonRepository):
+        self.repository = repository
+
+    def query(self, request: PokemonQuery) -> List[Dict[str, Any]]:
+        base, stats, with_types, with_rank = parse_fields(request.fields)
+        if with_rank and not request.order_by:
+            raise ValueError("O campo 'rank' exige 'order_by'.")
+
+        rows = self.repository.query_pokemons(
+            columns=base + stats,
+            names=request.names,
+            ids=request.ids,
+            type_name=request.type,
+            order_by=request.order_by,
+            limit=request.limit,
+        )
+
+        loader = type_loader(self.repository)
+        pending_types = loader.load_many(row["id"] for row in rows) if with_types else None
+
+        results = []
+        for position, row in enumerate(rows):
+            item: Dict[str, Any] = {field: row[field] for field in base}
+            if with_rank:
+                item["rank"] = position + 1
+            if stats:
+                item["stats"] = {stat: row[stat] for stat in stats}
+            if with_types:
+                item["types"] = pending_types[position].get()
+            results.append(item)
+
+        return results
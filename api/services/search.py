@@ -0,0 +1,121 @@
+import bisect
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from api.repositories.pokemon import PokemonRepository
+from api.services.indexes import IndexCache
+
+MAX_EDIT_DISTANCE = 2
+MAX_FUZZY_CANDIDATES = 64
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Distância de edição entre 'a' e 'b', ou None se exceder max_distance.
+    Abandona o cálculo assim que todas as células da linha ultrapassam o limite.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            )
+        if min(current) > max_distance:
+            return None
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+class NameIndex:
+    """
+    Índice de nomes em memória para busca por prefixo e busca aproximada.
+
+    - Prefixo: busca binária sobre a lista ordenada de nomes.
+    - Aproximada: candidatos por sobreposição de trigramas, confirmados por
+      distância de edição limitada.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = sorted({n.lower() for n in names})
+        self._postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for gram in _trigrams(name):
+                self._postings.setdefault(gram, []).append(position)
+
+    @classmethod
+    def from_repository(cls, repository: PokemonRepository) -> "NameIndex":
+        return cls(repository.list_pokemons_by_type())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        key = name.lower()
+        position = bisect.bisect_left(self.names, key)
+        return position < len(self.names) and self.names[position] == key
+
+    def prefix(self, query: str, limit: int = 10) -> List[str]:
+        key = query.lower()
+        start = bisect.bisect_left(self.names, key)
+        matches = []
+        for name in self.names[start:start + limit]:
+            if not name.startswith(key):
+                break
+            matches.append(name)
+        return matches
+
+    def fuzzy(self, query: str, limit: int = 5, max_distance: int = MAX_EDIT_DISTANCE) -> List[Tuple[str, int]]:
+        """
+        Retorna (nome, distância) dos nomes a até max_distance edições, do mais próximo ao mais distante.
+        """
+        key = query.lower()
+        overlap = Counter()
+        for gram in _trigrams(key):
+            overlap.update(self._postings.get(gram, ()))
+
+        matches = []
+        for position, _ in overlap.most_common(MAX_FUZZY_CANDIDATES):
+            name = self.names[position]
+            distance = bounded_levenshtein(key, name, max_distance)
+            if distance is not None:
+                matches.append((distance, -overlap[position], name))
+
+        matches.sort()
+        return [(name, distance) for distance, _, name in matches[:limit]]
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Combina sugestões por prefixo (primeiro) com correções aproximadas.
+        """
+        results = self.prefix(query, limit)
+        if len(results) < limit:
+            seen = set(results)
+            results.extend(
+                name for name, _ in self.fuzzy(query, limit)
+                if name not in seen
+            )
+        return results[:limit]
+
+_name_index_cache: IndexCache[NameIndex] = IndexCache(NameIndex.from_repository)
+
+class SearchService:
+    """
+    Casos de uso de busca de nomes, servidos sem tocar no banco enquanto o índice estiver válido.
+    """
+
+    def __init__(self, repository: PokemonRepository):
+        self.repository = repository
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        return _name_index_cache.get(self.repository).suggest(query.strip(), limit)
+
+    def did_you_mean(self, name: str, limit: int = 3) -> List[str]:
+        return [match for match, _ in _name_index_cache.get(self.repository).fuzzy(name.strip(), limit)]
@@ -0,0 +1,118 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+from api.repositories.pokemon import PokemonRepository
+from api.schemas import SimilarPokemon
+from api.services.indexes import IndexCache, UnknownPokemonError
+
+STAT_COLUMNS: Tuple[str, ...] = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+METRICS = ("cosine", "euclidean")
+
+def normalize_stats(stats: np.ndarray) -> np.ndarray:
+    """
+    Padroniza cada coluna (z-score) para que nenhum atributo domine a distância.
+    """
+    matrix = np.asarray(stats, dtype=np.float32)
+    std = matrix.std(axis=0)
+    std[std == 0] = 1.0
+    return (matrix - matrix.mean(axis=0)) / std
+
+class SimilarityIndex:
+    """
+    Índice exato de vizinhos mais próximos sobre os seis atributos base.
+    As consultas são um produto matriz-vetor seguido de argpartition (O(N), sem loops em Python).
+    """
+
+    def __init__(self, names: Sequence[str], stats: np.ndarray):
+        self.names = [n.lower() for n in names]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self.vectors = np.ascontiguousarray(normalize_stats(stats), dtype=np.float32)
+        self._sq_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+        norms = np.sqrt(self._sq_norms)
+        norms[norms == 0] = 1.0
+        self.unit = self.vectors / norms[:, None]
+
+    @classmethod
+    def from_repository(cls, repository: PokemonRepository) -> "SimilarityIndex":
+        rows = repository.get_stat_vectors()
+        stats = np.array([values for _, _, values in rows], dtype=np.float32).reshape(-1, len(STAT_COLUMNS))
+        return cls([name for _, name, _ in rows], stats)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def position(self, name: str) -> int:
+        key = name.lower()
+        if key not in self._positions:
+            raise UnknownPokemonError([key])
+        return self._positions[key]
+
+    def _scores(self, rows: np.ndarray, metric: str) -> np.ndarray:
+        """
+        Matriz (len(rows) x N) onde valores menores significam mais similar.
+        """
+        if metric == "cosine":
+            return -(self.unit[rows] @ self.unit.T)
+        # ||a - b||² = ||a||² - 2 a·b + ||b||²:
+        sq = self._sq_norms[rows][:, None] - 2.0 * (self.vectors[rows] @ self.vectors.T) + self._sq_norms[None, :]
+        return np.sqrt(np.maximum(sq, 0.0))
+
+    def top_k(self, rows: np.ndarray, k: int, metric: str = "cosine") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna (índices, valores) dos k vizinhos de cada linha, excluindo ela mesma.
+        Para 'cosine' o valor é a similaridade; para 'euclidean', a distância.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Métrica inválida: {metric}")
+
+        rows = np.asarray(rows, dtype=np.intp)
+        k = max(0, min(k, len(self) - 1))
+        scores = self._scores(rows, metric)
+        scores[np.arange(len(rows)), rows] = np.inf
+
+        if k == 0:
+            empty = np.empty((len(rows), 0))
+            return empty.astype(np.intp), empty
+
+        candidates = np.argpartition(scores, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(candidate_scores, axis=1, kind="stable")
+        neighbors = np.take_along_axis(candidates, order, axis=1)
+        values = np.take_along_axis(candidate_scores, order, axis=1)
+        return neighbors, (-values if metric == "cosine" else values)
+
+    def all_top_k(self, k: int, metric: str = "cosine", batch_size: int = 1024):
+        """
+        Gera os vizinhos de todo o índice em blocos, limitando a memória a batch_size x N.
+        """
+        for start in range(0, len(self), batch_size):
+            rows = np.arange(start, min(start + batch_size, len(self)), dtype=np.intp)
+            neighbors, values = self.top_k(rows, k, metric)
+            yield rows, neighbors, values
+
+_similarity_cache: IndexCache[SimilarityIndex] = IndexCache(SimilarityIndex.from_repository)
+
+class SimilarityService:
+    """
+    Casos de uso de similaridade entre Pokémons pelos atributos base.
+    """
+
+    def __init__(self, repository: PokemonRepository):
+        self.repository = repository
+
+    def find_similar(self, name: str, k: int = 5, metric: str = "cosine") -> List[SimilarPokemon]:
+        """
+        Vizinhos de cosseno vêm da tabela pré-calculada pelo ETL, sem carregar o índice; o índice
+        em memória atende a distância euclidiana, k maior que o pré-calculado e tabelas vazias.
+        """
+        if metric == "cosine":
+            stored = self.repository.get_neighbors(name, k)
+            if len(stored) >= k:
+                return [SimilarPokemon(rank=rank, name=neighbor, score=round(score, 4)) for rank, neighbor, score in stored]
+
+        index = _similarity_cache.get(self.repository)
+        row = index.position(name)
+        neighbors, values = index.top_k(np.array([row]), k, metric)
+        return [
+            SimilarPokemon(rank=i + 1, name=index.names[n], score=round(float(v), 4))
+            for i, (n, v) in enumerate(zip(neighbors[0], values[0]))
+        ]
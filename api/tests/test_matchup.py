@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from api.services.matchup import TYPE_CHART, TYPE_INDEX, MatchupEngine, MatchupService, _engine_cache
+from api.services.indexes import UnknownPokemonError
+
+DEX = [
+    (1, "bulbasaur", ["grass", "poison"]),
+    (4, "charmander", ["fire"]),
+    (7, "squirtle", ["water"]),
+    (25, "pikachu", ["electric"]),
+    (74, "geodude", ["rock", "ground"]),
+]
+
+@pytest.fixture
+def engine():
+    return MatchupEngine([name for _, name, _ in DEX], [types for _, _, types in DEX])
+
+@pytest.fixture
+def service(engine, mocker):
+    mocker.patch.object(_engine_cache, "get", return_value=engine)
+    return MatchupService(MagicMock())
+
+def test_type_chart_shape_and_known_values():
+    assert TYPE_CHART.shape == (18, 18)
+    assert TYPE_CHART[TYPE_INDEX["fire"], TYPE_INDEX["grass"]] == 2.0
+    assert TYPE_CHART[TYPE_INDEX["water"], TYPE_INDEX["grass"]] == 0.5
+    assert TYPE_CHART[TYPE_INDEX["electric"], TYPE_INDEX["ground"]] == 0.0
+
+def test_dual_type_defense_profile(engine):
+    # Rocha/Terra recebe 4x de água e é imune a elétrico:
+    geodude = engine.defense_profiles[engine.positions(["geodude"])[0]]
+    assert geodude[TYPE_INDEX["water"]] == 4.0
+    assert geodude[TYPE_INDEX["electric"]] == 0.0
+
+def test_score_one_against_many(engine):
+    offense, defense, advantage = engine.score(engine.positions(["pikachu"]), engine.positions(["squirtle", "geodude"]))
+    np.testing.assert_array_equal(offense, [[2.0, 0.0]])
+    np.testing.assert_array_equal(defense, [[1.0, 2.0]])
+    np.testing.assert_array_equal(advantage, [[1.0, -2.0]])
+
+def test_score_against_whole_dex_excludes_self(service):
+    results = service.score_against("Charmander", limit=2)
+    assert [r.defender for r in results] == ["bulbasaur", "pikachu"]
+    assert all(r.attacker == "charmander" for r in results)
+
+def test_evaluate_teams(service):
+    result = service.evaluate_teams(["squirtle", "pikachu"], ["charmander", "geodude"])
+    assert len(result.advantage) == 2 and len(result.advantage[0]) == 2
+    assert result.best_counters == {"charmander": "squirtle", "geodude": "squirtle"}
+
+def test_unknown_pokemon(service):
+    with pytest.raises(UnknownPokemonError) as exc:
+        service.evaluate_teams(["pikachu"], ["missingno"])
+    assert exc.value.names == ["missingno"]
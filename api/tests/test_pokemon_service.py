@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import MagicMock
+from api.schemas import PokemonDetail, PokemonMove, PokemonStats
+from api.services.indexes import UnknownPokemonError
+from api.services.pokemon import PokemonService
+
+def _detail(pokemon_id: int, name: str) -> PokemonDetail:
+    return PokemonDetail(
+        id=pokemon_id, name=name, height=4, weight=60, types=["electric"],
+        stats=PokemonStats(hp=35, attack=55, defense=40, special_attack=50, special_defense=50, speed=90)
+    )
+
+class FakeRedis:
+    """Redis em memória suficiente para get/mget/setex."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+@pytest.fixture
+def repository():
+    repo = MagicMock()
+    repo.get_by_id.return_value = _detail(25, "pikachu")
+    repo.get_pokemon_by_name.return_value = _detail(25, "pikachu")
+    repo.get_pokemons_by_id_range.return_value = [_detail(25, "pikachu"), _detail(26, "raichu")]
+    return repo
+
+def test_numeric_input_uses_primary_key(repository):
+    service = PokemonService(repository)
+    assert service.get_pokemon_details("025").name == "pikachu"
+    repository.get_by_id.assert_called_once_with(25)
+    repository.get_pokemon_by_name.assert_not_called()
+
+def test_unicode_digits_are_looked_up_as_names(repository):
+    repository.get_pokemon_by_name.return_value = None
+    service = PokemonService(repository)
+    # "²".isdigit() é verdadeiro, mas int("²") falha: só dígitos ASCII viram ID.
+    assert service.get_pokemon_details("²") is None
+    repository.get_pokemon_by_name.assert_called_once_with("²")
+    repository.get_by_id.assert_not_called()
+
+def test_id_and_name_share_cache(repository):
+    service = PokemonService(repository, FakeRedis())
+    service.get_pokemon_details("25")
+    # Uma consulta por ID aquece também a chave por nome:
+    assert service.get_pokemon_details("Pikachu").id == 25
+    repository.get_pokemon_by_name.assert_not_called()
+
+def test_id_range_served_from_cache_when_complete(repository):
+    service = PokemonService(repository, FakeRedis())
+    assert [p.id for p in service.get_pokemons_by_id_range(25, 26)] == [25, 26]
+    assert [p.id for p in service.get_pokemons_by_id_range(25, 26)] == [25, 26]
+    repository.get_pokemons_by_id_range.assert_called_once_with(25, 26)
+
+def test_dataset_version_changes_with_content(repository):
+    repository.get_dataset_fingerprint.return_value = {"pokemons": 151, "max_id": 151, "content": "9e107d9d372bb6826bd81d3542a419d6"}
+    first = PokemonService(repository).get_dataset_version()
+
+    repository.get_dataset_fingerprint.return_value = {"pokemons": 151, "max_id": 151, "content": "e4d909c290d0fb1ca068ffaddf22cbd0"}
+    second = PokemonService(repository).get_dataset_version()
+
+    # Recarga só das cadeias de evolução, habilidades ou movimentos:
+    repository.get_dataset_fingerprint.return_value = {**repository.get_dataset_fingerprint.return_value, "related": "0cc175b9c0f1b6a831c399e269772661"}
+    third = PokemonService(repository).get_dataset_version()
+
+    assert first.pokemons == 151
+    assert len({first.version, second.version, third.version}) == 3
+
+def _species(sid, name, parent=None, trigger=None, min_level=None, item=None):
+    return {"id": sid, "name": name, "evolution_chain_id": 67, "evolves_from_id": parent,
+            "evolution_trigger": trigger, "min_level": min_level, "evolution_item": item}
+
+def test_evolution_chain_stages_with_branches(repository):
+    repository.get_pokemon_ref.return_value = (133, 133)
+    repository.get_evolution_chain.return_value = [
+        _species(133, "eevee"),
+        _species(134, "vaporeon", 133, "use-item", item="water-stone"),
+        _species(135, "jolteon", 133, "use-item", item="thunder-stone"),
+        _species(196, "espeon", 133, "level-up"),
+    ]
+    service = PokemonService(repository, FakeRedis())
+    chain = service.get_evolution_chain("Eevee")
+
+    assert chain.chain_id == 67 and chain.species == "eevee"
+    assert [(s.species, s.stage, s.evolves_from) for s in chain.steps] == [
+        ("eevee", 1, None), ("vaporeon", 2, "eevee"), ("jolteon", 2, "eevee"), ("espeon", 2, "eevee"),
+    ]
+    assert chain.steps[1].item == "water-stone"
+    # Segunda consulta vem do cache:
+    assert service.get_evolution_chain("eevee") == chain
+    repository.get_evolution_chain.assert_called_once_with(133)
+
+def test_pre_evolution_with_higher_id_is_an_earlier_stage(repository):
+    repository.get_pokemon_ref.return_value = (25, 25)
+    repository.get_evolution_chain.return_value = [
+        _species(25, "pikachu", 172, "level-up"),
+        _species(26, "raichu", 25, "use-item", item="thunder-stone"),
+        _species(172, "pichu"),
+    ]
+    chain = PokemonService(repository).get_evolution_chain("pikachu")
+    assert [(s.species, s.stage) for s in chain.steps] == [("pichu", 1), ("pikachu", 2), ("raichu", 3)]
+
+def test_related_lookups_of_unknown_pokemon_raise(repository):
+    repository.get_pokemon_ref.return_value = None
+    service = PokemonService(repository)
+    for lookup in (service.get_abilities, service.get_moves, service.get_evolution_chain):
+        with pytest.raises(UnknownPokemonError):
+            lookup("missingno")
+
+def test_species_not_loaded_has_no_chain(repository):
+    repository.get_pokemon_ref.return_value = (25, None)
+    assert PokemonService(repository).get_evolution_chain("pikachu") is None
+    repository.get_evolution_chain.assert_not_called()
+
+def test_moves_are_cached_once_and_filtered_in_memory(repository):
+    repository.get_pokemon_ref.return_value = (25, 25)
+    repository.get_moves.return_value = [
+        PokemonMove(name="thunder-shock", type="electric", power=40, learn_method="level-up", level=1),
+        PokemonMove(name="thunderbolt", type="electric", power=90, learn_method="machine", level=0),
+    ]
+    service = PokemonService(repository, FakeRedis())
+    assert [m.name for m in service.get_moves("pikachu", "machine")] == ["thunderbolt"]
+    assert len(service.get_moves("pikachu")) == 2
+    repository.get_moves.assert_called_once_with(25)
+
+def test_empty_ability_and_move_lists_are_served_from_cache(repository):
+    repository.get_pokemon_ref.return_value = (132, 132)
+    repository.get_abilities.return_value = []
+    repository.get_moves.return_value = []
+    service = PokemonService(repository, FakeRedis())
+    for _ in range(2):
+        assert service.get_abilities("ditto") == []
+        assert service.get_moves("ditto") == []
+    assert repository.get_pokemon_ref.call_count == 2
+    repository.get_abilities.assert_called_once_with(132)
+    repository.get_moves.assert_called_once_with(132)
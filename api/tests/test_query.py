@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from api.repositories.loaders import DataLoader
+from api.repositories.pokemon import PokemonRepository
+from api.schemas import PokemonQuery
+from api.services.query import QueryService
+
+@pytest.fixture
+def repository():
+    # SQLite em memória com o mesmo modelo dimensional de db/init.sql:
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE dim_pokemon (id INTEGER PRIMARY KEY, name TEXT, height INTEGER, weight INTEGER)"))
+        conn.execute(text("CREATE TABLE dim_type (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("CREATE TABLE pokemon_types (pokemon_id INTEGER, type_id INTEGER, slot INTEGER)"))
+        conn.execute(text("""CREATE TABLE fact_stats (pokemon_id INTEGER, hp INTEGER, attack INTEGER, defense INTEGER,
+            special_attack INTEGER, special_defense INTEGER, speed INTEGER)"""))
+        conn.execute(text("INSERT INTO dim_pokemon VALUES (1, 'bulbasaur', 7, 69), (4, 'charmander', 6, 85), (25, 'pikachu', 4, 60)"))
+        conn.execute(text("INSERT INTO dim_type VALUES (1, 'grass'), (2, 'poison'), (3, 'fire'), (4, 'electric')"))
+        conn.execute(text("INSERT INTO pokemon_types VALUES (1, 1, 1), (1, 2, 2), (4, 3, 1), (25, 4, 1)"))
+        conn.execute(text("""INSERT INTO fact_stats VALUES (1, 45, 49, 49, 65, 65, 45), (4, 39, 52, 43, 60, 50, 65),
+            (25, 35, 55, 40, 50, 50, 90)"""))
+    with Session(engine) as session:
+        yield PokemonRepository(session)
+
+def test_projection_returns_only_requested_fields(repository):
+    result = QueryService(repository).query(PokemonQuery(fields=["name", "stats.speed"], ids=[25]))
+    assert result == [{"name": "pikachu", "stats": {"speed": 90}}]
+
+def test_types_are_batched_in_a_single_query(repository, mocker):
+    spy = mocker.spy(repository, "get_types_for_ids")
+    result = QueryService(repository).query(PokemonQuery(fields=["name", "types"]))
+    assert [r["types"] for r in result] == [["grass", "poison"], ["fire"], ["electric"]]
+    assert spy.call_count == 1
+
+def test_rank_follows_order_by(repository):
+    result = QueryService(repository).query(PokemonQuery(fields=["rank", "name"], order_by="speed", limit=2))
+    assert result == [{"rank": 1, "name": "pikachu"}, {"rank": 2, "name": "charmander"}]
+
+def test_filters_by_type_and_names(repository):
+    service = QueryService(repository)
+    assert service.query(PokemonQuery(fields=["name"], type="fire")) == [{"name": "charmander"}]
+    assert service.query(PokemonQuery(fields=["id"], names=["Pikachu", "bulbasaur"])) == [{"id": 1}, {"id": 25}]
+
+def test_empty_filters_match_nothing(repository):
+    service = QueryService(repository)
+    assert service.query(PokemonQuery(fields=["name"], names=[])) == []
+    assert service.query(PokemonQuery(fields=["name"], ids=[], type="fire")) == []
+
+def test_loader_batches_repeated_keys_once():
+    calls = []
+    loader = DataLoader(lambda keys: calls.append(keys) or {k: k * 2 for k in keys})
+    deferred = loader.load_many([3, 1, 3, 2, 1])
+    assert [d.get() for d in deferred] == [6, 2, 6, 4, 2]
+    assert calls == [[3, 1, 2]]
+
+def test_invalid_fields_are_rejected(repository):
+    with pytest.raises(ValueError):
+        QueryService(repository).query(PokemonQuery(fields=["name", "password"]))
+    with pytest.raises(ValueError):
+        QueryService(repository).query(PokemonQuery(fields=["rank"]))
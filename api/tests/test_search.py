@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from api.main import app, get_pokemon_service, get_search_service
+from api.services.search import MAX_FUZZY_CANDIDATES, NameIndex, SearchService, bounded_levenshtein, _name_index_cache
+
+NAMES = ["pikachu", "raichu", "pichu", "charmander", "charmeleon", "charizard", "garchomp", "gabite"]
+
+@pytest.fixture
+def index():
+    return NameIndex(NAMES)
+
+@pytest.fixture
+def search(index, mocker):
+    mocker.patch.object(_name_index_cache, "get", return_value=index)
+    return SearchService(MagicMock())
+
+def test_bounded_levenshtein():
+    assert bounded_levenshtein("pikachu", "pikachu", 2) == 0
+    assert bounded_levenshtein("pikchu", "pikachu", 2) == 1
+    assert bounded_levenshtein("charmander", "pikachu", 2) is None
+
+def test_prefix(index):
+    assert index.prefix("char") == ["charizard", "charmander", "charmeleon"]
+    assert index.prefix("zz") == []
+
+def test_fuzzy_ranks_by_distance(index):
+    assert index.fuzzy("garchmp")[0] == ("garchomp", 1)
+    assert index.fuzzy("xyzxyz") == []
+
+def test_suggest_combines_prefix_and_fuzzy(index):
+    assert index.suggest("pika", limit=3)[0] == "pikachu"
+    assert "charizard" in index.suggest("charizrd")
+
+def test_fuzzy_work_is_bounded_by_candidate_cap(mocker):
+    # Muitos nomes com trigramas em comum: a distância de edição só roda nos melhores candidatos.
+    big = NameIndex(NAMES + [f"pix{i:05d}" for i in range(20_000)])
+    distance = mocker.patch("api.services.search.bounded_levenshtein", wraps=bounded_levenshtein)
+
+    assert big.suggest("pikahcu", limit=5)[0] == "pikachu"
+    assert 0 < distance.call_count <= MAX_FUZZY_CANDIDATES
+
+def test_suggest_route_and_did_you_mean(search):
+    pokemon_service = MagicMock()
+    pokemon_service.get_pokemon_details.return_value = None
+    app.dependency_overrides[get_pokemon_service] = lambda: pokemon_service
+    app.dependency_overrides[get_search_service] = lambda: search
+    try:
+        client = TestClient(app)
+        response = client.get("/v1/pokemons/suggest", params={"q": "char"})
+        assert response.status_code == 200
+        assert response.json()[0] == "charizard"
+
+        response = client.get("/v1/pokemons/pikachuu")
+        assert response.status_code == 404
+        assert response.json()["suggestions"][0] == "pikachu"
+    finally:
+        app.dependency_overrides.clear()
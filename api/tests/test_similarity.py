@@ -0,0 +1,71 @@
+import time
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from api.services.similarity import SimilarityIndex, SimilarityService, _similarity_cache
+from api.services.indexes import UnknownPokemonError
+
+NAMES = ["pikachu", "raichu", "onix", "steelix", "chansey"]
+STATS = np.array([
+    [35, 55, 40, 50, 50, 90],
+    [60, 90, 55, 90, 80, 110],
+    [35, 45, 160, 30, 45, 70],
+    [75, 85, 200, 55, 65, 30],
+    [250, 5, 5, 35, 105, 50],
+], dtype=np.float32)
+
+@pytest.fixture
+def index():
+    return SimilarityIndex(NAMES, STATS)
+
+def _brute_force(index, row, metric):
+    if metric == "cosine":
+        scores = -(index.unit @ index.unit[row])
+    else:
+        scores = np.linalg.norm(index.vectors - index.vectors[row], axis=1)
+    scores[row] = np.inf
+    return list(np.argsort(scores, kind="stable"))
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+def test_top_k_matches_brute_force(index, metric):
+    for row in range(len(NAMES)):
+        neighbors, _ = index.top_k(np.array([row]), 3, metric)
+        assert list(neighbors[0]) == _brute_force(index, row, metric)[:3]
+
+def test_top_k_never_returns_self_and_caps_k(index):
+    neighbors, values = index.top_k(np.arange(len(NAMES)), 50)
+    assert neighbors.shape == (len(NAMES), len(NAMES) - 1)
+    assert all(row not in neighbors[row] for row in range(len(NAMES)))
+
+def test_service_returns_ranked_neighbors(index, mocker):
+    mocker.patch.object(_similarity_cache, "get", return_value=index)
+    result = SimilarityService(MagicMock()).find_similar("Steelix", k=1)
+    assert result[0].rank == 1
+    assert result[0].name == "onix"
+
+    with pytest.raises(UnknownPokemonError):
+        SimilarityService(MagicMock()).find_similar("missingno")
+
+def test_service_serves_cosine_neighbors_from_precomputed_table(index, mocker):
+    cache = mocker.patch.object(_similarity_cache, "get", return_value=index)
+    repository = MagicMock()
+    repository.get_neighbors.return_value = [(1, "onix", 0.91), (2, "pikachu", 0.12)]
+
+    result = SimilarityService(repository).find_similar("Steelix", k=2)
+    assert [(r.rank, r.name) for r in result] == [(1, "onix"), (2, "pikachu")]
+    cache.assert_not_called()
+
+    # Menos vizinhos gravados que o pedido (ou métrica euclidiana): calcula no índice.
+    assert len(SimilarityService(repository).find_similar("Steelix", k=3)) == 3
+    SimilarityService(repository).find_similar("Steelix", k=1, metric="euclidean")
+    assert cache.call_count == 2
+
+def test_query_latency_is_sub_millisecond():
+    rng = np.random.default_rng(0)
+    big = SimilarityIndex([f"p{i}" for i in range(20_000)], rng.integers(1, 255, size=(20_000, 6)))
+    big.top_k(np.array([0]), 10)
+
+    start = time.perf_counter()
+    for row in range(100):
+        big.top_k(np.array([row]), 10)
+    assert (time.perf_counter() - start) / 100 < 0.005
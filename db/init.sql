@@ -30,3 +30,67 @@ CREATE TABLE IF NOT EXISTS fact_stats (
     speed INTEGER CHECK (speed >= 0),
     CONSTRAINT unique_pokemon_stats UNIQUE (pokemon_id)
 );
+
+-- Vizinhos mais próximos por atributos base (pré-calculados pelo ETL):
+CREATE TABLE IF NOT EXISTS pokemon_neighbors (
+    pokemon_id INTEGER REFERENCES dim_pokemon(id),
+    rank INTEGER CHECK (rank > 0),
+    neighbor_id INTEGER REFERENCES dim_pokemon(id),
+    score REAL NOT NULL,
+    PRIMARY KEY (pokemon_id, rank)
+);
+
+-- Espécies e cadeias de evolução (cada espécie evolui de no máximo uma outra):
+CREATE TABLE IF NOT EXISTS dim_species (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR(255) UNIQUE NOT NULL,
+    generation VARCHAR(50),
+    is_legendary BOOLEAN,
+    is_mythical BOOLEAN,
+    capture_rate INTEGER CHECK (capture_rate BETWEEN 0 AND 255),
+    evolution_chain_id INTEGER,
+    -- A pré-evolução pode ter ID maior (ex.: pichu -> pikachu); a FK só é verificada no commit:
+    evolves_from_id INTEGER REFERENCES dim_species(id) DEFERRABLE INITIALLY DEFERRED,
+    evolution_trigger VARCHAR(50),
+    min_level INTEGER,
+    evolution_item VARCHAR(100)
+);
+
+CREATE INDEX IF NOT EXISTS idx_species_evolution_chain ON dim_species (evolution_chain_id);
+
+ALTER TABLE dim_pokemon ADD COLUMN IF NOT EXISTS species_id INTEGER REFERENCES dim_species(id);
+
+CREATE TABLE IF NOT EXISTS dim_ability (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR(255) UNIQUE NOT NULL,
+    short_effect TEXT
+);
+
+CREATE TABLE IF NOT EXISTS pokemon_abilities (
+    pokemon_id INTEGER REFERENCES dim_pokemon(id),
+    ability_id INTEGER REFERENCES dim_ability(id),
+    slot INTEGER CHECK (slot IN (1, 2, 3)),
+    is_hidden BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (pokemon_id, slot)
+);
+
+CREATE TABLE IF NOT EXISTS dim_move (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR(255) UNIQUE NOT NULL,
+    type_name VARCHAR(50),
+    power INTEGER CHECK (power >= 0),
+    accuracy INTEGER CHECK (accuracy BETWEEN 0 AND 100),
+    pp INTEGER CHECK (pp >= 0),
+    damage_class VARCHAR(20)
+);
+
+CREATE TABLE IF NOT EXISTS pokemon_moves (
+    pokemon_id INTEGER REFERENCES dim_pokemon(id),
+    move_id INTEGER REFERENCES dim_move(id),
+    learn_method VARCHAR(50),
+    level INTEGER CHECK (level >= 0),
+    PRIMARY KEY (pokemon_id, move_id)
+);
+
+-- "Quem aprende este movimento?" percorre o vínculo pelo lado do movimento:
+CREATE INDEX IF NOT EXISTS idx_pokemon_moves_move ON pokemon_moves (move_id);
@@ -0,0 +1,102 @@
+# Importar do módulo compartilhado:
+import os
+import re
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Diretório dos checkpoints de extração (um arquivo por execução):
+ETL_CHECKPOINT_DIR = os.getenv("ETL_CHECKPOINT_DIR", os.path.join("data", "checkpoints"))
+
+class CheckpointStore:
+    """
+    Checkpoint da extração: as respostas brutas de detalhe da PokeAPI, por ID do Pokémon, em um
+    arquivo JSONL só de acréscimo. Cada resposta é gravada assim que chega (flush, sem fsync: sobrevive
+    à morte do processo, não à do sistema operacional), então uma extração interrompida perde no
+    máximo as requisições em andamento; ao reabrir o mesmo arquivo, os IDs já presentes não são
+    buscados de novo.
+
+    O arquivo é identificado pela execução (run_id): uma retentativa da mesma execução do Airflow
+    retoma de onde parou; uma execução nova começa do zero.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Apenas o índice fica em memória (ID -> posição no arquivo): respostas reais da PokeAPI
+        # têm centenas de KB cada.
+        self.offsets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    @classmethod
+    def for_run(cls, run_id: str, directory: Optional[str] = None) -> "CheckpointStore":
+        # run_ids do Airflow têm ':' e '+' (ex.: scheduled__2026-01-01T00:00:00+00:00):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", run_id)
+        return cls(os.path.join(directory or ETL_CHECKPOINT_DIR, f"{safe}.jsonl"))
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    self.offsets[json.loads(line)["id"]] = offset
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+                    # Última linha truncada por uma interrupção no meio da escrita:
+                    logger.warning(f"Linha inválida ignorada no checkpoint {self.path}.")
+                offset += len(line)
+        if self.offsets:
+            logger.info(f"Checkpoint {self.path}: {len(self.offsets)} Pokémons já extraídos.")
+
+    def __contains__(self, pokemon_id: int) -> bool:
+        return pokemon_id in self.offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get(self, pokemon_id: int) -> Optional[Dict[str, Any]]:
+        offset = self.offsets.get(pokemon_id)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def put(self, payload: Dict[str, Any]) -> None:
+        line = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "ab")
+                if self._file.tell() and not self._ends_with_newline():
+                    # Isola a linha truncada para que a próxima gravação comece em uma linha nova:
+                    self._file.write(b"\n")
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self.offsets[payload["id"]] = offset
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self) -> None:
+        """
+        Remove o checkpoint (após uma execução concluída).
+        """
+        self.close()
+        self.offsets.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
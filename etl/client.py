@@ -0,0 +1,290 @@
+# Importar do módulo compartilhado:
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import requests
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# Configuração do cliente da PokeAPI:
+POKEAPI_RATE = float(os.getenv("POKEAPI_RATE", 20))              # requisições/s iniciais
+POKEAPI_MAX_RATE = float(os.getenv("POKEAPI_MAX_RATE", 200))     # teto da taxa adaptativa
+POKEAPI_CONCURRENCY = int(os.getenv("POKEAPI_CONCURRENCY", 8))
+POKEAPI_MAX_RETRIES = int(os.getenv("POKEAPI_MAX_RETRIES", 5))
+POKEAPI_TIMEOUT = float(os.getenv("POKEAPI_TIMEOUT", 10))
+
+meter = metrics.get_meter(__name__)
+counter_requests = meter.create_counter("pokemon.extract.requests", description="PokeAPI requests by outcome")
+counter_dead_letters = meter.create_counter("pokemon.extract.dead_letters", description="Resources given up after all retries")
+
+class CircuitOpenError(Exception):
+    """O circuito está aberto: o upstream falhou demais e as chamadas são recusadas sem tentar."""
+
+class PermanentError(Exception):
+    """Resposta que não melhora com retentativas (ex.: 404)."""
+
+class TokenBucket:
+    """
+    Balde de fichas com taxa adaptativa (AIMD):
+    - partida lenta: até o primeiro 429, cada sucesso soma 1 req/s e a taxa dobra a cada segundo;
+    - depois, cada sucesso soma 'increase' req/s; como há ~taxa sucessos por segundo, a taxa cresce
+      ~increase·100% por segundo (10%/s com 0.1) até o limite do upstream ou max_rate;
+    - um 429 corta a taxa pela metade e pausa o balde pelo Retry-After informado.
+    """
+
+    def __init__(
+        self,
+        rate: float = POKEAPI_RATE,
+        max_rate: float = POKEAPI_MAX_RATE,
+        min_rate: float = 1.0,
+        increase: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = 1.0
+        self._updated = clock()
+        self._paused_until = 0.0
+        self.slow_start = True
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    # Rajada máxima de 1s de fichas na taxa atual:
+                    self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + (1.0 if self.slow_start else self.increase))
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.slow_start = False
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            if retry_after:
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+
+class CircuitBreaker:
+    """
+    Abre após failure_threshold falhas consecutivas e recusa chamadas por reset_timeout segundos;
+    depois deixa passar uma chamada de teste (meio-aberto): sucesso fecha o circuito, falha reabre.
+    """
+
+    def __init__(self, failure_threshold: int = 10, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if self._clock() - self.opened_at >= self.reset_timeout else "open"
+
+    def remaining(self) -> float:
+        """
+        Segundos até o circuito aberto aceitar a chamada de teste (0 se não estiver aberto).
+        """
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self.opened_at))
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._probing:
+                    logger.warning(f"Circuito da PokeAPI aberto após {self.failures} falhas consecutivas.")
+                self.opened_at = self._clock()
+                self._probing = False
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After em segundos ou como data HTTP.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+class PokeAPIClient:
+    """
+    Cliente HTTP resiliente para a PokeAPI.
+
+    - Taxa: TokenBucket adaptativo, que sobe até o primeiro 429 e respeita o Retry-After.
+    - Retentativas: erros de rede, 5xx e 429, com backoff exponencial e jitter completo.
+    - Circuit breaker: com o upstream fora do ar, falha rápido em vez de martelar.
+    - Dead letters: recursos que esgotaram as tentativas são guardados e retentados ao fim de
+      fetch_many; o que ainda falhar fica em dead_letters, em vez de sumir silenciosamente.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = POKEAPI_CONCURRENCY,
+        max_retries: int = POKEAPI_MAX_RETRIES,
+        timeout: float = POKEAPI_TIMEOUT,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        bucket: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.dead_letters: List[Tuple[str, str]] = []
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "failures": 0}
+        self._sleep = sleep
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        # requests.Session não é seguro entre threads: uma por thread, com pool de conexões próprio.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _count(self, key: str, outcome: Optional[str] = None) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+        if outcome:
+            counter_requests.add(1, {"outcome": outcome})
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get_json(self, url: str) -> Any:
+        """
+        GET com limite de taxa, retentativas e circuit breaker.
+
+        Raises:
+            CircuitOpenError: O circuito está aberto.
+            PermanentError: Resposta 4xx (exceto 429), que não é retentada.
+            requests.RequestException: Falha após max_retries retentativas.
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuito aberto; {url} não foi requisitada.")
+            self.bucket.acquire()
+            self._count("requests")
+            try:
+                response = self._session().get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                error: Exception = e
+                self.breaker.record_failure()
+                self._count("failures", "network_error")
+            else:
+                if response.status_code == 429:
+                    # Limite de taxa não é falha do upstream: não conta para o circuito.
+                    self.bucket.on_throttle(_retry_after(response.headers.get("Retry-After")))
+                    self._count("throttled", "throttled")
+                    error = requests.HTTPError(f"429 Too Many Requests for url: {url}", response=response)
+                elif response.status_code >= 500:
+                    self.breaker.record_failure()
+                    self._count("failures", "server_error")
+                    error = requests.HTTPError(f"{response.status_code} Server Error for url: {url}", response=response)
+                elif response.status_code >= 400:
+                    # O upstream respondeu: o circuito segue saudável.
+                    self.breaker.record_success()
+                    counter_requests.add(1, {"outcome": "client_error"})
+                    raise PermanentError(f"{response.status_code} Client Error for url: {url}")
+                else:
+                    self.breaker.record_success()
+                    self.bucket.on_success()
+                    counter_requests.add(1, {"outcome": "ok"})
+                    return response.json()
+
+            if attempt >= self.max_retries:
+                raise error
+            if not (isinstance(error, requests.HTTPError) and error.response.status_code == 429):
+                # Após um 429 o balde já está pausado pelo Retry-After.
+                self._sleep(self.backoff(attempt))
+            attempt += 1
+            self._count("retries")
+
+    def fetch_many(self, urls: Iterable[str], parse: Callable[[Any], Any] = lambda data: data) -> List[Any]:
+        """
+        Busca as URLs em paralelo (concurrency threads) e retorna parse(json) dos sucessos, na ordem
+        de entrada. As falhas vão para a fila de dead letters e são retentadas uma vez ao fim, em
+        série; as que persistirem ficam em self.dead_letters como (url, erro).
+        """
+        urls = list(urls)
+        results: Dict[str, Any] = {}
+        failed: List[Tuple[str, str]] = []
+
+        def fetch(url: str) -> None:
+            try:
+                results[url] = parse(self.get_json(url))
+            except Exception as e:
+                failed.append((url, str(e)))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency), thread_name_prefix="pokeapi") as pool:
+            list(pool.map(fetch, urls))
+
+        if failed:
+            logger.warning(f"{len(failed)} recursos falharam; retentando ao fim da extração...")
+            # Dá ao upstream o tempo de recuperação antes da última rodada:
+            self._sleep(self.breaker.remaining())
+            retry, failed = failed, []
+            for url, _ in retry:
+                fetch(url)
+
+        for url, error in failed:
+            logger.error(f"Desistindo de {url}: {error}")
+        counter_dead_letters.add(len(failed))
+        self.dead_letters.extend(failed)
+        return [results[url] for url in urls if url in results]
@@ -1,5 +1,4 @@
 # Importar do módulo compartilhado:
-import requests
 import logging
 from typing import List, Dict, Any, Optional
 import sys
@@ -9,10 +8,14 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from api.schemas import PokemonDetail, PokemonStats
+from etl.checkpoint import CheckpointStore
+from etl.client import PokeAPIClient
+from etl.related import RelatedResources
 
 logger = logging.getLogger(__name__)
 
-POKEAPI_URL = "https://pokeapi.co/api/v2/pokemon"
+# Sobrescrevível para apontar para um stub local (etl/stub_pokeapi.py) em testes e benchmarks:
+POKEAPI_URL = os.getenv("POKEAPI_URL", "https://pokeapi.co/api/v2/pokemon")
 
 def _map_stats(stats_data: List[Dict[str, Any]]) -> PokemonStats:
     """Função auxiliar para mapear estatísticas da PokeAPI para o modelo PokemonStats."""
@@ -26,64 +29,100 @@ def _map_stats(stats_data: List[Dict[str, Any]]) -> PokemonStats:
     # se houver (special-attack -> special_attack é tratado por substituição):
     return PokemonStats(**stats_dict)
 
-def fetch_pokemon_data(limit: int = 100) -> List[PokemonDetail]:
+def _to_detail(raw_data: Dict[str, Any]) -> PokemonDetail:
+    """Mapeia a resposta de detalhe da PokeAPI para o modelo PokemonDetail."""
+    return PokemonDetail(
+        id=raw_data['id'],
+        name=raw_data['name'],
+        height=raw_data['height'],
+        weight=raw_data['weight'],
+        # Tipos de extrato:
+        types=[t['type']['name'] for t in raw_data.get('types', [])],
+        stats=_map_stats(raw_data.get('stats', []))
+    )
+
+def _pokemon_id(url: str) -> Optional[int]:
+    # Ex.: https://pokeapi.co/api/v2/pokemon/25/ -> 25
+    try:
+        return int(url.rstrip("/").rsplit("/", 1)[-1])
+    except ValueError:
+        return None
+
+def fetch_pokemon_data(
+    limit: int = 100,
+    base_url: Optional[str] = None,
+    client: Optional[PokeAPIClient] = None,
+    checkpoint: Optional[CheckpointStore] = None,
+    related: Optional[RelatedResources] = None
+) -> List[PokemonDetail]:
     """
     Obtém dados de Pokémon da PokeAPI e retorna modelos Pydantic estruturados.
     Esta ferramenta é útil para recuperar detalhes sobre Pokémon,
     para preencher um banco de dados ou responder a perguntas.
 
+    Os detalhes são buscados em paralelo pelo PokeAPIClient (limite de taxa adaptativo, retentativas
+    com backoff e circuit breaker). Os IDs que falharem mesmo assim ficam em client.dead_letters.
+
     Args:
         limit: O número de Pokémon a serem buscados. O padrão é 100.
+        base_url: Endpoint de listagem de Pokémon; o padrão é POKEAPI_URL.
+        client: Cliente HTTP a usar; o padrão é um PokeAPIClient configurado pelo ambiente.
+        checkpoint: Se informado, cada resposta é gravada assim que chega e os IDs já gravados
+            não são buscados de novo (retomada após uma interrupção).
+        related: Se informado, recebe as referências (habilidades, movimentos, espécie) de cada
+            Pokémon; busque-as depois com related.fetch(client).
     
     Returns:
         Uma lista de objetos PokemonDetail contendo estatísticas e informações básicas.
     """
-    results: List[PokemonDetail] = []
-    url: str = f"{POKEAPI_URL}?limit={limit}"
+    client = client or PokeAPIClient()
+    url: str = f"{base_url or POKEAPI_URL}?limit={limit}"
     
     logger.info(f"Buscando {limit} pokémons da PokeAPI...")
     
     try:
         # Primeiro, obtenha a lista de Pokémon:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        pokemon_list = data.get("results", [])
-
-        # Agora, busque os detalhes de cada Pokémon.
-        # Usando uma sessão para o agrupamento de conexões.
-        with requests.Session() as session:
-            for item in pokemon_list:
-                details_url = item["url"]
-                try:
-                    r = session.get(details_url, timeout=10)
-                    r.raise_for_status()
-                    raw_data = r.json()
-                    
-                    # Mapear dados brutos para o modelo Pydantic:
-                    stats = _map_stats(raw_data.get('stats', []))
-                    
-                    # Tipos de extrato:
-                    types = [t['type']['name'] for t in raw_data.get('types', [])]
-                    
-                    pokemon = PokemonDetail(
-                        id=raw_data['id'],
-                        name=raw_data['name'],
-                        height=raw_data['height'],
-                        weight=raw_data['weight'],
-                        types=types,
-                        stats=stats
-                    )
-                    
-                    results.append(pokemon)
-                    logger.info(f"Processado {item['name']}")
-                except Exception as e:
-                    logger.error(f"Falha ao buscar/processar {item['name']}: {e}")
-
+        pokemon_list = client.get_json(url).get("results", [])
     except Exception as e:
         logger.error(f"Erro fatal ao buscar lista: {e}")
         return []
 
+    done: Dict[int, PokemonDetail] = {}
+    pending: List[str] = []
+    for item in pokemon_list:
+        pokemon_id = _pokemon_id(item["url"])
+        if checkpoint is not None and pokemon_id in checkpoint:
+            raw_data = checkpoint.get(pokemon_id)
+            done[pokemon_id] = _to_detail(raw_data)
+            if related is not None:
+                related.add_pokemon(raw_data)
+        else:
+            pending.append(item["url"])
+    if done:
+        logger.info(f"Retomando do checkpoint: {len(done)} Pokémons já extraídos, {len(pending)} pendentes.")
+
+    def keep(raw_data: Dict[str, Any]) -> PokemonDetail:
+        # Converte antes de gravar: uma resposta inválida não entra no checkpoint.
+        detail = _to_detail(raw_data)
+        if checkpoint is not None:
+            checkpoint.put(raw_data)
+        if related is not None:
+            related.add_pokemon(raw_data)
+        return detail
+
+    # Agora, busque os detalhes de cada Pokémon pendente:
+    fetched = {d.id: d for d in client.fetch_many(pending, keep)}
+    if client.dead_letters:
+        logger.error(f"{len(client.dead_letters)} Pokémons não puderam ser buscados; veja client.dead_letters.")
+
+    # Ordem da listagem, juntando o que veio do checkpoint e o que acabou de chegar:
+    results = []
+    for item in pokemon_list:
+        pokemon_id = _pokemon_id(item["url"])
+        detail = done.get(pokemon_id) or fetched.get(pokemon_id)
+        if detail is not None:
+            results.append(detail)
+    logger.info(f"{len(results)} de {len(pokemon_list)} Pokémons buscados.")
     return results
 
 if __name__ == "__main__":
@@ -2,19 +2,25 @@
 import os
 import pandas as pd
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.engine import Engine
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+
+# Garantir que possamos importar da API:
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.services.similarity import SimilarityIndex, STAT_COLUMNS
 
 logger = logging.getLogger(__name__)
 
-def get_db_engine() -> Engine:
-    """Cria um mecanismo SQLAlchemy específico."""
+def get_db_engine(database: Optional[str] = None) -> Engine:
+    """Cria um mecanismo SQLAlchemy específico (banco de POSTGRES_DB, salvo se 'database' for informado)."""
     user = os.getenv("POSTGRES_USER", "postgres")
     password = os.getenv("POSTGRES_PASSWORD", "postgres")
     host = os.getenv("POSTGRES_HOST", "localhost")
     port = os.getenv("POSTGRES_PORT", "5432")
-    db = os.getenv("POSTGRES_DB", "pokedex")
+    db = database or os.getenv("POSTGRES_DB", "pokedex")
     
     url = f"postgresql://{user}:{password}@{host}:{port}/{db}"
     return create_engine(url)
@@ -105,3 +111,139 @@ def load_data(
             conn.execute(stmt, row.to_dict())
             
     logger.info("Carregamento do ETL concluído com sucesso.")
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # Tipos nativos do Python e NULL no lugar de NaN/NA (o psycopg2 não adapta tipos do numpy):
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+def load_related(frames: Dict[str, pd.DataFrame]) -> None:
+    """
+    Carrega espécies, habilidades, movimentos e seus vínculos (saída de transform.transform_related)
+    em uma única transação. Requer os Pokémons já carregados por load_data.
+
+    Os vínculos de cada Pokémon presente no lote são substituídos (um movimento que deixou de ser
+    aprendido some); dimensões usam upsert. Campos que só os detalhes da espécie trazem não são
+    apagados por espécies conhecidas apenas pela cadeia de evolução.
+    """
+    engine = get_db_engine()
+    logger.info("Carregando recursos relacionados em PostgreSQL...")
+
+    with engine.begin() as conn:
+        species = _records(frames["dim_species"])
+        if species:
+            logger.info(f"Atualizando o dim_species ({len(species)} espécies)...")
+            conn.execute(
+                text("""
+                    INSERT INTO dim_species (
+                        id, name, generation, is_legendary, is_mythical, capture_rate, evolution_chain_id,
+                        evolves_from_id, evolution_trigger, min_level, evolution_item
+                    )
+                    VALUES (
+                        :id, :name, :generation, :is_legendary, :is_mythical, :capture_rate, :evolution_chain_id,
+                        :evolves_from_id, :evolution_trigger, :min_level, :evolution_item
+                    )
+                    ON CONFLICT (id) DO UPDATE SET
+                        name = EXCLUDED.name,
+                        generation = COALESCE(EXCLUDED.generation, dim_species.generation),
+                        is_legendary = COALESCE(EXCLUDED.is_legendary, dim_species.is_legendary),
+                        is_mythical = COALESCE(EXCLUDED.is_mythical, dim_species.is_mythical),
+                        capture_rate = COALESCE(EXCLUDED.capture_rate, dim_species.capture_rate),
+                        evolution_chain_id = COALESCE(EXCLUDED.evolution_chain_id, dim_species.evolution_chain_id),
+                        evolves_from_id = EXCLUDED.evolves_from_id,
+                        evolution_trigger = EXCLUDED.evolution_trigger,
+                        min_level = EXCLUDED.min_level,
+                        evolution_item = EXCLUDED.evolution_item;
+                """),
+                species
+            )
+
+        pokemon_species = _records(frames["pokemon_species"])
+        if pokemon_species:
+            conn.execute(text("UPDATE dim_pokemon SET species_id = :species_id WHERE id = :pokemon_id"), pokemon_species)
+
+        for table, columns in (
+            ("dim_ability", ("id", "name", "short_effect")),
+            ("dim_move", ("id", "name", "type_name", "power", "accuracy", "pp", "damage_class")),
+        ):
+            rows = _records(frames[table])
+            if not rows:
+                continue
+            logger.info(f"Atualizando o {table} ({len(rows)} linhas)...")
+            updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != "id")
+            conn.execute(
+                text(f"""
+                    INSERT INTO {table} ({', '.join(columns)})
+                    VALUES ({', '.join(':' + c for c in columns)})
+                    ON CONFLICT (id) DO UPDATE SET {updates};
+                """),
+                rows
+            )
+
+        for table, columns in (
+            ("pokemon_abilities", ("pokemon_id", "ability_id", "slot", "is_hidden")),
+            ("pokemon_moves", ("pokemon_id", "move_id", "learn_method", "level")),
+        ):
+            rows = _records(frames[table])
+            if not rows:
+                continue
+            logger.info(f"Atualizando o {table} ({len(rows)} vínculos)...")
+            conn.execute(
+                text(f"DELETE FROM {table} WHERE pokemon_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": sorted({row["pokemon_id"] for row in rows})}
+            )
+            conn.execute(
+                text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+                rows
+            )
+
+    logger.info("Carga dos recursos relacionados concluída com sucesso.")
+
+def refresh_neighbors(k: int = 10) -> int:
+    """
+    Recalcula a tabela pokemon_neighbors a partir de todos os atributos já carregados.
+    O cálculo considera o banco inteiro (e não apenas o lote atual) e a tabela é
+    reescrita em uma única transação, um lote de all_top_k por vez (a memória não cresce
+    com N·k). Com k <= 0 a tabela é apenas esvaziada: a API serve os vizinhos dela e não
+    pode ler vizinhos de uma carga anterior. A tabela guarda apenas a métrica cosseno,
+    que é a que SimilarityService.find_similar serve a partir dela.
+
+    Returns:
+        O número de linhas de vizinhos gravadas.
+    """
+    engine = get_db_engine()
+    insert = text("""
+        INSERT INTO pokemon_neighbors (pokemon_id, rank, neighbor_id, score)
+        VALUES (:pokemon_id, :rank, :neighbor_id, :score)
+    """)
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM pokemon_neighbors"))
+        if k <= 0:
+            logger.info("Vizinhos desativados; pokemon_neighbors esvaziada.")
+            return 0
+
+        logger.info(f"Recalculando os {k} vizinhos mais próximos (cosseno)...")
+        df_stats = pd.read_sql(
+            text(f"SELECT pokemon_id, {', '.join(STAT_COLUMNS)} FROM fact_stats ORDER BY pokemon_id"),
+            conn
+        )
+        if df_stats.empty:
+            logger.warning("Nenhum atributo carregado; vizinhos não calculados.")
+            return 0
+
+        ids = df_stats["pokemon_id"].to_numpy()
+        index = SimilarityIndex([str(i) for i in ids], df_stats[list(STAT_COLUMNS)].to_numpy())
+
+        total = 0
+        for rows, neighbors, values in index.all_top_k(k, "cosine"):
+            records = [
+                {"pokemon_id": int(ids[row]), "rank": rank + 1, "neighbor_id": int(ids[n]), "score": float(v)}
+                for row, row_neighbors, row_values in zip(rows, neighbors, values)
+                for rank, (n, v) in enumerate(zip(row_neighbors, row_values))
+            ]
+            if records:
+                conn.execute(insert, records)
+                total += len(records)
+
+    logger.info(f"{total} vizinhos gravados em pokemon_neighbors.")
+    return total
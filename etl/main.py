@@ -1,17 +1,24 @@
 # Importar do módulo compartilhado:
 import sys
 import os
+import json
 import time
 import logging
+import cProfile
+import pstats
+from typing import Optional
 import typer
 from opentelemetry import trace, metrics
 
-# Garantir que possamos importar da API:
+# Garantir que possamos importar da API e do pacote etl (uma única cópia de cada módulo):
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import extract
-import transform
-import load
+from etl import extract, transform, load, synthetic
+from etl.checkpoint import CheckpointStore
+from etl.client import POKEAPI_CONCURRENCY, PokeAPIClient
+from etl.profiling import StageProfiler, compare_reports
+from etl.related import RelatedResources
+from etl.stub_pokeapi import StubPokeAPI
 from api.telemetry import configure_telemetry
 
 # Configurar registro:
@@ -34,38 +41,70 @@ meter = metrics.get_meter(__name__)
 counter_extracted = meter.create_counter("pokemon.extracted.total", description="Total records extracted")
 counter_transformed = meter.create_counter("pokemon.transformed.total", description="Total records transformed")
 counter_loaded = meter.create_counter("pokemon.loaded.total", description="Total records loaded")
+counter_related = meter.create_counter("pokemon.related.fetched", description="Unique related resources fetched (abilities, moves, species, evolution chains)")
 histogram_duration = meter.create_histogram("pokemon.pipeline.duration", description="Pipeline execution duration")
 
 @app.command()
-def run_pipeline(limit: int = typer.Option(151, help="Number of Pokemon to process")):
+def run_pipeline(
+    limit: int = typer.Option(151, help="Number of Pokemon to process"),
+    neighbors: int = typer.Option(10, help="Top-k neighbors to precompute after loading (0 disables)"),
+    run_id: Optional[str] = typer.Option(None, help="Checkpoint key; rerunning with the same id resumes the extraction (no checkpoint without it)"),
+    checkpoint: bool = typer.Option(True, "--checkpoint/--no-checkpoint", help="Checkpoint extracted payloads of --run-id to resume after a failure"),
+    related: bool = typer.Option(True, "--related/--no-related", help="Also extract abilities, moves, species and evolution chains"),
+):
     """
     Executa o pipeline ETL completo (Extrair -> Transformar -> Carregar).
+    Com checkpoint e um run_id explícito, uma execução interrompida retoma a extração ao ser repetida
+    com o mesmo run_id; o checkpoint é apagado quando o pipeline termina com sucesso. Sem run_id não há
+    checkpoint: uma chave derivada dos parâmetros faria uma execução dias depois retomar respostas antigas.
+    Com related, habilidades, movimentos, espécies e cadeias de evolução referenciados pelos
+    Pokémons são buscados uma vez cada e carregados depois deles.
     """
     with tracer.start_as_current_span("run_pipeline") as span:
         span.set_attribute("pipeline.limit", limit)
         logger.info(f"Initializing ETL Pipeline with limit={limit}...")
         start_time = time.time()
+        store = CheckpointStore.for_run(run_id) if checkpoint and run_id else None
+        resources = RelatedResources() if related else None
         
         try:
             # Extrai:
             with tracer.start_as_current_span("extract"):
-                raw_data = extract.fetch_pokemon_data(limit=limit)
+                client = PokeAPIClient()
+                raw_data = extract.fetch_pokemon_data(limit=limit, client=client, checkpoint=store, related=resources)
                 count_extracted = len(raw_data)
                 span.set_attribute("pipeline.extracted_count", count_extracted)
                 counter_extracted.add(count_extracted)
 
+            if resources is not None:
+                with tracer.start_as_current_span("extract_related") as related_span:
+                    resources.fetch(client)
+                    related_span.set_attribute("related.references", resources.stats["references"])
+                    related_span.set_attribute("related.unique", resources.stats["unique"])
+                    counter_related.add(resources.stats["fetched"])
+
             # Transforma:
             with tracer.start_as_current_span("transform"):
                 df_pokemon, df_dim_type, df_types_link, df_stats = transform.transform_data(raw_data)
                 count_transformed = len(df_pokemon)
                 span.set_attribute("pipeline.transformed_count", count_transformed)
                 counter_transformed.add(count_transformed)
+                related_frames = transform.transform_related(resources) if resources is not None else None
             
             # Carrega:
             with tracer.start_as_current_span("load"):
                 load.load_data(df_pokemon, df_dim_type, df_types_link, df_stats)
                 counter_loaded.add(count_transformed) # Supondo que todos os dados transformados estejam carregados.
+                if related_frames is not None:
+                    load.load_related(related_frames)
+
+            # Vizinhos pré-calculados (com 0, a tabela é esvaziada para não servir vizinhos antigos):
+            with tracer.start_as_current_span("neighbors"):
+                load.refresh_neighbors(k=neighbors)
             
+            if store is not None:
+                store.clear()
+
             duration = time.time() - start_time
             logger.info(f"ETL pipeline completed in {duration:.2f} seconds.")
             span.set_attribute("pipeline.duration", duration)
@@ -88,5 +127,149 @@ def extract_only(limit: int = 10, output_file: str = "extracted.json"):
         counter_extracted.add(count)
         logger.info(f"Extracted {count} records.")
 
+@app.command()
+def generate(
+    count: int = typer.Option(100000, help="Number of synthetic Pokemon"),
+    seed: int = typer.Option(42, help="Random seed (same seed, same data)"),
+    parquet: Optional[str] = typer.Option(None, help="Write the rows to this Parquet file"),
+    to_postgres: bool = typer.Option(False, "--to-postgres", help="Load the rows with COPY into --database"),
+    database: str = typer.Option("pokedex_bench", help="Target database of --to-postgres"),
+    truncate: bool = typer.Option(False, "--truncate", help="Empty the Pokemon tables before loading"),
+    dual_type_rate: float = typer.Option(0.5, help="Share of dual-type Pokemon"),
+    form_rate: float = typer.Option(0.05, help="Share of regional/special forms of earlier species"),
+):
+    """
+    Gera uma Dex sintética em qualquer escala para testes de carga e benchmarks.
+    """
+    if not parquet and not to_postgres:
+        raise typer.BadParameter("Informe --parquet e/ou --to-postgres.")
+
+    dex = synthetic.SyntheticDex(seed, dual_type_rate=dual_type_rate, form_rate=form_rate)
+    start_time = time.time()
+    with tracer.start_as_current_span("generate_synthetic") as span:
+        span.set_attribute("synthetic.count", count)
+        if parquet:
+            synthetic.write_parquet(dex.rows(count), parquet)
+        if to_postgres:
+            synthetic.copy_to_postgres(dex.rows(count), load.get_db_engine(database), truncate=truncate)
+    logger.info(f"{count} Pokémons sintéticos gerados em {time.time() - start_time:.2f} segundos.")
+
+@app.command()
+def benchmark(
+    scale: int = typer.Option(1000, help="Number of synthetic Pokemon served by the local stub PokeAPI"),
+    seed: int = typer.Option(42, help="Seed of the synthetic data"),
+    load_db: bool = typer.Option(True, "--load/--no-load", help="Run the load stage against Postgres"),
+    database: str = typer.Option("pokedex_bench", help="Database used by the load stage (keep it apart from the main one)"),
+    neighbors: int = typer.Option(0, help="Top-k neighbors to precompute after loading (0 disables)"),
+    latency_ms: float = typer.Option(0.0, help="Stub PokeAPI latency per response"),
+    jitter_ms: float = typer.Option(0.0, help="Stub PokeAPI latency jitter (uniform +/-)"),
+    error_rate: float = typer.Option(0.0, help="Share of stub PokeAPI responses that fail with 500"),
+    rate_limit: Optional[float] = typer.Option(None, help="Stub PokeAPI requests/s before answering 429"),
+    concurrency: int = typer.Option(POKEAPI_CONCURRENCY, help="Parallel detail requests of the extractor"),
+    related: bool = typer.Option(False, "--related/--no-related", help="Also extract, transform and load abilities, moves, species and evolution chains"),
+    profile_output: Optional[str] = typer.Option(None, help="Write cProfile stats of the run (.prof, e.g. for snakeviz)"),
+    output: str = typer.Option("etl_benchmark.json", help="JSON report path"),
+    baseline: Optional[str] = typer.Option(None, help="Previous JSON report to compare against"),
+):
+    """
+    Executa o pipeline contra um stub local da PokeAPI com dados sintéticos e mede cada etapa
+    (duração, linhas/s e pico de RSS). Para um flame graph, rode o mesmo comando sob o py-spy:
+    py-spy record -o etl.svg -- python etl/main.py benchmark --scale 10000
+    """
+    profiler = StageProfiler()
+    cprofile = cProfile.Profile() if profile_output else None
+    if cprofile:
+        cprofile.enable()
+
+    with profiler.stage("generate") as stage:
+        payloads = [synthetic.to_pokeapi(p, seed) for p in synthetic.iter_pokemon(scale, seed)]
+        resources = synthetic.related_payloads(payloads, seed) if related else None
+        stage["rows"] = len(payloads)
+
+    stub_options = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate, "rate_limit": rate_limit}
+    graph = RelatedResources() if related else None
+    with StubPokeAPI(payloads, seed=seed, resources=resources, **stub_options) as stub:
+        with profiler.stage("extract") as stage:
+            client = PokeAPIClient(concurrency=concurrency)
+            raw_data = extract.fetch_pokemon_data(limit=scale, base_url=stub.url, client=client, related=graph)
+            stage["rows"] = len(raw_data)
+        if graph is not None and raw_data:
+            with profiler.stage("extract_related") as stage:
+                graph.fetch(client)
+                stage["rows"] = graph.stats["fetched"]
+
+    if not raw_data:
+        # Sem linhas não há o que transformar; o relatório ainda registra o tráfego do upstream.
+        logger.error("Nenhum Pokémon extraído; etapas seguintes ignoradas.")
+        load_db = False
+    else:
+        with profiler.stage("transform") as stage:
+            frames = transform.build_frames(raw_data)
+            stage["rows"] = len(frames[0])
+
+        with profiler.stage("validate") as stage:
+            transform.validate_frames(*frames)
+            stage["rows"] = len(frames[0])
+
+        if graph is not None:
+            with profiler.stage("transform_related") as stage:
+                related_frames = transform.transform_related(graph)
+                stage["rows"] = sum(len(df) for df in related_frames.values())
+
+    if load_db:
+        # load.get_db_engine lê POSTGRES_DB a cada chamada:
+        previous_db = os.environ.get("POSTGRES_DB")
+        os.environ["POSTGRES_DB"] = database
+        try:
+            with profiler.stage("load") as stage:
+                load.load_data(*frames)
+                stage["rows"] = len(frames[0])
+            if graph is not None:
+                with profiler.stage("load_related") as stage:
+                    load.load_related(related_frames)
+                    stage["rows"] = sum(len(df) for df in related_frames.values())
+            if neighbors > 0:
+                with profiler.stage("neighbors") as stage:
+                    stage["rows"] = load.refresh_neighbors(k=neighbors)
+        finally:
+            if previous_db is None:
+                os.environ.pop("POSTGRES_DB", None)
+            else:
+                os.environ["POSTGRES_DB"] = previous_db
+
+    if cprofile:
+        cprofile.disable()
+        cprofile.dump_stats(profile_output)
+        pstats.Stats(cprofile).sort_stats("cumulative").print_stats(15)
+
+    report = profiler.report(
+        scale=scale, seed=seed, load=load_db, neighbors=neighbors, concurrency=concurrency, related=related, stub=stub_options
+    )
+    # Tráfego visto pelo upstream: retentativas, 429 e falhas aparecem aqui, não nas linhas extraídas.
+    report["upstream"] = dict(stub.stats)
+    report["client"] = {**client.stats, "final_rate": round(client.bucket.rate, 1), "dead_letters": len(client.dead_letters)}
+    if graph is not None:
+        # Referências x recursos únicos: a economia da deduplicação.
+        report["related"] = dict(graph.stats)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, stage in report["stages"].items():
+        rate = f"{stage['rows_per_sec']:.0f} linhas/s" if stage["rows_per_sec"] else "-"
+        logger.info(f"{name:<17} {stage['seconds']:>9.3f}s {rate:>18} RSS {stage['peak_rss_mb']}MB")
+    logger.info(f"Upstream: {report['upstream']}")
+    logger.info(f"Cliente: {report['client']}")
+    if graph is not None:
+        logger.info(f"Relacionados: {report['related']}")
+    logger.info(f"Total: {report['total_seconds']:.2f}s. Relatório em {output}.")
+
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as f:
+            for line in compare_reports(report, json.load(f)):
+                logger.info(line)
+
+    if not raw_data:
+        sys.exit(1)
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,83 @@
+# Importar do módulo compartilhado:
+import sys
+import time
+import platform
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Pico de memória residente do processo até agora, em MB (None se a plataforma não informa).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes:
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+class StageProfiler:
+    """
+    Mede as etapas do pipeline: duração, linhas processadas, linhas/s e pico de RSS ao fim da etapa.
+    O pico de RSS é do processo e nunca diminui: um salto entre etapas indica quem alocou a memória.
+
+        profiler = StageProfiler()
+        with profiler.stage("extract") as stage:
+            data = extract.fetch_pokemon_data(limit)
+            stage["rows"] = len(data)
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        stage: Dict[str, Any] = {"rows": None}
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            seconds = time.perf_counter() - start
+            rows = stage["rows"]
+            self.stages[name] = {
+                "seconds": round(seconds, 4),
+                "rows": rows,
+                "rows_per_sec": round(rows / seconds, 1) if rows and seconds else None,
+                "peak_rss_mb": peak_rss_mb(),
+            }
+
+    def report(self, **params: Any) -> Dict[str, Any]:
+        return {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+            },
+            "params": params,
+            "stages": self.stages,
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Linhas com a variação de duração e de pico de RSS de cada etapa em relação a outro relatório.
+    """
+    lines = []
+    for name, stage in report.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(name)
+        if not base:
+            lines.append(f"{name}: sem referência no baseline")
+            continue
+        change = (stage["seconds"] - base["seconds"]) / base["seconds"] * 100 if base["seconds"] else 0.0
+        line = f"{name}: {stage['seconds']:.3f}s (baseline {base['seconds']:.3f}s, {change:+.1f}%)"
+        if stage.get("peak_rss_mb") is not None and base.get("peak_rss_mb") is not None:
+            line += f", RSS {stage['peak_rss_mb']:.0f}MB (baseline {base['peak_rss_mb']:.0f}MB)"
+        lines.append(line)
+    return lines
@@ -0,0 +1,200 @@
+# Importar do módulo compartilhado:
+import re
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import sys
+import os
+
+# Garantir que possamos importar do projeto:
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from etl.client import PokeAPIClient
+
+logger = logging.getLogger(__name__)
+
+# Ex.: https://pokeapi.co/api/v2/move/33/ -> ("move", 33)
+_RESOURCE_URL = re.compile(r"/api/v2/([a-z-]+)/(\d+)/?$")
+
+def resource_key(url: str) -> Optional[Tuple[str, int]]:
+    match = _RESOURCE_URL.search(url or "")
+    return (match.group(1), int(match.group(2))) if match else None
+
+def _english(entries: Optional[List[Dict[str, Any]]], field: str) -> Optional[str]:
+    for entry in entries or []:
+        if (entry.get("language") or {}).get("name") == "en":
+            return entry.get(field)
+    return None
+
+def _name(ref: Optional[Dict[str, Any]]) -> Optional[str]:
+    return (ref or {}).get("name")
+
+# --- Compactação: só os campos carregados no banco ficam em memória ---
+# (respostas reais de movimentos e habilidades listam todos os Pokémons que os usam).
+def _ability(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": raw["id"], "name": raw["name"], "short_effect": _english(raw.get("effect_entries"), "short_effect")}
+
+def _move(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "type": _name(raw.get("type")),
+        "power": raw.get("power"),
+        "accuracy": raw.get("accuracy"),
+        "pp": raw.get("pp"),
+        "damage_class": _name(raw.get("damage_class")),
+    }
+
+def _species(raw: Dict[str, Any]) -> Dict[str, Any]:
+    chain = resource_key((raw.get("evolution_chain") or {}).get("url"))
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "generation": _name(raw.get("generation")),
+        "is_legendary": bool(raw.get("is_legendary")),
+        "is_mythical": bool(raw.get("is_mythical")),
+        "capture_rate": raw.get("capture_rate"),
+        "evolution_chain_id": chain[1] if chain else None,
+    }
+
+def _evolution_chain(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Achata a árvore da cadeia em elos (espécie, pré-evolução, como evolui). Cadeias ramificadas,
+    como a do Eevee, viram vários elos com a mesma pré-evolução.
+    """
+    links = []
+    stack = [(raw["chain"], None)]
+    while stack:
+        node, parent_id = stack.pop()
+        species_id = resource_key(node["species"]["url"])[1]
+        # Há espécies com mais de uma forma de evoluir; a primeira é a canônica.
+        details = (node.get("evolution_details") or [{}])[0]
+        links.append({
+            "species_id": species_id,
+            "name": node["species"]["name"],
+            "evolves_from_id": parent_id,
+            "trigger": _name(details.get("trigger")),
+            "min_level": details.get("min_level"),
+            "item": _name(details.get("item")),
+        })
+        stack.extend((child, species_id) for child in reversed(node.get("evolves_to") or []))
+    return {"id": raw["id"], "links": links}
+
+def _species_references(raw: Dict[str, Any]) -> List[str]:
+    chain = raw.get("evolution_chain")
+    return [chain["url"]] if chain and chain.get("url") else []
+
+# Grafo de dependências: como compactar cada tipo de recurso e quais recursos ele referencia.
+# O Pokémon (raiz) referencia habilidades, movimentos e espécie; a espécie, a cadeia de evolução.
+RESOURCES: Dict[str, Tuple[Callable[[Dict[str, Any]], Dict[str, Any]], Callable[[Dict[str, Any]], List[str]]]] = {
+    "ability": (_ability, lambda raw: []),
+    "move": (_move, lambda raw: []),
+    "pokemon-species": (_species, _species_references),
+    "evolution-chain": (_evolution_chain, lambda raw: []),
+}
+
+class RelatedResources:
+    """
+    Habilidades, movimentos, espécies e cadeias de evolução dos Pokémons extraídos.
+
+    Os mesmos recursos aparecem em centenas de Pokémons ('tackle', 'overgrow'...): cada um é
+    buscado uma única vez, pela chave (tipo, ID) da URL, em ondas pelo grafo de dependências.
+    Cada onda busca em paralelo tudo o que ficou pendente (uma chamada a fetch_many por tipo), então
+    o número de requisições cresce com os recursos únicos, não com as referências.
+
+    Tudo o que fica em memória é compacto e serializável em JSON (to_dict/from_dict, para o XCom).
+    """
+
+    def __init__(self):
+        # pokemon_id -> {"species_id", "abilities": [[id, slot, oculta]], "moves": [[id, método, nível]]}
+        self.links: Dict[int, Dict[str, Any]] = {}
+        self.resources: Dict[str, Dict[int, Dict[str, Any]]] = {kind: {} for kind in RESOURCES}
+        self.stats = {"references": 0, "unique": 0, "fetched": 0}
+        self._seen: Set[Tuple[str, int]] = set()
+        self._pending: Dict[Tuple[str, int], str] = {}
+        self._lock = threading.Lock()
+
+    def add_pokemon(self, raw: Dict[str, Any]) -> None:
+        """
+        Registra as referências de uma resposta de /pokemon/{id}. Seguro entre threads (é chamado
+        pelos workers de fetch_many).
+        """
+        abilities, moves, urls = [], [], []
+        for entry in raw.get("abilities") or []:
+            key = resource_key(entry["ability"]["url"])
+            if key:
+                abilities.append([key[1], entry.get("slot"), bool(entry.get("is_hidden"))])
+                urls.append(entry["ability"]["url"])
+        for entry in raw.get("moves") or []:
+            key = resource_key(entry["move"]["url"])
+            if key:
+                # Os detalhes vêm por versão dos jogos; vale a mais recente:
+                details = (entry.get("version_group_details") or [{}])[-1]
+                moves.append([key[1], _name(details.get("move_learn_method")), details.get("level_learned_at")])
+                urls.append(entry["move"]["url"])
+        species = resource_key((raw.get("species") or {}).get("url"))
+        if species:
+            urls.append(raw["species"]["url"])
+
+        with self._lock:
+            self.links[raw["id"]] = {"species_id": species[1] if species else None, "abilities": abilities, "moves": moves}
+            for url in urls:
+                self._reference(url)
+
+    def _reference(self, url: str) -> None:
+        key = resource_key(url)
+        if key is None or key[0] not in RESOURCES:
+            return
+        self.stats["references"] += 1
+        if key not in self._seen:
+            self._seen.add(key)
+            self._pending[key] = url
+
+    def fetch(self, client: Optional[PokeAPIClient] = None) -> None:
+        """
+        Busca os recursos pendentes, onda a onda, até fechar o grafo. As falhas ficam em
+        client.dead_letters; os elos que apontam para elas são descartados na transformação.
+        """
+        client = client or PokeAPIClient()
+        wave = 0
+        while self._pending:
+            wave += 1
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            self.stats["unique"] += len(pending)
+            logger.info(f"Onda {wave}: {len(pending)} recursos relacionados únicos ({self.stats['references']} referências até aqui).")
+
+            for kind, (compact, references) in RESOURCES.items():
+                urls = [url for (k, _), url in pending.items() if k == kind]
+                if not urls:
+                    continue
+                for payload, refs in client.fetch_many(urls, lambda raw: (compact(raw), references(raw))):
+                    self.resources[kind][payload["id"]] = payload
+                    self.stats["fetched"] += 1
+                    with self._lock:
+                        for url in refs:
+                            self._reference(url)
+
+        logger.info(
+            f"Recursos relacionados: {self.stats['fetched']} de {self.stats['unique']} buscados "
+            f"para {self.stats['references']} referências."
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Chaves inteiras viram strings no JSON; as listas preservam o ID dentro de cada item.
+        return {
+            "links": [{"pokemon_id": pokemon_id, **links} for pokemon_id, links in self.links.items()],
+            "resources": {kind: list(items.values()) for kind, items in self.resources.items()},
+            "stats": dict(self.stats),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RelatedResources":
+        related = cls()
+        for entry in data.get("links", []):
+            entry = dict(entry)
+            related.links[entry.pop("pokemon_id")] = entry
+        for kind, items in data.get("resources", {}).items():
+            related.resources.setdefault(kind, {}).update((item["id"], item) for item in items)
+        related.stats.update(data.get("stats", {}))
+        return related
@@ -0,0 +1,281 @@
+# Importar do módulo compartilhado:
+import re
+import json
+import math
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import sys
+import os
+
+# Garantir que possamos importar da API e dos módulos do ETL:
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v2/"
+LIST_PATH = "/api/v2/pokemon"
+POKEAPI_ORIGIN = "https://pokeapi.co"
+POKEAPI_LIST_URL = "https://pokeapi.co/api/v2/pokemon"
+
+class StubPokeAPI:
+    """
+    Servidor HTTP local compatível com os endpoints da PokeAPI usados pelo ETL:
+    GET /api/v2/pokemon?limit=&offset= e GET /api/v2/pokemon/{id ou nome}; com 'resources'
+    (ex.: synthetic.related_payloads), também GET /api/v2/{tipo}/{id ou nome} para habilidades,
+    movimentos, espécies e cadeias de evolução.
+
+    Serve payloads em memória (sintéticos via synthetic.to_pokeapi ou gravados com record_pokeapi)
+    em uma thread própria, sem rede externa:
+
+        with StubPokeAPI(payloads, latency_ms=50, error_rate=0.01, rate_limit=100) as stub:
+            extract.fetch_pokemon_data(limit=1000, base_url=stub.url)
+
+    Comportamentos configuráveis, para medir concorrência e retentativas do extrator:
+    - latency_ms/jitter_ms: atraso de cada resposta, uniforme em latency ± jitter;
+    - error_rate: fração das requisições respondida com 500 (sorteio com semente, reprodutível);
+    - rate_limit: requisições/s aceitas (balde de fichas com rajada de até rate_limit); o excesso
+      recebe 429 com Retry-After, como um upstream que limita a taxa.
+    Os contadores em stats (requests, ok, errors, throttled, not_found) permitem verificar o tráfego
+    gerado; served conta as respostas 200 por tipo de recurso.
+
+    URLs da PokeAPI real nas respostas (https://pokeapi.co/api/v2/{tipo}/...) são reescritas para o
+    stub quando ele serve aquele tipo, para que o extrator siga as referências sem sair da máquina.
+    """
+
+    def __init__(
+        self,
+        payloads: Iterable[Dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        seed: int = 42,
+        resources: Optional[Dict[str, Iterable[Dict[str, Any]]]] = None
+    ):
+        self.payloads = sorted(payloads, key=lambda p: p["id"])
+        # (tipo, ID ou nome) -> payload:
+        self.by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for kind, items in [("pokemon", self.payloads)] + list((resources or {}).items()):
+            for payload in items:
+                self.by_key[(kind, str(payload["id"]))] = payload
+                if "name" in payload:  # cadeias de evolução só têm ID
+                    self.by_key[(kind, payload["name"])] = payload
+        self.kinds = sorted({kind for kind, _ in self.by_key} | {"pokemon"})
+        # O lookahead exige a barra após o tipo: 'pokemon/' não casa com 'pokemon-species/'.
+        self._served_urls = re.compile(
+            re.escape(POKEAPI_ORIGIN + API_PREFIX) + "(?=(?:" + "|".join(map(re.escape, self.kinds)) + ")/)"
+        )
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "not_found": 0}
+        self.served: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit or 0)
+        self._refilled_at = time.monotonic()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{LIST_PATH}"
+
+    def rewrite(self, text: str) -> str:
+        host, port = self.server.server_address[:2]
+        return self._served_urls.sub(f"http://{host}:{port}{API_PREFIX}", text)
+
+    def start(self) -> "StubPokeAPI":
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), name="stub-pokeapi", daemon=True)
+        self._thread.start()
+        logger.info(f"Stub da PokeAPI servindo {len(self.payloads)} Pokémons em {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubPokeAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def list_page(self, limit: int, offset: int) -> Dict[str, Any]:
+        page = self.payloads[offset:offset + limit]
+        total = len(self.payloads)
+        next_url = f"{self.url}?offset={offset + limit}&limit={limit}" if offset + limit < total else None
+        previous_url = f"{self.url}?offset={max(0, offset - limit)}&limit={limit}" if offset > 0 else None
+        return {
+            "count": total,
+            "next": next_url,
+            "previous": previous_url,
+            "results": [{"name": p["name"], "url": f"{self.url}/{p['id']}/"} for p in page],
+        }
+
+    def admit(self) -> Tuple[Optional[int], Optional[float], float]:
+        """
+        Decide o destino de uma requisição: (status de falha ou None, Retry-After em segundos, atraso em s).
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+                self._refilled_at = now
+                if self._tokens < 1:
+                    self.stats["throttled"] += 1
+                    return 429, (1 - self._tokens) / self.rate_limit, 0.0
+                self._tokens -= 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return 500, None, delay
+        return None, None, delay
+
+    def _count(self, key: str, kind: Optional[str] = None) -> None:
+        with self._lock:
+            self.stats[key] += 1
+            if kind:
+                self.served[kind] += 1
+
+    def _handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 mantém a conexão aberta entre requisições, como a PokeAPI real:
+            protocol_version = "HTTP/1.1"
+            # Cabeçalhos e corpo saem em escritas separadas: com Nagle + ACK atrasado, cada resposta
+            # numa conexão mantida aberta esperaria ~40ms.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                failure, retry_after, delay = stub.admit()
+                if failure == 429:
+                    # Retry-After em segundos inteiros, como no cabeçalho HTTP:
+                    return self._send(429, {"detail": "Too Many Requests"}, {"Retry-After": str(max(1, math.ceil(retry_after)))})
+                if delay:
+                    time.sleep(delay)
+                if failure is not None:
+                    return self._send(failure, {"detail": "Internal Server Error"})
+
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip("/")
+                if path == LIST_PATH:
+                    query = parse_qs(parsed.query)
+                    try:
+                        limit = int(query.get("limit", ["20"])[0])
+                        offset = int(query.get("offset", ["0"])[0])
+                    except ValueError:
+                        return self._send(400, {"detail": "limit e offset devem ser inteiros"})
+                    stub._count("ok")
+                    return self._send(200, stub.list_page(max(0, limit), max(0, offset)))
+                if path.startswith(API_PREFIX):
+                    kind, _, key = path[len(API_PREFIX):].partition("/")
+                    payload = stub.by_key.get((kind, key.lower()))
+                    if payload is not None:
+                        stub._count("ok", kind)
+                        return self._send(200, payload, rewrite=True)
+                stub._count("not_found")
+                self._send(404, {"detail": "Not found."})
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None, rewrite: bool = False) -> None:
+                text = json.dumps(body)
+                data = (stub.rewrite(text) if rewrite else text).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Uma linha por requisição distorceria o benchmark do extrator.
+                pass
+
+        return Handler
+
+def record_pokeapi(limit: int, path: str, base_url: str = POKEAPI_LIST_URL) -> int:
+    """
+    Grava as respostas de detalhe da PokeAPI real em JSONL (uma por linha), para servir depois com --recorded.
+    """
+    import requests
+
+    with requests.Session() as session:
+        response = session.get(f"{base_url}?limit={limit}", timeout=10)
+        response.raise_for_status()
+        results = response.json().get("results", [])
+        with open(path, "w", encoding="utf-8") as f:
+            for item in results:
+                detail = session.get(item["url"], timeout=10)
+                detail.raise_for_status()
+                f.write(json.dumps(detail.json(), ensure_ascii=False) + "\n")
+    logger.info(f"{len(results)} respostas da PokeAPI gravadas em {path}.")
+    return len(results)
+
+def load_recorded(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local PokeAPI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--count", type=int, default=1000, help="Synthetic Pokemon to serve (ignored with --recorded)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--recorded", help="Serve payloads recorded with --record instead of synthetic data")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--rate-limit", type=float, help="Requests per second before answering 429")
+    parser.add_argument("--no-related", dest="related", action="store_false", help="Serve only /pokemon (no abilities, moves, species or evolution chains)")
+    parser.add_argument("--record", type=int, metavar="N", help="Record N real PokeAPI responses into --recorded and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    if args.record:
+        if not args.recorded:
+            parser.error("--record exige --recorded com o arquivo de destino")
+        record_pokeapi(args.record, args.recorded)
+        return
+
+    resources = None
+    if args.recorded:
+        # Gravações têm só os detalhes: as referências seguem apontando para a PokeAPI real.
+        payloads = load_recorded(args.recorded)
+    else:
+        from etl import synthetic
+
+        payloads = [synthetic.to_pokeapi(p, args.seed) for p in synthetic.iter_pokemon(args.count, args.seed)]
+        if args.related:
+            resources = synthetic.related_payloads(payloads, args.seed)
+
+    stub = StubPokeAPI(
+        payloads, args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit, args.seed, resources
+    )
+    logger.info(f"Use POKEAPI_URL={stub.url} para apontar o ETL para o stub.")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+        logger.info(f"Tráfego servido: {stub.stats} {dict(stub.served)}")
+
+if __name__ == "__main__":
+    main()
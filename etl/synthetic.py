@@ -0,0 +1,426 @@
+# Importar do módulo compartilhado:
+import io
+import math
+import random
+import logging
+import itertools
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import sys
+import os
+
+# Garantir que possamos importar da API:
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.schemas import PokemonDetail, PokemonStats
+
+logger = logging.getLogger(__name__)
+
+STAT_NAMES = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+
+# Frequências aproximadas da Dex Nacional: tipo primário e, nos duplos, tipo secundário.
+PRIMARY_TYPE_WEIGHTS = {
+    "water": 135, "normal": 115, "grass": 105, "bug": 90, "psychic": 80, "fire": 75,
+    "electric": 65, "rock": 60, "dark": 50, "fighting": 50, "dragon": 45, "ghost": 45,
+    "poison": 40, "ground": 40, "steel": 40, "ice": 35, "fairy": 30, "flying": 10,
+}
+SECONDARY_TYPE_WEIGHTS = {
+    "flying": 100, "poison": 40, "ground": 35, "psychic": 35, "fairy": 30, "fighting": 30,
+    "steel": 25, "dragon": 25, "dark": 25, "ghost": 20, "water": 20, "grass": 20,
+    "rock": 15, "ice": 15, "fire": 15, "electric": 15, "normal": 10, "bug": 10,
+}
+POKEMON_TYPES = tuple(PRIMARY_TYPE_WEIGHTS)
+
+# Faixas de soma dos atributos base (BST): (participação, média, desvio).
+BST_TIERS = (
+    (0.40, 320, 50),   # estágio básico
+    (0.50, 480, 70),   # evoluídos
+    (0.08, 590, 20),   # pseudo-lendários
+    (0.02, 660, 40),   # lendários
+)
+# Perfis de distribuição da BST entre hp, attack, defense, special_attack, special_defense, speed:
+ARCHETYPES = (
+    (1.0, 1.0, 1.0, 1.0, 1.0, 1.0),   # equilibrado
+    (1.0, 1.5, 0.9, 0.6, 0.8, 1.2),   # atacante físico
+    (0.9, 0.6, 0.8, 1.5, 1.0, 1.2),   # atacante especial
+    (1.2, 1.0, 1.6, 0.6, 1.0, 0.6),   # tanque físico
+    (1.2, 0.6, 1.0, 1.0, 1.6, 0.6),   # tanque especial
+    (0.8, 1.0, 0.7, 1.0, 0.7, 1.8),   # veloz
+    (2.0, 0.8, 0.8, 0.8, 0.9, 0.6),   # muralha de HP
+)
+# Formas regionais e especiais: mesmo nome base com sufixo, como na PokeAPI (ex.: raichu-alola).
+FORMS = ("alola", "galar", "hisui", "paldea", "mega", "gmax")
+
+_CONSONANTS = "bcdfgjklmnprstvz"
+_VOWELS = "aeiou"
+# Todas as sílabas têm duas letras: a concatenação é decodificável e nomes distintos nunca colidem.
+SYLLABLES = tuple(c + v for c in _CONSONANTS for v in _VOWELS)
+
+Row = Tuple[int, str, int, int, Tuple[str, ...], Tuple[int, ...]]
+
+class SyntheticDex:
+    """
+    Gerador determinístico de Pokémons sintéticos em qualquer escala (mesma semente -> mesmos dados).
+
+    - Atributos: a BST segue faixas realistas (básicos, evoluídos, pseudo-lendários, lendários) e é
+      repartida entre os seis atributos por um perfil com ruído, limitada a 1..255.
+    - Tipos: primário e secundário ponderados pelas frequências reais; dual_type_rate são duplos.
+    - Nomes: sílabas derivadas do ID (únicos por construção, sem conjunto em memória). Uma fração
+      form_rate das linhas é forma de uma espécie recente ("<nome>-alola"): nomes quase idênticos,
+      tipos e atributos parecidos, como os que buscas e caches enfrentam na Dex real.
+    - Altura e peso crescem com a BST, com dispersão log-normal.
+
+    Gera tuplas (rows) para os escritores em lote e PokemonDetail (pokemon) para o pipeline.
+    """
+
+    def __init__(self, seed: int = 42, dual_type_rate: float = 0.5, form_rate: float = 0.05, recent: int = 1000):
+        self.seed = seed
+        self.dual_type_rate = dual_type_rate
+        self.form_rate = form_rate
+        self.recent = recent
+        self.syllables = list(SYLLABLES)
+        random.Random(seed).shuffle(self.syllables)
+        # Pesos acumulados pré-calculados: random.choices os recalcularia a cada sorteio.
+        self._primary = (list(PRIMARY_TYPE_WEIGHTS), list(itertools.accumulate(PRIMARY_TYPE_WEIGHTS.values())))
+        self._secondaries = {}
+        for primary in PRIMARY_TYPE_WEIGHTS:
+            candidates = [(t, w) for t, w in SECONDARY_TYPE_WEIGHTS.items() if t != primary]
+            self._secondaries[primary] = ([t for t, _ in candidates], list(itertools.accumulate(w for _, w in candidates)))
+
+    def name(self, pokemon_id: int) -> str:
+        """
+        Nome base do ID em numeração bijetiva na base len(SYLLABLES), com ao menos duas sílabas.
+        """
+        n = pokemon_id + len(self.syllables)
+        parts = []
+        while n > 0:
+            n -= 1
+            parts.append(self.syllables[n % len(self.syllables)])
+            n //= len(self.syllables)
+        return "".join(parts)
+
+    def rows(self, count: int, start_id: int = 1) -> Iterator[Row]:
+        rng = random.Random(self.seed)
+        primary_types, primary_cumulative = self._primary
+        recent: "deque[Row]" = deque(maxlen=self.recent)
+        used_forms: Set[Tuple[str, str]] = set()
+
+        for pokemon_id in range(start_id, start_id + count):
+            row = None
+            if recent and rng.random() < self.form_rate:
+                row = self._form(rng, pokemon_id, rng.choice(recent), used_forms)
+            if row is None:
+                primary = rng.choices(primary_types, cum_weights=primary_cumulative)[0]
+                types = (primary, self._secondary(rng, primary)) if rng.random() < self.dual_type_rate else (primary,)
+                bst = self._bst(rng)
+                height, weight = self._size(rng, bst)
+                row = (pokemon_id, self.name(pokemon_id), height, weight, types, self._split(rng, bst))
+                recent.append(row)
+            yield row
+
+    def pokemon(self, count: int, start_id: int = 1) -> Iterator[PokemonDetail]:
+        for pokemon_id, name, height, weight, types, stats in self.rows(count, start_id):
+            yield PokemonDetail(
+                id=pokemon_id, name=name, height=height, weight=weight, types=list(types),
+                stats=PokemonStats(**dict(zip(STAT_NAMES, stats))),
+            )
+
+    def _form(self, rng: random.Random, pokemon_id: int, base: Row, used_forms: Set[Tuple[str, str]]) -> Optional[Row]:
+        _, base_name, height, weight, types, stats = base
+        free = [f for f in FORMS if (base_name, f) not in used_forms]
+        if not free:
+            return None
+        form = rng.choice(free)
+        used_forms.add((base_name, form))
+        # Formas regionais costumam trocar o tipo secundário; megas ficam ~100 pontos mais fortes.
+        if form in ("alola", "galar", "hisui", "paldea") and rng.random() < 0.6:
+            types = (types[0], self._secondary(rng, types[0]))
+        boost = 100 / sum(stats) if form == "mega" else 0.0
+        stats = tuple(min(255, max(1, round(s * (1 + boost) * rng.uniform(0.9, 1.1)))) for s in stats)
+        return (pokemon_id, f"{base_name}-{form}", height, weight, types, stats)
+
+    def _secondary(self, rng: random.Random, primary: str) -> str:
+        types, cumulative = self._secondaries[primary]
+        return rng.choices(types, cum_weights=cumulative)[0]
+
+    @staticmethod
+    def _bst(rng: random.Random) -> int:
+        roll, share = rng.random(), 0.0
+        for tier_share, mean, deviation in BST_TIERS:
+            share += tier_share
+            if roll < share:
+                break
+        return int(min(780, max(175, rng.gauss(mean, deviation))))
+
+    @staticmethod
+    def _split(rng: random.Random, bst: int) -> Tuple[int, ...]:
+        # Dirichlet(perfil * 20): a proporção média segue o perfil, com variação moderada.
+        profile = rng.choice(ARCHETYPES)
+        shares = [rng.gammavariate(weight * 20, 1.0) for weight in profile]
+        total = sum(shares)
+        return tuple(min(255, max(1, round(bst * s / total))) for s in shares)
+
+    @staticmethod
+    def _size(rng: random.Random, bst: int) -> Tuple[int, int]:
+        height = max(1, round(rng.lognormvariate(math.log(bst / 45), 0.45)))
+        weight = max(1, round(3 * height ** 2 * rng.lognormvariate(0, 0.6)))
+        return height, min(weight, 99999)
+
+def iter_pokemon(count: int, seed: int = 42, start_id: int = 1) -> Iterator[PokemonDetail]:
+    return SyntheticDex(seed).pokemon(count, start_id)
+
+def generate_pokemon(count: int, seed: int = 42, start_id: int = 1) -> List[PokemonDetail]:
+    return list(iter_pokemon(count, seed, start_id))
+
+POKEAPI_BASE = "https://pokeapi.co/api/v2"
+
+# Recursos relacionados (ordem de grandeza da Dex real: ~300 habilidades, ~900 movimentos):
+ABILITY_COUNT = 300
+MOVE_COUNT = 900
+LEARN_METHODS = (("level-up", 50), ("machine", 35), ("egg", 10), ("tutor", 5))
+EVOLUTION_ITEMS = ("fire-stone", "water-stone", "thunder-stone", "leaf-stone", "moon-stone", "ice-stone")
+# Último ID de espécie de cada geração, como na Dex Nacional:
+GENERATIONS = ((151, "i"), (251, "ii"), (386, "iii"), (493, "iv"), (649, "v"), (721, "vi"), (809, "vii"), (905, "viii"))
+# Como cada bloco de três espécies consecutivas se divide em cadeias, como (espécie, pré-evolução)
+# por posição no bloco; a última é ramificada, como a do Eevee:
+CHAIN_PATTERNS = (
+    ((0, None), (1, 0), (2, 1)),
+    ((0, None), (1, 0), (2, None)),
+    ((0, None), (1, None), (2, 1)),
+    ((0, None), (1, None), (2, None)),
+    ((0, None), (1, 0), (2, 0)),
+)
+
+def _url(kind: str, resource_id: int) -> str:
+    return f"{POKEAPI_BASE}/{kind}/{resource_id}/"
+
+def _popular(rng: random.Random, count: int) -> int:
+    # Distribuição de cauda longa: poucos recursos (tackle, protect) aparecem em quase todos os Pokémons.
+    return int(count * rng.random() ** 2) + 1
+
+def to_pokeapi(pokemon: PokemonDetail, seed: int = 42) -> Dict[str, Any]:
+    """
+    Converte um PokemonDetail no formato de resposta de /api/v2/pokemon/{id} da PokeAPI
+    (apenas os campos lidos por etl/extract.py e etl/related.py). Habilidades e movimentos são
+    sorteados a partir da semente e do ID; a espécie tem o ID do Pokémon.
+    """
+    rng = random.Random(f"{seed}:pokemon:{pokemon.id}")
+    abilities = [(1, _popular(rng, ABILITY_COUNT), False)]
+    if rng.random() < 0.5:
+        abilities.append((2, _popular(rng, ABILITY_COUNT), False))
+    if rng.random() < 0.7:
+        abilities.append((3, _popular(rng, ABILITY_COUNT), True))
+    methods, weights = zip(*LEARN_METHODS)
+    moves = []
+    for move_id in sorted({_popular(rng, MOVE_COUNT) for _ in range(rng.randint(8, 40))}):
+        method = rng.choices(methods, weights=weights)[0]
+        moves.append({
+            "move": {"name": f"move-{move_id}", "url": _url("move", move_id)},
+            "version_group_details": [
+                {"level_learned_at": rng.randint(1, 60) if method == "level-up" else 0, "move_learn_method": {"name": method}}
+            ],
+        })
+
+    return {
+        "id": pokemon.id,
+        "name": pokemon.name,
+        "height": pokemon.height,
+        "weight": pokemon.weight,
+        "types": [
+            {"slot": slot, "type": {"name": name, "url": f"https://pokeapi.co/api/v2/type/{name}/"}}
+            for slot, name in enumerate(pokemon.types, start=1)
+        ],
+        "stats": [
+            {"base_stat": getattr(pokemon.stats, stat), "effort": 0, "stat": {"name": stat.replace("_", "-")}}
+            for stat in STAT_NAMES
+        ],
+        "abilities": [
+            {"ability": {"name": f"ability-{ability_id}", "url": _url("ability", ability_id)}, "is_hidden": hidden, "slot": slot}
+            for slot, ability_id, hidden in abilities
+        ],
+        "moves": moves,
+        "species": {"name": pokemon.name, "url": _url("pokemon-species", pokemon.id)},
+    }
+
+def evolution_chain(species_id: int, seed: int = 42) -> Tuple[int, List[Tuple[int, Optional[int]]]]:
+    """
+    Cadeia de evolução da espécie: (ID da cadeia, [(espécie, pré-evolução)]). Cada bloco de três
+    espécies consecutivas segue um dos CHAIN_PATTERNS; o ID da cadeia é o da sua primeira espécie.
+    """
+    block = (species_id - 1) // 3
+    first = block * 3 + 1
+    pattern = random.Random(f"{seed}:chain:{block}").choice(CHAIN_PATTERNS)
+    # Raiz da cadeia da espécie: sobe pelas pré-evoluções dentro do bloco.
+    parents = dict(pattern)
+    root = species_id - first
+    while parents[root] is not None:
+        root = parents[root]
+    members, queue = [], [root]
+    while queue:
+        position = queue.pop(0)
+        members.append((first + position, None if parents[position] is None else first + parents[position]))
+        queue.extend(child for child, parent in pattern if parent == position)
+    return first + root, members
+
+def related_payloads(pokemon_payloads: Iterable[Dict[str, Any]], seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Gera as respostas de /ability, /move, /pokemon-species e /evolution-chain referenciadas pelos
+    payloads de to_pokeapi, no formato da PokeAPI, para servir no stub (StubPokeAPI(resources=...)).
+    """
+    dex = SyntheticDex(seed)
+    names: Dict[int, str] = {}
+    ability_ids: Set[int] = set()
+    move_ids: Set[int] = set()
+    for payload in pokemon_payloads:
+        names[payload["id"]] = payload["name"]
+        ability_ids.update(int(a["ability"]["url"].rstrip("/").rsplit("/", 1)[-1]) for a in payload.get("abilities", []))
+        move_ids.update(int(m["move"]["url"].rstrip("/").rsplit("/", 1)[-1]) for m in payload.get("moves", []))
+
+    def species_name(species_id: int) -> str:
+        # Espécies da cadeia que não estão entre os Pokémons servidos ganham o nome base do ID.
+        return names.get(species_id) or dex.name(species_id)
+
+    abilities = []
+    for ability_id in sorted(ability_ids):
+        abilities.append({
+            "id": ability_id,
+            "name": f"ability-{ability_id}",
+            "effect_entries": [{"short_effect": f"Synthetic ability #{ability_id}.", "language": {"name": "en"}}],
+        })
+
+    moves = []
+    for move_id in sorted(move_ids):
+        rng = random.Random(f"{seed}:move:{move_id}")
+        damage_class = rng.choices(("physical", "special", "status"), weights=(45, 35, 20))[0]
+        moves.append({
+            "id": move_id,
+            "name": f"move-{move_id}",
+            "type": {"name": rng.choice(POKEMON_TYPES)},
+            "power": None if damage_class == "status" else rng.randrange(20, 155, 5),
+            "accuracy": None if rng.random() < 0.15 else rng.choice((50, 70, 80, 85, 90, 95, 100, 100, 100)),
+            "pp": rng.choice((5, 10, 15, 20, 25, 30, 35, 40)),
+            "damage_class": {"name": damage_class},
+        })
+
+    species, chains = [], {}
+    for species_id in sorted(names):
+        rng = random.Random(f"{seed}:species:{species_id}")
+        chain_id, members = evolution_chain(species_id, seed)
+        parent = dict(members)[species_id]
+        generation = next((g for last, g in GENERATIONS if species_id <= last), "ix")
+        species.append({
+            "id": species_id,
+            "name": species_name(species_id),
+            "generation": {"name": f"generation-{generation}"},
+            "is_legendary": rng.random() < 0.02,
+            "is_mythical": rng.random() < 0.01,
+            "capture_rate": rng.choice((3, 45, 45, 90, 120, 190, 255)),
+            "evolves_from_species": None if parent is None else {"name": species_name(parent), "url": _url("pokemon-species", parent)},
+            "evolution_chain": {"url": _url("evolution-chain", chain_id)},
+        })
+        if chain_id not in chains:
+            chains[chain_id] = _chain_payload(chain_id, members, species_name, seed)
+
+    return {"ability": abilities, "move": moves, "pokemon-species": species, "evolution-chain": list(chains.values())}
+
+def _chain_payload(chain_id: int, members: List[Tuple[int, Optional[int]]], species_name, seed: int) -> Dict[str, Any]:
+    nodes: Dict[int, Dict[str, Any]] = {}
+    for species_id, parent in members:
+        rng = random.Random(f"{seed}:evolution:{species_id}")
+        details = []
+        if parent is not None:
+            roll = rng.random()
+            if roll < 0.75:
+                details = [{"trigger": {"name": "level-up"}, "min_level": rng.randint(16, 45), "item": None}]
+            elif roll < 0.95:
+                details = [{"trigger": {"name": "use-item"}, "min_level": None, "item": {"name": rng.choice(EVOLUTION_ITEMS)}}]
+            else:
+                details = [{"trigger": {"name": "trade"}, "min_level": None, "item": None}]
+        nodes[species_id] = {
+            "species": {"name": species_name(species_id), "url": _url("pokemon-species", species_id)},
+            "evolution_details": details,
+            "evolves_to": [],
+        }
+        if parent is not None:
+            nodes[parent]["evolves_to"].append(nodes[species_id])
+    return {"id": chain_id, "chain": nodes[members[0][0]]}
+
+def _batches(rows: Iterable[Row], batch_size: int) -> Iterator[List[Row]]:
+    batch: List[Row] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def write_parquet(rows: Iterable[Row], path: str, batch_size: int = 100_000) -> int:
+    """
+    Grava as linhas em um arquivo Parquet (uma linha por Pokémon, tipos como lista), em lotes.
+    Requer pyarrow. Retorna o número de linhas gravadas.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [("id", pa.int32()), ("name", pa.string()), ("height", pa.int32()), ("weight", pa.int32()),
+         ("types", pa.list_(pa.string()))] + [(stat, pa.int16()) for stat in STAT_NAMES]
+    )
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in _batches(rows, batch_size):
+            columns = list(zip(*batch))
+            stats = list(zip(*columns[5]))
+            arrays = [list(columns[0]), list(columns[1]), list(columns[2]), list(columns[3]), [list(t) for t in columns[4]]]
+            arrays += [list(values) for values in stats]
+            writer.write_table(pa.Table.from_arrays([pa.array(a, type=f.type) for a, f in zip(arrays, schema)], schema=schema))
+            written += len(batch)
+    logger.info(f"{written} Pokémons sintéticos gravados em {path}.")
+    return written
+
+def copy_to_postgres(rows: Iterable[Row], engine: Any, batch_size: int = 50_000, truncate: bool = False) -> int:
+    """
+    Carrega as linhas em dim_pokemon, pokemon_types e fact_stats com COPY, em lotes e em uma
+    única transação. Muito mais rápido que os upserts linha a linha de load.load_data, mas exige
+    IDs e nomes ainda ausentes no banco (use truncate=True em um banco de benchmark).
+    Retorna o número de Pokémons carregados.
+    """
+    loaded = 0
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if truncate:
+            cursor.execute("TRUNCATE pokemon_neighbors, pokemon_types, fact_stats, dim_type, dim_pokemon RESTART IDENTITY CASCADE")
+        for type_name in POKEMON_TYPES:
+            cursor.execute("INSERT INTO dim_type (name) VALUES (%s) ON CONFLICT (name) DO NOTHING", (type_name,))
+        cursor.execute("SELECT name, id FROM dim_type")
+        type_ids = dict(cursor.fetchall())
+
+        for batch in _batches(rows, batch_size):
+            pokemon, links, stats = io.StringIO(), io.StringIO(), io.StringIO()
+            for pokemon_id, name, height, weight, types, values in batch:
+                pokemon.write(f"{pokemon_id}\t{name}\t{height}\t{weight}\n")
+                for slot, type_name in enumerate(types, start=1):
+                    links.write(f"{pokemon_id}\t{type_ids[type_name]}\t{slot}\n")
+                stats.write(f"{pokemon_id}\t" + "\t".join(map(str, values)) + "\n")
+            for buffer, statement in (
+                (pokemon, "COPY dim_pokemon (id, name, height, weight) FROM STDIN"),
+                (links, "COPY pokemon_types (pokemon_id, type_id, slot) FROM STDIN"),
+                (stats, f"COPY fact_stats (pokemon_id, {', '.join(STAT_NAMES)}) FROM STDIN"),
+            ):
+                buffer.seek(0)
+                cursor.copy_expert(statement, buffer)
+            loaded += len(batch)
+            logger.info(f"{loaded} Pokémons sintéticos copiados...")
+
+        cursor.execute("SELECT setval(pg_get_serial_sequence('dim_pokemon', 'id'), (SELECT COALESCE(MAX(id), 1) FROM dim_pokemon))")
+        connection.commit()
+        cursor.execute("ANALYZE dim_pokemon, pokemon_types, fact_stats")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return loaded
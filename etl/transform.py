@@ -11,6 +11,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from api.schemas import PokemonDetail
+from etl.related import RelatedResources
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,72 @@ TypeLinkSchema = pa.DataFrameSchema({
     "slot": pa.Column(int, checks=pa.Check.isin([1, 2]), coerce=True),
 })
 
+# Recursos relacionados (habilidades, movimentos, espécies); campos que a PokeAPI deixa nulos
+# (ex.: poder de movimentos de status) usam o inteiro anulável do pandas.
+SpeciesSchema = pa.DataFrameSchema({
+    "id": pa.Column(int, checks=pa.Check.ge(1), unique=True, coerce=True),
+    "name": pa.Column(str, checks=pa.Check.str_length(min_value=1), unique=True, coerce=True),
+    "generation": pa.Column(str, nullable=True, coerce=True),
+    "is_legendary": pa.Column("boolean", nullable=True, coerce=True),
+    "is_mythical": pa.Column("boolean", nullable=True, coerce=True),
+    "capture_rate": pa.Column("Int64", checks=pa.Check.in_range(0, 255), nullable=True, coerce=True),
+    "evolution_chain_id": pa.Column("Int64", checks=pa.Check.ge(1), nullable=True, coerce=True),
+    "evolves_from_id": pa.Column("Int64", checks=pa.Check.ge(1), nullable=True, coerce=True),
+    "evolution_trigger": pa.Column(str, nullable=True, coerce=True),
+    "min_level": pa.Column("Int64", checks=pa.Check.in_range(1, 100), nullable=True, coerce=True),
+    "evolution_item": pa.Column(str, nullable=True, coerce=True),
+})
+
+PokemonSpeciesSchema = pa.DataFrameSchema({
+    "pokemon_id": pa.Column(int, checks=pa.Check.ge(1), unique=True, coerce=True),
+    "species_id": pa.Column(int, checks=pa.Check.ge(1), coerce=True),
+})
+
+AbilitySchema = pa.DataFrameSchema({
+    "id": pa.Column(int, checks=pa.Check.ge(1), unique=True, coerce=True),
+    "name": pa.Column(str, checks=pa.Check.str_length(min_value=1), unique=True, coerce=True),
+    "short_effect": pa.Column(str, nullable=True, coerce=True),
+})
+
+PokemonAbilitySchema = pa.DataFrameSchema(
+    {
+        "pokemon_id": pa.Column(int, checks=pa.Check.ge(1), coerce=True),
+        "ability_id": pa.Column(int, checks=pa.Check.ge(1), coerce=True),
+        "slot": pa.Column(int, checks=pa.Check.isin([1, 2, 3]), coerce=True),
+        "is_hidden": pa.Column(bool, coerce=True),
+    },
+    unique=["pokemon_id", "slot"],
+)
+
+MoveSchema = pa.DataFrameSchema({
+    "id": pa.Column(int, checks=pa.Check.ge(1), unique=True, coerce=True),
+    "name": pa.Column(str, checks=pa.Check.str_length(min_value=1), unique=True, coerce=True),
+    "type_name": pa.Column(str, nullable=True, coerce=True),
+    "power": pa.Column("Int64", checks=pa.Check.ge(0), nullable=True, coerce=True),
+    "accuracy": pa.Column("Int64", checks=pa.Check.in_range(0, 100), nullable=True, coerce=True),
+    "pp": pa.Column("Int64", checks=pa.Check.ge(0), nullable=True, coerce=True),
+    "damage_class": pa.Column(str, nullable=True, coerce=True),
+})
+
+PokemonMoveSchema = pa.DataFrameSchema(
+    {
+        "pokemon_id": pa.Column(int, checks=pa.Check.ge(1), coerce=True),
+        "move_id": pa.Column(int, checks=pa.Check.ge(1), coerce=True),
+        "learn_method": pa.Column(str, nullable=True, coerce=True),
+        "level": pa.Column("Int64", checks=pa.Check.ge(0), nullable=True, coerce=True),
+    },
+    unique=["pokemon_id", "move_id"],
+)
+
+RELATED_SCHEMAS = {
+    "dim_species": SpeciesSchema,
+    "pokemon_species": PokemonSpeciesSchema,
+    "dim_ability": AbilitySchema,
+    "pokemon_abilities": PokemonAbilitySchema,
+    "dim_move": MoveSchema,
+    "pokemon_moves": PokemonMoveSchema,
+}
+
 def transform_data(raw_data: List[PokemonDetail]) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Transforma dados brutos da PokeAPI (Pydantic Models) em DataFrames normalizados e validados.
@@ -45,6 +112,14 @@ def transform_data(raw_data: List[PokemonDetail]) -> Tuple[pd.DataFrame, pd.Data
     Raises:
         pa.errors.SchemaError: Se os dados não passarem na validação.
     """
+    frames = build_frames(raw_data)
+    validate_frames(*frames)
+    return frames
+
+def build_frames(raw_data: List[PokemonDetail]) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Normaliza os modelos em DataFrames (pokemon, dim_type, links de tipo, estatísticas), sem validar.
+    """
     logger.info("Transformando dados...")
     
     pokemon_list = []
@@ -97,7 +172,20 @@ def transform_data(raw_data: List[PokemonDetail]) -> Tuple[pd.DataFrame, pd.Data
     df_stats = pd.DataFrame(stats_list)
     df_types_link = pd.DataFrame(types_list)
     df_dim_type = pd.DataFrame({'name': list(unique_types)}).sort_values('name')
+    return df_pokemon, df_dim_type, df_types_link, df_stats
+
+def validate_frames(
+    df_pokemon: pd.DataFrame,
+    df_dim_type: pd.DataFrame,
+    df_types_link: pd.DataFrame,
+    df_stats: pd.DataFrame
+) -> None:
+    """
+    Valida os DataFrames com os schemas Pandera.
 
+    Raises:
+        pa.errors.SchemaError: Se os dados não passarem na validação.
+    """
     logger.info("Validando schemas com Pandera...")
     try:
         # Valide usando o Pandera:
@@ -111,4 +199,76 @@ def transform_data(raw_data: List[PokemonDetail]) -> Tuple[pd.DataFrame, pd.Data
         # Aqui, relançamos o erro para interromper o pipeline conforme o SLA.
         raise e
 
-    return df_pokemon, df_dim_type, df_types_link, df_stats
+def transform_related(related: RelatedResources) -> Dict[str, pd.DataFrame]:
+    """
+    Normaliza e valida os recursos relacionados em DataFrames por tabela (chaves de RELATED_SCHEMAS).
+
+    Raises:
+        pa.errors.SchemaError: Se os dados não passarem na validação.
+    """
+    frames = build_related_frames(related)
+    logger.info("Validando recursos relacionados com Pandera...")
+    try:
+        return {table: RELATED_SCHEMAS[table].validate(df) for table, df in frames.items()}
+    except pa.errors.SchemaError as e:
+        logger.critical(f"Falha na validação do esquema: {e}")
+        raise e
+
+def build_related_frames(related: RelatedResources) -> Dict[str, pd.DataFrame]:
+    """
+    Monta as linhas de espécies, habilidades, movimentos e seus vínculos com os Pokémons.
+
+    As espécies vêm das cadeias de evolução (todas as etapas, inclusive as que não estão entre os
+    Pokémons extraídos, como o Pichu de uma carga com limit=151), completadas pelos detalhes das
+    espécies buscadas. Vínculos com recursos que não puderam ser buscados (dead letters) são descartados.
+    """
+    logger.info("Transformando recursos relacionados...")
+    species: Dict[int, Dict[str, Any]] = {}
+    for chain in related.resources["evolution-chain"].values():
+        for link in chain["links"]:
+            species[link["species_id"]] = {
+                "id": link["species_id"],
+                "name": link["name"],
+                "evolution_chain_id": chain["id"],
+                "evolves_from_id": link["evolves_from_id"],
+                "evolution_trigger": link["trigger"],
+                "min_level": link["min_level"],
+                "evolution_item": link["item"],
+            }
+    for item in related.resources["pokemon-species"].values():
+        row = species.setdefault(item["id"], {"id": item["id"], "evolution_chain_id": item["evolution_chain_id"]})
+        row.update(
+            name=item["name"], generation=item["generation"], is_legendary=item["is_legendary"],
+            is_mythical=item["is_mythical"], capture_rate=item["capture_rate"],
+        )
+
+    abilities = related.resources["ability"]
+    moves = related.resources["move"]
+    pokemon_species, pokemon_abilities, pokemon_moves = [], [], []
+    for pokemon_id, links in related.links.items():
+        if links["species_id"] in species:
+            pokemon_species.append({"pokemon_id": pokemon_id, "species_id": links["species_id"]})
+        for ability_id, slot, is_hidden in links["abilities"]:
+            if ability_id in abilities:
+                pokemon_abilities.append({"pokemon_id": pokemon_id, "ability_id": ability_id, "slot": slot, "is_hidden": is_hidden})
+        seen = set()
+        for move_id, learn_method, level in links["moves"]:
+            if move_id in moves and move_id not in seen:
+                seen.add(move_id)
+                pokemon_moves.append({"pokemon_id": pokemon_id, "move_id": move_id, "learn_method": learn_method, "level": level})
+
+    columns = {table: list(schema.columns) for table, schema in RELATED_SCHEMAS.items()}
+    return {
+        "dim_species": pd.DataFrame(sorted(species.values(), key=lambda r: r["id"]), columns=columns["dim_species"]),
+        "pokemon_species": pd.DataFrame(pokemon_species, columns=columns["pokemon_species"]),
+        "dim_ability": pd.DataFrame(
+            [{"id": a["id"], "name": a["name"], "short_effect": a["short_effect"]} for a in abilities.values()],
+            columns=columns["dim_ability"],
+        ),
+        "pokemon_abilities": pd.DataFrame(pokemon_abilities, columns=columns["pokemon_abilities"]),
+        "dim_move": pd.DataFrame(
+            [{**{k: m[k] for k in ("id", "name", "power", "accuracy", "pp", "damage_class")}, "type_name": m["type"]} for m in moves.values()],
+            columns=columns["dim_move"],
+        ),
+        "pokemon_moves": pd.DataFrame(pokemon_moves, columns=columns["pokemon_moves"]),
+    }
@@ -2,15 +2,16 @@ import streamlit as st
 import os
 import sys
 import json
+import asyncio
+import threading
 import requests
 import pandas as pd
-from openai import OpenAI
 import sys
 from pathlib import Path
-from agent.tools import tools_schema, available_functions
+from agent.core import PokemonAgent, ToolMemo
+from agent.history import ConversationHistory
 from common.config import get_openai_api_key, API_BASE_URL
 from common.logger import get_logger, set_correlation_id
-from agent.prompts import SYSTEM_PROMPT
 
 # Adicionar a raiz do projeto ao sys.path:
 # Pressupõe-se que este arquivo esteja em <raiz_do_projeto>/scripts/:
@@ -49,12 +50,22 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Inicializa o OpenAI Client:
-if "openai_client" not in st.session_state:
-    api_key = get_openai_api_key()
-    if api_key:
-        st.session_state.openai_client = OpenAI(api_key=api_key)
-        logger.info("Cliente OpenAI inicializado com sucesso.")
+@st.cache_resource
+def get_agent_runtime():
+    """
+    Agente e event loop compartilhados pelas sessões do Streamlit.
+    O loop roda em uma thread dedicada, como o servidor WebSocket, e consome o mesmo fluxo de eventos.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+    return PokemonAgent(), loop
+
+# Inicializa o Agente:
+if "agent_ready" not in st.session_state:
+    if get_openai_api_key():
+        get_agent_runtime()
+        st.session_state.agent_ready = True
+        logger.info("Agente inicializado com sucesso.")
     else:
         st.warning("OPENAI_API_KEY não encontrada nas variáveis de ambiente.")
         logger.error("OPENAI_API_KEY ausente.")
@@ -68,66 +79,59 @@ set_correlation_id(st.session_state.session_id)
 
 # Prompt do sistema importado de agent.prompts:
 
-def run_chat_turn(user_input, messages_history):
-    client = st.session_state.openai_client
-    
-    # Adiciona a mensagem do usuário ao contexto temporário para esta execução.
-    # Se 'messages_history' já contém a mensagem atual, não duplicar.
-    # Ajuste: O chamador agora passa 'messages' completo, incluindo a ultima pergunta.
-    
-    # Construir mensagens: System Prompt + Histórico
-    current_messages = [{"role": "system", "content": SYSTEM_PROMPT}] + messages_history
-    
+def iter_agent_events(user_input, history):
+    """
+    Ponte síncrona sobre PokemonAgent.stream_message: entrega cada evento assim que ele chega.
+    """
+    agent, loop = get_agent_runtime()
+    if "tool_memo" not in st.session_state:
+        st.session_state.tool_memo = ToolMemo()
+    stream = agent.stream_message(user_input, history, st.session_state.tool_memo)
     try:
-        # Primeiro contato com o LLM:
-        response = client.chat.completions.create(
-            model="gpt-5.2",
-            messages=current_messages,
-            tools=tools_schema,
-            tool_choice="auto",
-            frequency_penalty=0.5  # Penalizar repetição
-        )
-        
-        response_message = response.choices[0].message
-        
-        # Verifique as chamadas de ferramentas:
-        if response_message.tool_calls:
-            current_messages.append(response_message)
-            
-            for tool_call in response_message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                logger.info(f"Agent Tool Call: {function_name} Args={function_args}")
-                
-                if function_name in available_functions:
-                    function_to_call = available_functions[function_name]
-                    with st.status(f"Consultando Pokedex: {function_name}...", expanded=False) as status:
-                        st.write(f"Args: {function_args}")
-                        function_response = function_to_call(**function_args)
-                        status.update(label="Consulta concluída!", state="complete")
-                    
-                    current_messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": function_response,
-                    })
-            
-            # Segunda chamada ao LLM com resultados da ferramenta:
-            second_response = client.chat.completions.create(
-                model="gpt-5.2",
-                messages=current_messages,
-                frequency_penalty=0.5
-            )
-            return second_response.choices[0].message.content
-            
-        else:
-            return response_message.content
-            
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(stream.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(stream.aclose(), loop).result()
+
+def run_chat_turn(user_input):
+    # O histórico exibido (st.session_state.messages) é completo; ao agente vai apenas a versão compactada:
+    if "conversation" not in st.session_state:
+        st.session_state.conversation = ConversationHistory()
+    conversation = st.session_state.conversation
+    history = conversation.as_messages()
+
+    placeholder = st.empty()
+    statuses = {}
+    response_text = ""
+
+    try:
+        for event in iter_agent_events(user_input, history):
+            if event["type"] == "tool_start":
+                logger.info(f"Agent Tool Call: {event['name']} Args={event['args']}")
+                statuses[event["id"]] = st.status(f"Consultando Pokedex: {event['name']}...", expanded=False)
+                statuses[event["id"]].write(f"Args: {event['args']}")
+            elif event["type"] == "tool_end":
+                label, state = ("Consulta concluída!", "complete") if event["ok"] else ("Consulta falhou.", "error")
+                statuses[event["id"]].update(label=label, state=state)
+            elif event["type"] == "token":
+                response_text += event["content"]
+                placeholder.markdown(response_text + "▌")
+            elif event["type"] == "done":
+                response_text = event["content"]
+                conversation.add_turn(user_input, response_text)
+                logger.info(f"Tempo até o primeiro token: {event['ttft_ms']}ms")
+            elif event["type"] == "error":
+                response_text = event["message"]
+
     except Exception as e:
         logger.error(f"Chat error: {e}", exc_info=True)
-        return f"Ocorreu um erro: {str(e)}"
+        response_text = f"Ocorreu um erro: {str(e)}"
+
+    placeholder.markdown(response_text)
+    return response_text
 
 # --- UI Layout ---
 
@@ -216,11 +220,10 @@ if prompt := st.chat_input("Pergunte algo sobre Pokémons ⁉️..."):
     st.session_state.messages.append({"role": "user", "content": prompt})
     
     # Processo com Agente
-    if "openai_client" in st.session_state:
+    if st.session_state.get("agent_ready"):
         with st.chat_message("assistant"):
-            # CORREÇÃO: Passar o histórico COMPLETO, incluindo a mensagem do usuário recém adicionada (prompt)
-            response_text = run_chat_turn(prompt, st.session_state.messages)
-            st.markdown(response_text)
+            # A resposta é renderizada incrementalmente dentro de run_chat_turn:
+            response_text = run_chat_turn(prompt)
         
         st.session_state.messages.append({"role": "assistant", "content": response_text})
         logger.info(f"🤖 Resposta do agente: {response_text[:50]}...")
@@ -1,84 +1,67 @@
 import sys
 import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import logging
-import main as etl_main
-import load as etl_load
-from agent.logger import get_logger, configure_logging
 
-# Certifique-se de que o diretório raiz do projeto e o diretório ETL estejam no PATH:
+# Certifique-se de que o diretório raiz do projeto esteja no PATH, à frente de scripts/: o pacote
+# etl/ (regular, com __init__.py) tem precedência sobre este arquivo, que também se chama etl.
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, '../'))
-etl_dir = os.path.abspath(os.path.join(current_dir, '../etl'))
 
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-if etl_dir not in sys.path:
-    sys.path.insert(0, etl_dir)
+if project_root in sys.path:
+    sys.path.remove(project_root)
+sys.path.insert(0, project_root)
+
+from etl import main as etl_main
+from etl.stub_pokeapi import StubPokeAPI
+from agent.logger import get_logger, configure_logging
 
 # Configurar registro de logs:
 configure_logging()
 logger = get_logger(__name__)
 
+BULBASAUR = {
+    "id": 1,
+    "name": "bulbasaur",
+    "height": 7,
+    "weight": 69,
+    "stats": [
+        {"base_stat": 45, "stat": {"name": "hp"}},
+        {"base_stat": 49, "stat": {"name": "attack"}},
+        {"base_stat": 49, "stat": {"name": "defense"}},
+        {"base_stat": 65, "stat": {"name": "special-attack"}},
+        {"base_stat": 65, "stat": {"name": "special-defense"}},
+        {"base_stat": 45, "stat": {"name": "speed"}}
+    ],
+    "types": [
+        {"slot": 1, "type": {"name": "grass"}},
+        {"slot": 2, "type": {"name": "poison"}}
+    ]
+}
+
 class TestETLLogging(unittest.TestCase):
-    @patch('extract.requests.get')
-    @patch('extract.requests.Session')
-    @patch('load.get_db_engine')
-    @patch('load.load_data')
-    def test_pipeline_runs_with_logging(self, mock_load, mock_engine, mock_session, mock_get):
+    @patch('etl.load.refresh_neighbors')
+    @patch('etl.load.load_data')
+    def test_pipeline_runs_with_logging(self, mock_load, mock_neighbors):
         logger.info("\n--- Iniciando a verificação de registro ETL ---")
-        
-        # 1. Resposta simulada da lista:
-        mock_list_response = MagicMock()
-        mock_list_response.json.return_value = {
-            "results": [
-                {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon/1/"}
-            ]
-        }
-        mock_list_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_list_response
-        
-        # 2. Resposta detalhada simulada:
-        mock_detail_response = MagicMock()
-        mock_detail_response.json.return_value = {
-            "id": 1,
-            "name": "bulbasaur",
-            "height": 7,
-            "weight": 69,
-            "stats": [
-                {"base_stat": 45, "stat": {"name": "hp"}},
-                {"base_stat": 49, "stat": {"name": "attack"}},
-                {"base_stat": 49, "stat": {"name": "defense"}},
-                {"base_stat": 65, "stat": {"name": "special-attack"}},
-                {"base_stat": 65, "stat": {"name": "special-defense"}},
-                {"base_stat": 45, "stat": {"name": "speed"}}
-            ],
-            "types": [
-                {"slot": 1, "type": {"name": "grass"}},
-                {"slot": 2, "type": {"name": "poison"}}
-            ]
-        }
-        mock_detail_response.raise_for_status.return_value = None
-        
-        # A sessão simulada retorna uma resposta detalhada:
-        mock_session_instance = MagicMock()
-        mock_session_instance.get.return_value = mock_detail_response
-        mock_session_instance.__enter__.return_value = mock_session_instance
-        mock_session.return_value = mock_session_instance
 
-        # Executar principal:
-        try:
-            etl_main.main()
-            logger.info("--- Verificação ETL concluída com sucesso ---")
-        except SystemExit:
-            self.fail("O processo ETL foi encerrado indiscriminadamente.")
-        except Exception as e:
-            logger.error(f"ETL failed with error: {e}", exc_info=True)
-            self.fail(f"ETL falhou com erro: {e}")
+        # A extração real roda contra o stub local da PokeAPI; apenas a carga no banco é simulada:
+        with StubPokeAPI([BULBASAUR]) as stub, patch('etl.extract.POKEAPI_URL', stub.url):
+            try:
+                etl_main.run_pipeline(limit=1, neighbors=0, run_id=None, checkpoint=False, related=False)
+                logger.info("--- Verificação ETL concluída com sucesso ---")
+            except SystemExit:
+                self.fail("O processo ETL foi encerrado indiscriminadamente.")
+            except Exception as e:
+                logger.error(f"ETL failed with error: {e}", exc_info=True)
+                self.fail(f"ETL falhou com erro: {e}")
 
         # Afirmações básicas:
         mock_load.assert_called_once()
+        # Com neighbors=0 a tabela de vizinhos é esvaziada, não recalculada:
+        mock_neighbors.assert_called_once_with(k=0)
+        self.assertEqual(stub.stats["ok"], 2)
         logger.info("Verificado que load_data foi chamado..")
 
 if __name__ == "__main__":
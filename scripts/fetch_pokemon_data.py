@@ -17,7 +17,8 @@ from common.logger import configure_logging, get_logger
 configure_logging()
 logger = get_logger("fetch_pokemon_data")
 
-POKEAPI_URL = "https://pokeapi.co/api/v2/pokemon"
+# Sobrescrevível para usar o stub local (python etl/stub_pokeapi.py):
+POKEAPI_URL = os.getenv("POKEAPI_URL", "https://pokeapi.co/api/v2/pokemon")
 
 def buscar_dados_pokemon(limite: int = 150) -> Optional[List[Dict[str, Any]]]:
     """
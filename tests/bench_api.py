@@ -0,0 +1,294 @@
+"""
+Benchmark HTTP dos endpoints v1 da API com dados sintéticos em várias escalas.
+
+Para cada escala (ex.: 1k, 100k, 1M Pokémons):
+  1. popula um banco Postgres dedicado (--database ou BENCH_POSTGRES_DB, padrão 'pokedex_bench') com a Dex sintética (etl/synthetic.py);
+  2. sobe a API com uvicorn apontando para esse banco (ou usa --base-url de uma API já configurada);
+  3. mede /v1/pokemons/{name}, /v1/pokemons?type= e /v1/stats/ranking com concorrência fixa,
+     primeiro com o cache Redis da API vazio (cold) e depois com as mesmas chaves já em cache (warm).
+
+Uso:
+    python tests/bench_api.py --scales 1000,100000,1000000 --concurrency 32 --requests 2000 --json api.json
+    python tests/bench_api.py --scales 100000 --baseline api_baseline.json   # sai com código 1 se regredir
+
+Variáveis: POSTGRES_HOST/PORT/USER/PASSWORD e REDIS_HOST, as mesmas da API; o banco é BENCH_POSTGRES_DB
+e o db do Redis, BENCH_REDIS_DB. O banco de benchmark é truncado e o cache limpo a cada escala, por isso
+o POSTGRES_DB da API (e 'pokedex') e o REDIS_DB da API (padrão 0) são recusados.
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import create_engine, text
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(project_root))
+
+from etl.synthetic import POKEMON_TYPES, SyntheticDex, copy_to_postgres
+from bench_utils import LatencyHistogram, compare_to_baseline, environment, load_json, print_table, write_csv, write_json
+
+# Nunca o POSTGRES_DB da aplicação: o seed trunca as tabelas do banco alvo.
+BENCH_DB = os.getenv("BENCH_POSTGRES_DB", "pokedex_bench")
+PROTECTED_DBS = frozenset({"pokedex"})
+# Idem para o Redis: o cache da API de benchmark (chaves iguais às da produção) fica em outro db.
+BENCH_REDIS_DB = int(os.getenv("BENCH_REDIS_DB", 15))
+STATS = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+RANKING_LIMITS = (5, 10, 25, 50, 100)
+# Chaves de cache gravadas por PokemonService (limpas antes da fase cold):
+CACHE_PATTERNS = ("pokemon:*", "ranking:*", "dataset:*")
+
+# --- Dados sintéticos ---
+def db_url(database: str) -> str:
+    user = os.getenv("POSTGRES_USER", "postgres")
+    password = os.getenv("POSTGRES_PASSWORD", "postgres")
+    host = os.getenv("POSTGRES_HOST", "localhost")
+    port = os.getenv("POSTGRES_PORT", "5432")
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+def check_bench_database(database: str) -> None:
+    """
+    Recusa bancos que não são de benchmark: o principal ('pokedex') e o POSTGRES_DB da API.
+    """
+    protected = PROTECTED_DBS | {os.getenv("POSTGRES_DB", "pokedex")}
+    if database in protected:
+        raise ValueError(f"Banco '{database}' recusado: o benchmark trunca as tabelas; use um banco dedicado (ex.: pokedex_bench).")
+
+def check_bench_redis_db(redis_db: int) -> None:
+    """
+    Recusa o db do Redis da API (REDIS_DB, padrão 0): o benchmark apaga e regrava as mesmas chaves.
+    """
+    if redis_db == int(os.getenv("REDIS_DB", 0)):
+        raise ValueError(f"Redis db {redis_db} recusado: é o cache da API; use um db dedicado (ex.: 15).")
+
+def ensure_database(database: str = BENCH_DB) -> None:
+    # CREATE DATABASE não roda dentro de transação:
+    engine = create_engine(db_url("postgres"), isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        exists = conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :db"), {"db": database}).scalar()
+        if not exists:
+            conn.execute(text(f'CREATE DATABASE "{database}"'))
+    engine.dispose()
+
+def seed(scale: int, database: str = BENCH_DB, seed: int = 42) -> float:
+    """
+    Recria o esquema (db/init.sql) e carrega 'scale' Pokémons da Dex sintética com COPY.
+    Retorna os segundos gastos.
+    """
+    check_bench_database(database)
+    start = time.perf_counter()
+    ensure_database(database)
+    engine = create_engine(db_url(database))
+    schema = (project_root / "db" / "init.sql").read_text(encoding="utf-8")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(schema)
+    copy_to_postgres(SyntheticDex(seed).rows(scale), engine, truncate=True)
+    engine.dispose()
+    return time.perf_counter() - start
+
+def sample_names(scale: int, count: int, rng: random.Random, database: str = BENCH_DB) -> List[str]:
+    """
+    Nomes de 'count' Pokémons distintos sorteados entre os IDs 1..scale.
+    """
+    ids = rng.sample(range(1, scale + 1), min(count, scale))
+    engine = create_engine(db_url(database))
+    with engine.connect() as conn:
+        names = dict(conn.execute(text("SELECT id, name FROM dim_pokemon WHERE id = ANY(:ids)"), {"ids": ids}).fetchall())
+    engine.dispose()
+    return [names[i] for i in ids if i in names]
+
+def clear_api_cache(redis_db: int = BENCH_REDIS_DB) -> int:
+    import redis
+
+    check_bench_redis_db(redis_db)
+    client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=6379, db=redis_db)
+    removed = 0
+    for pattern in CACHE_PATTERNS:
+        keys = list(client.scan_iter(pattern, count=1000))
+        for i in range(0, len(keys), 1000):
+            removed += client.delete(*keys[i:i + 1000])
+    return removed
+
+# --- Cenários ---
+def plan_requests(endpoint: str, count: int, names: Sequence[str] = ()) -> List[str]:
+    """
+    Caminhos a requisitar. As chaves são distintas enquanto houver chaves novas (na fase cold,
+    cada requisição é uma falta de cache); a fase warm repete exatamente a mesma lista.
+    A listagem por tipo não passa pelo cache da API: cold e warm medem o mesmo caminho.
+    """
+    if endpoint == "details":
+        if not names:
+            raise ValueError("O cenário 'details' precisa dos nomes sorteados (sample_names).")
+        paths = [f"/v1/pokemons/{name}" for name in names]
+    elif endpoint == "by_type":
+        paths = [f"/v1/pokemons?type={t}" for t in POKEMON_TYPES]
+    elif endpoint == "ranking":
+        paths = [f"/v1/stats/ranking?stat={s}&limit={n}" for s in STATS for n in RANKING_LIMITS]
+    else:
+        raise ValueError(f"Endpoint desconhecido: {endpoint}")
+    # Espaços de chaves pequenos (tipos, rankings) são percorridos em ciclo até completar 'count':
+    return [paths[i % len(paths)] for i in range(count)]
+
+async def drive(base_url: str, paths: List[str], concurrency: int, timeout: float) -> Tuple[LatencyHistogram, int, float]:
+    """
+    Executa as requisições com 'concurrency' trabalhadores. Retorna (histograma, erros, segundos).
+    """
+    histogram = LatencyHistogram()
+    errors = 0
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def worker() -> None:
+            nonlocal errors
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    histogram.record((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return histogram, errors, time.perf_counter() - started
+
+# --- Servidor ---
+def start_api(port: int, workers: int, database: str, redis_db: int = BENCH_REDIS_DB) -> subprocess.Popen:
+    env = {**os.environ, "POSTGRES_DB": database, "REDIS_DB": str(redis_db), "PYTHONPATH": str(project_root)}
+    env.setdefault("POSTGRES_HOST", "localhost")
+    env.setdefault("REDIS_HOST", "localhost")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=str(project_root), env=env,
+    )
+    wait_healthy(f"http://127.0.0.1:{port}", process)
+    return process
+
+def wait_healthy(base_url: str, process: Optional[subprocess.Popen] = None, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("A API terminou durante a inicialização.")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"A API não respondeu em {timeout:.0f}s.")
+
+def stop_api(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+# --- Execução ---
+def bench_scale(args: argparse.Namespace, scale: int, base_url: str, scopes: Dict[str, Dict[str, Any]]) -> None:
+    rng = random.Random(args.seed)
+    for endpoint in args.endpoints:
+        names = sample_names(scale, args.requests, rng, args.database) if endpoint == "details" else ()
+        paths = plan_requests(endpoint, args.requests, names)
+        removed = clear_api_cache(args.redis_db)
+        print(f"  {endpoint}: cache limpo ({removed} chaves), {len(paths)} requisições, concorrência {args.concurrency}")
+        for phase in ("cold", "warm"):
+            histogram, errors, seconds = asyncio.run(drive(base_url, paths, args.concurrency, args.timeout))
+            total = histogram.count + errors
+            scopes[f"{scale}/{endpoint}/{phase}"] = {
+                "latency_ms": histogram.summary(),
+                "throughput_rps": round(histogram.count / seconds, 3) if seconds else 0.0,
+                "error_rate": round(errors / total, 4) if total else 0.0,
+            }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP benchmark of the v1 API endpoints")
+    parser.add_argument("--scales", default="1000,100000,1000000", help="Comma-separated dataset sizes")
+    parser.add_argument("--endpoints", default="details,by_type,ranking", help="Comma-separated: details, by_type, ranking")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and phase")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=BENCH_DB, help="Benchmark database, recreated at each scale (default: BENCH_POSTGRES_DB or pokedex_bench)")
+    parser.add_argument("--redis-db", type=int, default=BENCH_REDIS_DB, help="Redis db of the benchmark API cache (default: BENCH_REDIS_DB or 15)")
+    parser.add_argument("--base-url", help="Use an already running API (it must read POSTGRES_DB=--database and REDIS_DB=--redis-db)")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the API spawned by the benchmark")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn workers of the spawned API")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the benchmark database")
+    parser.add_argument("--json", help="Write the report as JSON")
+    parser.add_argument("--csv", help="Write the report as CSV")
+    parser.add_argument("--baseline", help="Compare against a stored JSON report; exit 1 on regression")
+    parser.add_argument("--save-baseline", help="Store this report as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+    args.endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    try:
+        check_bench_database(args.database)
+        check_bench_redis_db(args.redis_db)
+    except ValueError as e:
+        parser.error(str(e))
+
+    scopes: Dict[str, Dict[str, Any]] = {}
+    seeding: Dict[str, float] = {}
+    for scale in (int(s) for s in args.scales.split(",")):
+        print(f"Escala {scale}:")
+        if not args.skip_seed:
+            seeding[str(scale)] = round(seed(scale, args.database, seed=args.seed), 2)
+            print(f"  banco populado em {seeding[str(scale)]:.1f}s")
+
+        # A API é reiniciada a cada escala: índices em memória são carregados na inicialização.
+        process = None if args.base_url else start_api(args.port, args.workers, args.database, args.redis_db)
+        try:
+            bench_scale(args, scale, args.base_url or f"http://127.0.0.1:{args.port}", scopes)
+        finally:
+            if process is not None:
+                stop_api(process)
+
+    report = {
+        "scopes": scopes,
+        "meta": {
+            **environment(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "workers": args.workers,
+            "seed_seconds": seeding,
+        },
+    }
+    print("\n--- Resultados ---")
+    print_table(report)
+    if args.json:
+        write_json(report, args.json)
+    if args.csv:
+        write_csv(report, args.csv)
+    if args.save_baseline:
+        write_json(report, args.save_baseline)
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, load_json(args.baseline), args.tolerance)
+        if regressions:
+            print("\nRegressões em relação ao baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\nSem regressões em relação ao baseline.")
+
+if __name__ == "__main__":
+    main()
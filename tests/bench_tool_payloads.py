@@ -0,0 +1,129 @@
+"""
+Benchmark de tokens das saídas de ferramentas do agente.
+
+Compara, para um conjunto fixo de perguntas, o tamanho da mensagem de ferramenta no formato
+antigo (JSON completo com espaços) e no formato compacto (projeção + limite de listas + JSON minificado).
+
+Uso:
+    python tests/bench_tool_payloads.py            # payloads de exemplo (offline)
+    python tests/bench_tool_payloads.py --live     # payloads reais da API em API_BASE_URL
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+from unittest.mock import patch
+
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agent import tools
+from agent.history import estimate_tokens
+
+# Pergunta -> (ferramenta, argumentos que o LLM enviaria):
+QUESTIONS = [
+    ("Quem é Pikachu?", "buscar_pokemon", {"nome_ou_id": "pikachu"}),
+    ("Qual o tipo do Charizard?", "buscar_pokemon", {"nome_ou_id": "charizard", "campos": ["types"]}),
+    ("Qual a velocidade do Jolteon?", "buscar_pokemon", {"nome_ou_id": "jolteon", "campos": ["speed"]}),
+    ("Liste pokemons de água", "listar_por_tipo", {"tipo": "water"}),
+    ("Quais são os 10 mais fortes em ataque?", "top_n_por_stat", {"stat": "attack", "n": 10}),
+    ("Compare Mewtwo e Mew", "comparar_pokemons", {"pokemon_a": "mewtwo", "pokemon_b": "mew"}),
+    ("Mewtwo ou Mew é mais rápido?", "comparar_pokemons", {"pokemon_a": "mewtwo", "pokemon_b": "mew", "campos": ["speed"]}),
+    ("Squirtle e Pikachu contra Charmander e Geodude?", "avaliar_confronto",
+     {"time_a": ["squirtle", "pikachu"], "time_b": ["charmander", "geodude"]}),
+    ("Quais Pokémons parecem com o Snorlax?", "buscar_similares", {"nome": "snorlax", "n": 5}),
+    ("Evolução do Eevee?", "buscar_evolucoes", {"nome": "eevee"}),
+]
+
+def _sample_names():
+    data_path = project_root / "data" / "raw" / "pokemon_data.json"
+    with open(data_path, "r", encoding="utf-8") as f:
+        return [p["name"] for p in json.load(f)]
+
+def _sample_detail(name: str, pokemon_id: int) -> dict:
+    base = 40 + (pokemon_id * 37) % 90
+    return {
+        "id": pokemon_id, "name": name, "height": 10, "weight": 300, "types": ["water", "flying"],
+        "stats": {"hp": base, "attack": base + 10, "defense": base - 5, "special_attack": base + 20,
+                  "special_defense": base, "speed": base + 15},
+    }
+
+def sample_api(method: str, endpoint: str, params=None, json_body=None, **kwargs):
+    """Respostas offline com o mesmo formato da API."""
+    names = _sample_names()
+    if endpoint == "/v1/pokemons":
+        return names[:60]
+    if endpoint == "/v1/stats/ranking":
+        return [{"rank": i + 1, "name": n, "value": 200 - i * 7} for i, n in enumerate(names[:params["limit"]])]
+    if endpoint == "/v1/matchups/teams":
+        a, b = json_body["team_a"], json_body["team_b"]
+        return {"team_a": a, "team_b": b, "advantage": [[1.0, -0.5] for _ in a], "score": 0.24999999,
+                "best_counters": {name: a[0] for name in b}}
+    if endpoint.endswith("/similar"):
+        return [{"rank": i + 1, "name": n, "score": 0.987654321 - i * 0.01} for i, n in enumerate(names[:params["k"]])]
+    if endpoint.endswith("/evolutions"):
+        evolutions = [("vaporeon", "use-item", "water-stone"), ("jolteon", "use-item", "thunder-stone"),
+                      ("flareon", "use-item", "fire-stone"), ("espeon", "level-up", None), ("umbreon", "level-up", None)]
+        steps = [{"species": "eevee", "stage": 1, "evolves_from": None, "trigger": None, "min_level": None, "item": None}]
+        steps += [{"species": n, "stage": 2, "evolves_from": "eevee", "trigger": t, "min_level": None, "item": item}
+                  for n, t, item in evolutions]
+        return {"chain_id": 67, "species": "eevee", "steps": steps}
+    name = endpoint.rsplit("/", 1)[-1]
+    return _sample_detail(name, names.index(name) + 1 if name in names else 150)
+
+def legacy_payload(tool_name: str, arguments: dict, fetch) -> str:
+    """Formato anterior: resposta da API inteira, com json.dumps padrão."""
+    if tool_name == "buscar_pokemon":
+        return json.dumps(fetch("GET", f"/v1/pokemons/{arguments['nome_ou_id']}"))
+    if tool_name == "listar_por_tipo":
+        return json.dumps(fetch("GET", "/v1/pokemons", params={"type": arguments["tipo"]}))
+    if tool_name == "top_n_por_stat":
+        return json.dumps(fetch("GET", "/v1/stats/ranking", params={"stat": arguments["stat"], "limit": arguments["n"]}))
+    if tool_name == "comparar_pokemons":
+        return json.dumps({
+            "pokemon_a": fetch("GET", f"/v1/pokemons/{arguments['pokemon_a']}"),
+            "pokemon_b": fetch("GET", f"/v1/pokemons/{arguments['pokemon_b']}"),
+        })
+    if tool_name == "avaliar_confronto":
+        return json.dumps(fetch("POST", "/v1/matchups/teams", json_body={"team_a": arguments["time_a"], "team_b": arguments["time_b"]}))
+    if tool_name == "buscar_evolucoes":
+        return json.dumps(fetch("GET", f"/v1/pokemons/{arguments['nome']}/evolutions"))
+    return json.dumps(fetch("GET", f"/v1/pokemons/{arguments['nome']}/similar", params={"k": arguments["n"]}))
+
+def count_tokens(text: str) -> int:
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        return estimate_tokens(text)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool payload token benchmark")
+    parser.add_argument("--live", action="store_true", help="Usar a API real em API_BASE_URL")
+    parser.add_argument("--json", dest="json_path", help="Salvar o relatório em JSON")
+    args = parser.parse_args()
+
+    fetch = tools._request if args.live else sample_api
+    rows = []
+    with patch.object(tools, "_safe_request", side_effect=fetch):
+        for question, tool_name, arguments in QUESTIONS:
+            before = count_tokens(legacy_payload(tool_name, arguments, fetch))
+            after = count_tokens(tools.available_functions[tool_name](**arguments))
+            rows.append({"question": question, "tool": tool_name, "before": before, "after": after})
+
+    print(f"{'Pergunta':<50} {'Antes':>7} {'Depois':>7} {'Redução':>8}")
+    for row in rows:
+        reduction = 1 - row["after"] / row["before"] if row["before"] else 0.0
+        print(f"{row['question'][:50]:<50} {row['before']:>7} {row['after']:>7} {reduction:>8.1%}")
+
+    total_before = sum(r["before"] for r in rows)
+    total_after = sum(r["after"] for r in rows)
+    print(f"\nTotal: {total_before} -> {total_after} tokens ({1 - total_after / total_before:.1%} de redução)")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "total_before": total_before, "total_after": total_after}, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
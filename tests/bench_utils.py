@@ -0,0 +1,170 @@
+"""
+Utilitários comuns aos benchmarks: histogramas de latência, relatórios JSON/CSV e comparação com baseline.
+"""
+import csv
+import json
+import math
+import time
+import platform
+from typing import Any, Dict, Iterable, List, Optional
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+def _percentile_key(p: float) -> str:
+    # 50 -> "p50", 99.9 -> "p999"
+    return "p" + f"{p:g}".replace(".", "")
+
+class LatencyHistogram:
+    """
+    Histograma log-linear no estilo HDR: cada valor cai em um bucket com 'significant_digits'
+    algarismos significativos, então o erro relativo dos percentis é limitado (até 1% com 3 dígitos)
+    e a memória não cresce com o número de amostras.
+    """
+
+    def __init__(self, significant_digits: int = 3):
+        self.significant_digits = significant_digits
+        self.counts: Dict[float, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def bucket(self, value: float) -> float:
+        if value <= 0:
+            return 0.0
+        scale = 10 ** (math.floor(math.log10(value)) - self.significant_digits + 1)
+        # Limite superior do bucket: os percentis nunca subestimam a latência.
+        return round(math.ceil(value / scale) * scale, 12)
+
+    def record(self, value: float) -> None:
+        key = self.bucket(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                return min(key, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3),
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+        }
+        for p in PERCENTILES:
+            result[_percentile_key(p)] = round(self.percentile(p), 3)
+        return result
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "node": platform.node(),
+    }
+
+def write_json(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def flatten(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Linhas (escopo, métrica, estatísticas) a partir de report["scopes"][escopo][métrica].
+    """
+    rows = []
+    for scope, metrics in report.get("scopes", {}).items():
+        for metric, stats in metrics.items():
+            row = {"scope": scope, "metric": metric}
+            row.update(stats if isinstance(stats, dict) else {"value": stats})
+            rows.append(row)
+    return rows
+
+def write_csv(report: Dict[str, Any], path: str) -> None:
+    rows = flatten(report)
+    columns = ["scope", "metric", "count", "mean", "min", "max"] + [_percentile_key(p) for p in PERCENTILES] + ["value"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.10,
+    latency_keys: Iterable[str] = ("p50", "p99"),
+    higher_is_better: Iterable[str] = ("throughput_rps",),
+    lower_is_better: Iterable[str] = ("error_rate",),
+    min_count: int = 20
+) -> List[str]:
+    """
+    Lista as regressões em relação ao baseline.
+    Uma regressão é um percentil de latência acima de (1 + tolerance) vezes o baseline, uma
+    métrica "maior é melhor" abaixo de (1 - tolerance) vezes ou uma taxa "menor é melhor" acima
+    de (1 + tolerance) vezes mais 1 ponto percentual. Escopos com poucas amostras são ignorados.
+    """
+    higher_is_better, lower_is_better = set(higher_is_better), set(lower_is_better)
+    regressions = []
+    for scope, metrics in report.get("scopes", {}).items():
+        base_metrics = baseline.get("scopes", {}).get(scope, {})
+        for metric, stats in metrics.items():
+            base = base_metrics.get(metric)
+            if base is None:
+                continue
+            if metric in higher_is_better:
+                if isinstance(stats, (int, float)) and base and stats < base * (1 - tolerance):
+                    regressions.append(f"{scope}/{metric}: {stats:.2f} < baseline {base:.2f}")
+                continue
+            if metric in lower_is_better:
+                if isinstance(stats, (int, float)) and stats > base * (1 + tolerance) + 0.01:
+                    regressions.append(f"{scope}/{metric}: {stats:.4f} > baseline {base:.4f}")
+                continue
+            if not isinstance(stats, dict) or stats.get("count", 0) < min_count or base.get("count", 0) < min_count:
+                continue
+            for key in latency_keys:
+                value, reference = stats.get(key), base.get(key)
+                if value is not None and reference and value > reference * (1 + tolerance):
+                    regressions.append(f"{scope}/{metric} {key}: {value:.2f}ms > baseline {reference:.2f}ms")
+    return regressions
+
+def print_table(report: Dict[str, Any], metrics: Optional[Iterable[str]] = None) -> None:
+    metrics = set(metrics) if metrics else None
+    header = f"{'escopo':<22} {'métrica':<16} {'n':>7} {'média':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'p999':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in flatten(report):
+        if metrics is not None and row["metric"] not in metrics:
+            continue
+        if "value" in row:
+            print(f"{row['scope']:<22} {row['metric']:<16} {row['value']:>7.2f}")
+            continue
+        if not row.get("count"):
+            continue
+        print(
+            f"{row['scope']:<22} {row['metric']:<16} {row['count']:>7} {row['mean']:>9.2f} "
+            f"{row['p50']:>9.2f} {row['p90']:>9.2f} {row['p99']:>9.2f} {row['p999']:>9.2f}"
+        )
@@ -1,87 +1,230 @@
-import asyncio
-import websockets
+"""
+Teste de carga do WebSocket do agente (/ws).
+
+Perfis:
+    ramp   clientes sobem em degraus até --clients e se mantêm por --duration
+    soak   --clients constantes por --duration (vazamentos, degradação ao longo do tempo)
+    spike  base de --clients, pico de --clients * --spike-factor por --spike-seconds, recuperação
+    churn  cada cliente conecta, envia uma mensagem e desconecta, continuamente
+
+Métricas por fase, por tipo de mensagem e no total (histogramas p50/p90/p99/p999):
+conexão, tempo até o primeiro quadro (TTFB), até o primeiro token (TTFT) e latência total.
+
+Uso:
+    python tests/load_test_ws_async.py --profile ramp --clients 50 --duration 60 --json out.json --csv out.csv
+    python tests/load_test_ws_async.py --profile soak --baseline baseline.json   # sai com código 1 se regredir
+    python tests/load_test_ws_async.py --profile spike --save-baseline baseline.json
+
+Sem custo de OpenAI: rode o agente com AGENT_LLM_BACKEND=stub ou contra tests/stub_llm_server.py.
+"""
+import sys
+import json
+import math
 import time
-import argparse
 import random
-import json
-import statistics
-
-async def simulate_client(client_id, uri, messages_to_send):
-    """Simula um único cliente conectando-se e trocando mensagens."""
-    latencies = []
-    errors = 0
-    
-    try:
-        start_connect = time.time()
-        async with websockets.connect(uri) as websocket:
-            connect_time = (time.time() - start_connect) * 1000 # ms
-            # print(f"Client {client_id}: Connected in {connect_time:.2f}ms")
-            
-            for msg in messages_to_send:
-                start_req = time.time()
-                await websocket.send(msg)
-                _ = await websocket.recv()
-                latency = (time.time() - start_req) * 1000 # ms
-                latencies.append(latency)
-                # Tempo de reflexão aleatório entre solicitações:
-                await asyncio.sleep(random.uniform(0.1, 0.5))
-                
-    except Exception as e:
-        print(f"Client {client_id} error: {e}")
-        errors += 1
-        
-    return latencies, errors
-
-async def main():
-    parser = argparse.ArgumentParser(description="WebSocket Async Load Test")
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_utils import LatencyHistogram, compare_to_baseline, environment, load_json, print_table, write_csv, write_json
+
+# (tipo, mensagem): o tipo agrupa as métricas por caminho do agente.
+MESSAGES = [
+    ("lookup", "Quem é Pikachu?"),
+    ("lookup", "Status do Mewtwo"),
+    ("type_list", "Liste pokemons de água"),
+    ("ranking", "Top 5 velocidade"),
+    ("compare", "Compare Pikachu e Charizard"),
+    ("open", "Qual Pokémon elétrico é melhor contra o Gyarados?"),
+    ("open", "Evolução do Eevee?"),
+]
+
+class Recorder:
+    """
+    Agrega as amostras por escopo: 'overall', 'phase:<nome>' e 'type:<tipo>'.
+    Cada amostra conta para a fase em andamento quando a mensagem terminou.
+    """
+
+    def __init__(self):
+        self.phase = "warmup"
+        self.phase_seconds: Dict[str, float] = {}
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+
+    def _scopes(self, kind: Optional[str] = None) -> List[str]:
+        scopes = ["overall", f"phase:{self.phase}"]
+        if kind:
+            scopes.append(f"type:{kind}")
+        return scopes
+
+    def observe(self, metric: str, value: float, kind: Optional[str] = None) -> None:
+        for scope in self._scopes(kind):
+            self.histograms.setdefault((scope, metric), LatencyHistogram()).record(value)
+
+    def count(self, counter: str, kind: Optional[str] = None) -> None:
+        for scope in self._scopes(kind):
+            self.counters[(scope, counter)] = self.counters.get((scope, counter), 0) + 1
+
+    def report(self, total_seconds: float) -> Dict[str, Any]:
+        scopes: Dict[str, Dict[str, Any]] = {}
+        for (scope, metric), histogram in self.histograms.items():
+            scopes.setdefault(scope, {})[metric] = histogram.summary()
+        for (scope, counter), value in self.counters.items():
+            scopes.setdefault(scope, {})[counter] = value
+
+        for scope, metrics in scopes.items():
+            if scope.startswith("phase:"):
+                seconds = self.phase_seconds.get(scope[len("phase:"):], total_seconds)
+            else:
+                seconds = total_seconds
+            completed = metrics.get("messages", 0)
+            failed = metrics.get("errors", 0) + metrics.get("busy", 0)
+            metrics["throughput_rps"] = round(completed / seconds, 3) if seconds else 0.0
+            metrics["error_rate"] = round(failed / (completed + failed), 4) if completed + failed else 0.0
+        return {"scopes": dict(sorted(scopes.items()))}
+
+async def exchange(websocket: Any, kind: str, text: str, recorder: Recorder) -> None:
+    """
+    Envia uma mensagem e lê os quadros até o evento final, medindo TTFB, TTFT e latência.
+    """
+    start = time.perf_counter()
+    first_frame = first_token = None
+    await websocket.send(text)
+    while True:
+        event = json.loads(await websocket.recv())
+        now = time.perf_counter()
+        first_frame = first_frame or now
+        if event["type"] == "token" and first_token is None:
+            first_token = now
+        if event["type"] in ("done", "error", "busy"):
+            break
+
+    recorder.observe("ttfb_ms", (first_frame - start) * 1000, kind)
+    if event["type"] == "done":
+        recorder.count("messages", kind)
+        recorder.observe("latency_ms", (now - start) * 1000, kind)
+        if first_token is not None:
+            recorder.observe("ttft_ms", (first_token - start) * 1000, kind)
+    else:
+        # "busy": o servidor recusou a mensagem por sobrecarga.
+        recorder.count("busy" if event["type"] == "busy" else "errors", kind)
+
+async def client(uri: str, recorder: Recorder, churn: bool, think: Tuple[float, float]) -> None:
+    """
+    Cliente que conversa até ser cancelado; no modo churn, reconecta a cada mensagem.
+    """
+    while True:
+        try:
+            start = time.perf_counter()
+            async with websockets.connect(uri) as websocket:
+                recorder.observe("connect_ms", (time.perf_counter() - start) * 1000)
+                while True:
+                    kind, text = random.choice(MESSAGES)
+                    await exchange(websocket, kind, text, recorder)
+                    if churn:
+                        break
+                    await asyncio.sleep(random.uniform(*think))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            recorder.count("errors")
+            await asyncio.sleep(0.5)
+
+def build_phases(args: argparse.Namespace) -> List[Tuple[str, float, int]]:
+    """
+    Fases do perfil: (nome, duração em segundos, clientes simultâneos).
+    """
+    if args.profile == "ramp":
+        step = args.ramp_seconds / args.ramp_steps
+        phases = [(f"ramp-{i}", step, math.ceil(args.clients * i / args.ramp_steps)) for i in range(1, args.ramp_steps + 1)]
+        return phases + [("hold", args.duration, args.clients)]
+    if args.profile == "spike":
+        third = args.duration / 3
+        return [
+            ("base", third, args.clients),
+            ("spike", args.spike_seconds, args.clients * args.spike_factor),
+            ("recovery", third, args.clients),
+        ]
+    return [(args.profile, args.duration, args.clients)]
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    recorder = Recorder()
+    phases = build_phases(args)
+    active: List[asyncio.Task] = []
+    started = time.perf_counter()
+    think = (args.think_min, args.think_max)
+
+    for name, seconds, target in phases:
+        recorder.phase = name
+        recorder.phase_seconds[name] = seconds
+        print(f"[{time.perf_counter() - started:7.1f}s] fase {name}: {target} clientes por {seconds:.0f}s")
+        while len(active) < target:
+            active.append(asyncio.create_task(client(args.uri, recorder, args.profile == "churn", think)))
+        while len(active) > target:
+            active.pop().cancel()
+        await asyncio.sleep(seconds)
+
+    for task in active:
+        task.cancel()
+    await asyncio.gather(*active, return_exceptions=True)
+
+    report = recorder.report(time.perf_counter() - started)
+    report["meta"] = {
+        **environment(),
+        "uri": args.uri,
+        "profile": args.profile,
+        "clients": args.clients,
+        "phases": [{"name": n, "seconds": s, "clients": c} for n, s, c in phases],
+    }
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WebSocket load test for the Pokémon agent")
     parser.add_argument("--uri", default="ws://localhost:8000/ws", help="WebSocket URI")
-    parser.add_argument("--clients", type=int, default=10, help="Number of concurrent clients")
-    parser.add_argument("--messages", type=int, default=5, help="Messages per client")
+    parser.add_argument("--profile", choices=("ramp", "soak", "spike", "churn"), default="ramp")
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent clients (peak of the ramp, base of the spike)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds at full load (ramp/soak/churn) or base+recovery (spike)")
+    parser.add_argument("--ramp-seconds", type=float, default=20)
+    parser.add_argument("--ramp-steps", type=int, default=4)
+    parser.add_argument("--spike-factor", type=int, default=5)
+    parser.add_argument("--spike-seconds", type=float, default=10)
+    parser.add_argument("--think-min", type=float, default=0.1, help="Min think time between messages (s)")
+    parser.add_argument("--think-max", type=float, default=0.5, help="Max think time between messages (s)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for message selection")
+    parser.add_argument("--json", help="Write the report as JSON")
+    parser.add_argument("--csv", help="Write the report as CSV")
+    parser.add_argument("--baseline", help="Compare against a stored JSON report; exit 1 on regression")
+    parser.add_argument("--save-baseline", help="Store this report as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression (0.10 = 10%%)")
     args = parser.parse_args()
 
-    print(f"Starting load test on {args.uri}")
-    print(f"Clients: {args.clients}, Messages per client: {args.messages}")
-
-    messages_pool = [
-        "Quem é Pikachu?",
-        "Qual o tipo do Charizard?",
-        "Liste pokemons de água",
-        "Evolução do Eevee?",
-        "Status do Mewtwo"
-    ]
-
-    tasks = []
-    start_test = time.time()
-
-    for i in range(args.clients):
-        # Selecione mensagens aleatórias para este cliente:
-        msgs = [random.choice(messages_pool) for _ in range(args.messages)]
-        tasks.append(simulate_client(i, args.uri, msgs))
-
-    results = await asyncio.gather(*tasks)
-    
-    total_time = time.time() - start_test
-    
-    all_latencies = []
-    total_errors = 0
-    
-    for latencies, errors in results:
-        all_latencies.extend(latencies)
-        total_errors += errors
-
-    if not all_latencies:
-        print("Nenhuma mensagem trocada com sucesso.")
-        return
-    
+    random.seed(args.seed)
+    print(f"Starting {args.profile} load test on {args.uri}")
+    report = asyncio.run(run(args))
+
     print("\n--- Resultados ---")
-    print(f"Tempo Total: {total_time:.2f}s")
-    print(f"Total de Requisições: {len(all_latencies)}")
-    print(f"Total de Erros: {total_errors}")
-    print(f"Taxa de Transferência: {len(all_latencies) / total_time:.2f} req/s")
-    print(f"Latência Média: {statistics.mean(all_latencies):.2f}ms")
-    print(f"Latência P95: {statistics.quantiles(all_latencies, n=20)[18]:.2f}ms")
-    print(f"Latência Mínima: {min(all_latencies):.2f}ms")
-    print(f"Latência Máxima: {max(all_latencies):.2f}ms")
+    print_table(report)
+    if args.json:
+        write_json(report, args.json)
+    if args.csv:
+        write_csv(report, args.csv)
+    if args.save_baseline:
+        write_json(report, args.save_baseline)
+        print(f"Baseline salvo em {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, load_json(args.baseline), args.tolerance)
+        if regressions:
+            print("\nRegressões em relação ao baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\nSem regressões em relação ao baseline.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -0,0 +1,67 @@
+"""
+Servidor local compatível com a API de chat completions da OpenAI, para benchmarks sem custo.
+
+Respostas roteirizadas (agent.llm.ScriptedLLM): chamadas de ferramenta para os Pokémons citados
+e uma resposta final após os resultados, com latência configurável.
+
+Uso:
+    python tests/stub_llm_server.py --port 8090 --latency-ms 300 --token-delay-ms 10
+    OPENAI_BASE_URL=http://localhost:8090/v1 OPENAI_API_KEY=stub python agent/agent_app.py
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.llm import LLM_STUB_LATENCY_MS, LLM_STUB_TOKEN_DELAY_MS, ScriptedLLM, embeddings_response
+
+def create_app(llm: ScriptedLLM) -> FastAPI:
+    app = FastAPI(title="Stub LLM (OpenAI-compatible)")
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "local"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(llm.latency)
+        if not body.get("stream"):
+            return JSONResponse(llm.completion(body))
+
+        async def events():
+            for chunk in llm.chunks(body):
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(llm.token_delay)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        return JSONResponse(embeddings_response(body.get("input", "")))
+
+    return app
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub LLM server (OpenAI-compatible)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=LLM_STUB_LATENCY_MS, help="Delay before the first chunk")
+    parser.add_argument("--token-delay-ms", type=float, default=LLM_STUB_TOKEN_DELAY_MS, help="Delay between streamed chunks")
+    args = parser.parse_args()
+
+    llm = ScriptedLLM(latency_ms=args.latency_ms, token_delay_ms=args.token_delay_ms)
+    uvicorn.run(create_app(llm), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import pytest
+from bench_api import check_bench_database, check_bench_redis_db, plan_requests
+from etl.synthetic import POKEMON_TYPES
+
+def test_plan_details_uses_sampled_names():
+    paths = plan_requests("details", 3, ["nunu", "sonu-alola", "gonu"])
+    assert paths == ["/v1/pokemons/nunu", "/v1/pokemons/sonu-alola", "/v1/pokemons/gonu"]
+    with pytest.raises(ValueError):
+        plan_requests("details", 3)
+
+def test_plan_small_key_spaces_cycle():
+    paths = plan_requests("by_type", 40)
+    assert len(paths) == 40
+    assert set(paths) == {f"/v1/pokemons?type={t}" for t in POKEMON_TYPES}
+    ranking = plan_requests("ranking", 5)
+    assert ranking[0] == "/v1/stats/ranking?stat=hp&limit=5"
+
+def test_plan_rejects_unknown_endpoint():
+    with pytest.raises(ValueError):
+        plan_requests("search", 10)
+
+def test_refuses_the_application_database(monkeypatch):
+    monkeypatch.setenv("POSTGRES_DB", "pokedex_dev")
+    for database in ("pokedex", "pokedex_dev"):
+        with pytest.raises(ValueError):
+            check_bench_database(database)
+    check_bench_database("pokedex_bench")
+
+def test_refuses_the_application_redis_db(monkeypatch):
+    monkeypatch.delenv("REDIS_DB", raising=False)
+    with pytest.raises(ValueError):
+        check_bench_redis_db(0)
+    monkeypatch.setenv("REDIS_DB", "3")
+    with pytest.raises(ValueError):
+        check_bench_redis_db(3)
+    check_bench_redis_db(15)
@@ -0,0 +1,55 @@
+import csv
+import random
+from bench_utils import LatencyHistogram, compare_to_baseline, write_csv
+
+def test_histogram_percentiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+    histogram = LatencyHistogram(significant_digits=3)
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for p in (50, 90, 99, 99.9):
+        exact = ordered[max(0, int(len(ordered) * p / 100) - 1)]
+        assert abs(histogram.percentile(p) - exact) / exact <= 0.011
+    # Memória limitada: menos buckets que amostras.
+    assert len(histogram.counts) < len(values) / 2
+
+def test_histogram_merge_and_summary():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for value in (1.0, 2.0, 3.0):
+        a.record(value)
+    b.record(100.0)
+    a.merge(b)
+
+    summary = a.summary()
+    assert summary["count"] == 4
+    assert summary["min"] == 1.0 and summary["max"] == 100.0
+    assert summary["p50"] == 2.0 and summary["p999"] == 100.0
+    assert LatencyHistogram().summary() == {"count": 0}
+
+def _report(p99, throughput, error_rate=0.0, count=100):
+    return {"scopes": {"overall": {
+        "latency_ms": {"count": count, "p50": 10.0, "p99": p99},
+        "throughput_rps": throughput,
+        "error_rate": error_rate,
+    }}}
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = _report(p99=100.0, throughput=50.0)
+    assert compare_to_baseline(_report(p99=105.0, throughput=48.0), baseline) == []
+
+    regressions = compare_to_baseline(_report(p99=150.0, throughput=30.0, error_rate=0.2), baseline)
+    assert len(regressions) == 3
+    assert any("latency_ms p99" in r for r in regressions)
+
+    # Poucas amostras não contam como regressão de latência:
+    assert compare_to_baseline(_report(p99=500.0, throughput=50.0, count=5), baseline) == []
+
+def test_write_csv(tmp_path):
+    path = tmp_path / "report.csv"
+    write_csv(_report(p99=100.0, throughput=50.0), str(path))
+    rows = list(csv.DictReader(open(path, encoding="utf-8")))
+    assert {r["metric"] for r in rows} == {"latency_ms", "throughput_rps", "error_rate"}
+    assert next(r for r in rows if r["metric"] == "throughput_rps")["value"] == "50.0"
@@ -0,0 +1,54 @@
+import os
+from etl import extract, synthetic
+from etl.checkpoint import CheckpointStore
+from etl.client import PokeAPIClient
+from etl.stub_pokeapi import StubPokeAPI
+
+def test_resume_skips_checkpointed_ids(tmp_path):
+    payloads = [synthetic.to_pokeapi(p) for p in synthetic.generate_pokemon(20)]
+    store = CheckpointStore(str(tmp_path / "run.jsonl"))
+    for payload in payloads[:12]:
+        store.put(payload)
+    store.close()
+
+    resumed = CheckpointStore(str(tmp_path / "run.jsonl"))
+    assert len(resumed) == 12
+    with StubPokeAPI(payloads) as stub:
+        results = extract.fetch_pokemon_data(limit=20, base_url=stub.url, client=PokeAPIClient(), checkpoint=resumed)
+    # Uma listagem e só os 8 detalhes que faltavam:
+    assert stub.stats["requests"] == 1 + 8
+    assert [p.id for p in results] == [p["id"] for p in payloads]
+    assert len(resumed) == 20
+
+    # Uma segunda retomada não busca nenhum detalhe:
+    with StubPokeAPI(payloads) as stub:
+        again = extract.fetch_pokemon_data(limit=20, base_url=stub.url, client=PokeAPIClient(), checkpoint=CheckpointStore(resumed.path))
+    assert stub.stats["requests"] == 1
+    assert again == results
+
+def test_truncated_line_is_ignored_and_isolated(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    first, second, third = [synthetic.to_pokeapi(p) for p in synthetic.generate_pokemon(3)]
+    store = CheckpointStore(path)
+    store.put(first)
+    store.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": 2, "name": "interrom')   # processo morto no meio da escrita
+
+    store = CheckpointStore(path)
+    assert 1 in store and 2 not in store
+    store.put(second)
+    store.put(third)
+    store.close()
+
+    reopened = CheckpointStore(path)
+    assert len(reopened) == 3
+    assert reopened.get(2) == second and reopened.get(3) == third
+
+def test_run_ids_map_to_safe_file_names_and_clear(tmp_path):
+    store = CheckpointStore.for_run("scheduled__2026-01-01T00:00:00+00:00", str(tmp_path))
+    assert os.path.basename(store.path) == "scheduled__2026-01-01T00_00_00_00_00.jsonl"
+    store.put(synthetic.to_pokeapi(synthetic.generate_pokemon(1)[0]))
+    assert os.path.exists(store.path)
+    store.clear()
+    assert not os.path.exists(store.path) and len(store) == 0
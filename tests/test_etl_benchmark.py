@@ -0,0 +1,71 @@
+import time
+import pytest
+from etl import extract, synthetic, transform
+from etl.profiling import StageProfiler, compare_reports
+from etl.stub_pokeapi import StubPokeAPI
+
+def test_extract_round_trips_synthetic_data_through_stub():
+    pokemons = synthetic.generate_pokemon(25, seed=3)
+    with StubPokeAPI(synthetic.to_pokeapi(p) for p in pokemons) as stub:
+        extracted = extract.fetch_pokemon_data(limit=25, base_url=stub.url)
+    assert extracted == pokemons
+
+def test_stub_paginates_like_pokeapi():
+    pokemons = synthetic.generate_pokemon(5)
+    stub = StubPokeAPI(synthetic.to_pokeapi(p) for p in pokemons)
+    try:
+        page = stub.list_page(limit=2, offset=2)
+        assert page["count"] == 5
+        assert [r["name"] for r in page["results"]] == [pokemons[2].name, pokemons[3].name]
+        assert page["next"].endswith("?offset=4&limit=2")
+        assert page["previous"].endswith("?offset=0&limit=2")
+    finally:
+        stub.server.server_close()
+
+def test_synthetic_data_is_deterministic_and_valid():
+    a = synthetic.generate_pokemon(50, seed=1)
+    assert a == synthetic.generate_pokemon(50, seed=1)
+    assert a != synthetic.generate_pokemon(50, seed=2)
+    transform.validate_frames(*transform.build_frames(a))
+
+def test_synthetic_dex_distributions_and_forms():
+    rows = list(synthetic.SyntheticDex(seed=5, form_rate=0.1).rows(5000))
+    names = [r[1] for r in rows]
+    assert len(set(names)) == len(names)
+    forms = [n for n in names if "-" in n]
+    assert 0.05 < len(forms) / len(rows) < 0.15
+    # Toda forma reaproveita o nome de uma espécie já gerada:
+    assert all(n.rsplit("-", 1)[0] in set(names) for n in forms)
+
+    dual = sum(len(r[4]) == 2 for r in rows) / len(rows)
+    assert 0.4 < dual < 0.65
+    assert all(len(set(r[4])) == len(r[4]) for r in rows)
+    assert all(1 <= s <= 255 for r in rows for s in r[5])
+    mean_bst = sum(sum(r[5]) for r in rows) / len(rows)
+    assert 380 < mean_bst < 480
+
+def test_synthetic_parquet_round_trip(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    rows = list(synthetic.SyntheticDex().rows(300))
+    path = str(tmp_path / "dex.parquet")
+    assert synthetic.write_parquet(iter(rows), path, batch_size=128) == 300
+    frame = pd.read_parquet(path)
+    assert list(frame["name"]) == [r[1] for r in rows]
+    assert list(frame.iloc[0]["types"]) == list(rows[0][4])
+    assert frame.iloc[-1]["speed"] == rows[-1][5][-1]
+
+def test_stage_profiler_reports_rates_and_compares():
+    profiler = StageProfiler()
+    with profiler.stage("extract") as stage:
+        time.sleep(0.01)
+        stage["rows"] = 100
+    report = profiler.report(scale=100)
+    extract_stage = report["stages"]["extract"]
+    assert extract_stage["rows"] == 100
+    assert extract_stage["rows_per_sec"] > 0
+    assert report["params"] == {"scale": 100}
+
+    baseline = {"stages": {"extract": {"seconds": extract_stage["seconds"] * 2, "peak_rss_mb": None}}}
+    (line,) = compare_reports(report, baseline)
+    assert line.startswith("extract:") and "-50.0%" in line
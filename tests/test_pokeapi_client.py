@@ -0,0 +1,107 @@
+import pytest
+from etl import synthetic
+from etl.client import CircuitBreaker, CircuitOpenError, PermanentError, PokeAPIClient, TokenBucket, _retry_after
+from etl.stub_pokeapi import StubPokeAPI
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+def _stub(count=20, **options):
+    return StubPokeAPI([synthetic.to_pokeapi(p) for p in synthetic.generate_pokemon(count)], **options)
+
+def _client(**options):
+    # Sem esperas reais: o backoff é exercitado, mas não dormido.
+    options.setdefault("bucket", TokenBucket(rate=1000, max_rate=1000))
+    return PokeAPIClient(sleep=lambda seconds: None, **options)
+
+def test_token_bucket_slow_start_then_halves_and_pauses_on_throttle():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, max_rate=100, clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == 20
+
+    bucket.on_throttle(retry_after=2)
+    assert bucket.rate == 10 and not bucket.slow_start
+    start = clock.now
+    bucket.acquire()
+    assert clock.now - start >= 2
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(10.1)
+
+def test_token_bucket_spaces_requests_at_the_current_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, clock=clock, sleep=clock.sleep)
+    start = clock.now
+    for _ in range(9):
+        bucket.acquire()
+    # 1 ficha inicial e depois uma a cada 0,25s:
+    assert clock.now - start == pytest.approx(2.0)
+
+def test_circuit_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.remaining() == 10
+
+    clock.now += 10
+    assert breaker.allow()        # chamada de teste
+    assert not breaker.allow()    # apenas uma por vez
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_retry_after_parses_seconds_and_dates():
+    assert _retry_after("3") == 3.0
+    assert _retry_after(None) is None
+    assert _retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert _retry_after("soon") is None
+
+def test_retries_recover_transient_errors():
+    client = _client()
+    with _stub(error_rate=0.3, seed=3) as stub:
+        urls = [f"{stub.url}/{i}" for i in range(1, 21)]
+        results = client.fetch_many(urls, lambda data: data["id"])
+    assert results == list(range(1, 21))
+    assert client.stats["retries"] > 0 and client.dead_letters == []
+
+def test_throttling_is_retried_and_lowers_the_rate():
+    client = _client(concurrency=4)
+    with _stub(rate_limit=5) as stub:
+        results = client.fetch_many([f"{stub.url}/{i}" for i in range(1, 11)])
+    assert len(results) == 10
+    assert client.stats["throttled"] > 0
+    assert client.bucket.rate < 1000
+
+def test_permanent_errors_go_to_dead_letters():
+    client = _client()
+    with _stub(count=3) as stub:
+        with pytest.raises(PermanentError):
+            client.get_json(f"{stub.url}/missingno")
+        results = client.fetch_many([f"{stub.url}/1", f"{stub.url}/missingno"])
+    assert len(results) == 1
+    assert [url for url, _ in client.dead_letters] == [f"{stub.url}/missingno"]
+
+def test_open_circuit_fails_fast():
+    client = _client(concurrency=1, max_retries=1, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    with _stub(error_rate=1.0) as stub:
+        results = client.fetch_many([f"{stub.url}/{i}" for i in range(1, 11)])
+        with pytest.raises(CircuitOpenError):
+            client.get_json(f"{stub.url}/1")
+    assert results == [] and len(client.dead_letters) == 10
+    # Sem o circuito seriam 10 recursos x 2 tentativas x 2 rodadas:
+    assert stub.stats["requests"] < 10
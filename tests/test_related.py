@@ -0,0 +1,58 @@
+from etl import extract, synthetic, transform
+from etl.client import PokeAPIClient
+from etl.related import RESOURCES, RelatedResources, resource_key
+from etl.stub_pokeapi import StubPokeAPI
+
+def _fetch(count=30):
+    payloads = [synthetic.to_pokeapi(p) for p in synthetic.generate_pokemon(count)]
+    related = RelatedResources()
+    with StubPokeAPI(payloads, resources=synthetic.related_payloads(payloads)) as stub:
+        client = PokeAPIClient()
+        extract.fetch_pokemon_data(limit=count, base_url=stub.url, client=client, related=related)
+        related.fetch(client)
+    return payloads, related, stub, client
+
+def test_each_shared_resource_is_fetched_once():
+    payloads, related, stub, client = _fetch()
+
+    assert not client.dead_letters
+    # Uma listagem, um detalhe por Pokémon e um GET por recurso único:
+    assert stub.stats["requests"] == 1 + len(payloads) + related.stats["unique"]
+    assert related.stats["fetched"] == related.stats["unique"]
+    assert related.stats["references"] > related.stats["unique"]
+    assert stub.served["move"] == len(related.resources["move"])
+    # As cadeias só são conhecidas depois das espécies (segunda onda):
+    assert len(related.resources["pokemon-species"]) == len(payloads)
+    assert set(related.resources["evolution-chain"]) == {s["evolution_chain_id"] for s in related.resources["pokemon-species"].values()}
+
+def test_branched_chain_is_flattened_into_links():
+    compact, _ = RESOURCES["evolution-chain"]
+
+    def node(species_id, name, children=(), details=()):
+        return {"species": {"name": name, "url": f"https://pokeapi.co/api/v2/pokemon-species/{species_id}/"},
+                "evolution_details": list(details), "evolves_to": list(children)}
+
+    stone = {"trigger": {"name": "use-item"}, "min_level": None, "item": {"name": "water-stone"}}
+    raw = {"id": 67, "chain": node(133, "eevee", [node(134, "vaporeon", details=[stone]), node(197, "umbreon")])}
+
+    assert compact(raw)["links"] == [
+        {"species_id": 133, "name": "eevee", "evolves_from_id": None, "trigger": None, "min_level": None, "item": None},
+        {"species_id": 134, "name": "vaporeon", "evolves_from_id": 133, "trigger": "use-item", "min_level": None, "item": "water-stone"},
+        {"species_id": 197, "name": "umbreon", "evolves_from_id": 133, "trigger": None, "min_level": None, "item": None},
+    ]
+    assert resource_key("https://pokeapi.co/api/v2/pokemon-species/133/") == ("pokemon-species", 133)
+    assert resource_key("https://pokeapi.co/api/v2/pokemon/") is None
+
+def test_transform_builds_valid_frames_and_survives_round_trip():
+    payloads, related, _, _ = _fetch(12)
+    frames = transform.transform_related(related)
+
+    assert set(frames) == set(transform.RELATED_SCHEMAS)
+    assert len(frames["pokemon_species"]) == len(payloads)
+    assert frames["pokemon_moves"].duplicated(["pokemon_id", "move_id"]).sum() == 0
+    # Espécies das cadeias entram mesmo quando o Pokémon não foi extraído:
+    assert set(frames["pokemon_species"]["species_id"]) <= set(frames["dim_species"]["id"])
+
+    restored = RelatedResources.from_dict(related.to_dict())
+    for table, frame in transform.transform_related(restored).items():
+        assert frame.equals(frames[table]), table
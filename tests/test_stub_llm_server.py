@@ -0,0 +1,32 @@
+import json
+from fastapi.testclient import TestClient
+from agent.core import IntentRouter
+from agent.llm import ScriptedLLM
+from stub_llm_server import create_app
+
+client = TestClient(create_app(ScriptedLLM(IntentRouter(["pikachu"]), latency_ms=0, token_delay_ms=0)))
+
+def test_streams_openai_compatible_chunks():
+    body = {
+        "model": "stub",
+        "messages": [{"role": "user", "content": "Quem é Pikachu?"}],
+        "tools": [{"type": "function", "function": {"name": "buscar_pokemon"}}],
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    response = client.post("/v1/chat/completions", json=body)
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    lines = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert lines[-1] == "[DONE]"
+    chunks = [json.loads(line) for line in lines[:-1]]
+    calls = [c["choices"][0]["delta"]["tool_calls"][0] for c in chunks if c["choices"] and c["choices"][0]["delta"].get("tool_calls")]
+    assert calls[0]["function"] == {"name": "buscar_pokemon", "arguments": '{"nome_ou_id": "pikachu"}'}
+    assert chunks[-1]["usage"]["total_tokens"] > 0
+
+def test_completion_and_embeddings():
+    response = client.post("/v1/chat/completions", json={"messages": [{"role": "user", "content": "Oi"}]}).json()
+    assert response["choices"][0]["finish_reason"] == "stop"
+
+    vector = client.post("/v1/embeddings", json={"input": "oi"}).json()["data"][0]["embedding"]
+    assert vector == client.post("/v1/embeddings", json={"input": "oi"}).json()["data"][0]["embedding"]
@@ -0,0 +1,45 @@
+import json
+import time
+import requests
+from etl import synthetic
+from etl.stub_pokeapi import StubPokeAPI, load_recorded
+
+def _payloads(count=10):
+    return [synthetic.to_pokeapi(p) for p in synthetic.generate_pokemon(count)]
+
+def test_list_and_detail_follow_pokeapi_shape():
+    payloads = _payloads()
+    with StubPokeAPI(payloads) as stub:
+        page = requests.get(f"{stub.url}?limit=4&offset=0", timeout=5).json()
+        assert page["count"] == 10 and len(page["results"]) == 4
+        detail = requests.get(page["results"][1]["url"], timeout=5).json()
+        assert detail == payloads[1]
+        assert requests.get(f"{stub.url}/{payloads[2]['name']}", timeout=5).json()["id"] == payloads[2]["id"]
+        assert requests.get(f"{stub.url}/missingno", timeout=5).status_code == 404
+        assert stub.stats == {"requests": 4, "ok": 3, "errors": 0, "throttled": 0, "not_found": 1}
+
+def test_rate_limit_answers_429_with_retry_after():
+    with StubPokeAPI(_payloads(), rate_limit=5) as stub:
+        statuses = [requests.get(f"{stub.url}/1", timeout=5) for _ in range(8)]
+    throttled = [r for r in statuses if r.status_code == 429]
+    assert [r.status_code for r in statuses[:5]] == [200] * 5
+    assert throttled and all(int(r.headers["Retry-After"]) >= 1 for r in throttled)
+    assert stub.stats["throttled"] == len(throttled)
+
+def test_error_rate_is_reproducible_and_latency_applies():
+    def run():
+        with StubPokeAPI(_payloads(), error_rate=0.3, latency_ms=20, seed=7) as stub:
+            start = time.perf_counter()
+            codes = [requests.get(f"{stub.url}/1", timeout=5).status_code for _ in range(20)]
+            return codes, time.perf_counter() - start
+
+    codes, seconds = run()
+    assert 500 in codes and 200 in codes
+    assert run()[0] == codes
+    assert seconds >= 20 * 0.02
+
+def test_serves_recorded_payloads(tmp_path):
+    path = tmp_path / "recorded.jsonl"
+    path.write_text("\n".join(json.dumps(p) for p in _payloads(3)) + "\n", encoding="utf-8")
+    with StubPokeAPI(load_recorded(str(path))) as stub:
+        assert requests.get(f"{stub.url}?limit=10", timeout=5).json()["count"] == 3